@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+BENCHMARKS DE LOS NÚCLEOS NUMÉRICOS
+==============================================================================
+Mide los caminos críticos de los scripts sobre una escalera de tamaños y
+compara contra una línea base guardada.
+
+Uso (desde la raíz del repositorio):
+
+    python benchmarks/ejecutar_benchmarks.py                  # medir y comparar
+    python benchmarks/ejecutar_benchmarks.py --guardar-base   # fijar la base
+    python benchmarks/ejecutar_benchmarks.py --rapido --filtro tcl
+    python benchmarks/ejecutar_benchmarks.py --escalamiento   # TCL con 1..N procesos
+
+Cada ejecución se guarda en benchmarks/resultados/<fecha>.json. Si existe
+la línea base (benchmarks/base.json por defecto) se imprime la comparación y
+el programa termina con código 1 cuando hay regresiones.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from utilidades.acumulados import bloques_normal, indices_log, momentos, trayectoria_media
+from utilidades.benchmark import (
+    UMBRAL_REGRESION,
+    CasoBenchmark,
+    cargar_resultados,
+    comparar_con_base,
+    ejecutar_casos,
+    guardar_resultados,
+    imprimir_comparacion,
+)
+from utilidades.bootstrap import estadistico_media, replicas_bootstrap
+from utilidades.covarianza import covarianza_hac
+from utilidades.distribuciones import cuantil, tabla_distribucion
+from utilidades.instrumentales import EstimadorMC2E
+from utilidades.normalidad import bateria_normalidad
+from utilidades.panel import efectos_fijos
+from utilidades.potencia import estadisticos_t, p_valores_t, superficie_potencia
+from utilidades.regresion import mco
+from utilidades.series import acf, loglik_exacta
+from utilidades.simulacion import (
+    informe_escalamiento,
+    medias_muestrales,
+    medias_muestrales_bucle,
+)
+from utilidades.verosimilitud import loglik_grid_normal
+
+CARPETA = Path(__file__).resolve().parent
+SEMILLA = 2024
+
+# Estudio de escalamiento paralelo del TCL (--escalamiento)
+N_ESCALAMIENTO = 30
+M_ESCALAMIENTO = 200_000
+
+
+# ==============================================================
+# CASOS (capítulo 2)
+# ==============================================================
+
+def _preparar_tcl(tamano):
+    n, m = tamano
+    rng = np.random.default_rng(SEMILLA)
+    return rng.exponential, {}, n, m
+
+
+def _preparar_loglik(tamano):
+    n, puntos = tamano
+    datos = np.random.default_rng(SEMILLA).normal(5, 2, n)
+    return datos, np.linspace(4, 6, puntos), np.linspace(1.5, 2.5, puntos)
+
+
+def _preparar_convergencia(n_max):
+    return n_max, np.random.default_rng(SEMILLA)
+
+
+def _convergencia(n_max, rng):
+    return trayectoria_media(bloques_normal(5, 2, n_max, rng),
+                             indices_log(n_max, 1000))
+
+
+def _preparar_prueba_t(tamano):
+    replicas, n = tamano
+    X = np.random.default_rng(SEMILLA).normal(100, 15, (replicas, n))
+    return X, 100.0, n - 1
+
+
+def _prueba_t(X, mu_0, gl):
+    return p_valores_t(estadisticos_t(X, mu_0), gl)
+
+
+def _preparar_cuantiles(repeticiones):
+    return repeticiones, 24
+
+
+def _cuantiles_t(repeticiones, gl):
+    # Valores críticos repetidos, servidos por la caché LRU
+    for _ in range(repeticiones):
+        cuantil('t', 0.975, gl)
+
+
+def _preparar_p_valores(n):
+    gl = 24
+    return tabla_distribucion('t', gl), np.random.default_rng(SEMILLA).standard_t(gl, n)
+
+
+def _p_valores_tabla(tabla, t):
+    return tabla.p_valor(t)
+
+
+def _preparar_potencia(replicas):
+    return replicas, np.random.default_rng(SEMILLA)
+
+
+def _potencia(replicas, rng):
+    return superficie_potencia([100, 103, 106, 109], [15], [10, 25, 50],
+                               [0.05], 100, replicas, rng)
+
+
+def _preparar_bootstrap(tamano):
+    n, remuestras = tamano
+    rng = np.random.default_rng(SEMILLA)
+    return rng.normal(100, 15, n), estadistico_media, remuestras, rng
+
+
+def _preparar_mco(tamano):
+    n, k, m = tamano
+    rng = np.random.default_rng(SEMILLA)
+    X = np.column_stack([np.ones(n), rng.standard_normal((n, k - 1))])
+    return X, rng.standard_normal((n, m)) if m > 1 else rng.standard_normal(n)
+
+
+def _preparar_hac(tamano):
+    n, k, rezagos = tamano
+    X, e = _preparar_mco((n, k, 1))
+    return X, e, np.linalg.qr(X, mode='r'), rezagos
+
+
+def _preparar_panel(tamano):
+    n_individuos, t, k = tamano
+    rng = np.random.default_rng(SEMILLA)
+    n = n_individuos * t
+    grupos = [np.repeat(np.arange(n_individuos), t), np.tile(np.arange(t), n_individuos)]
+    return rng.standard_normal(n), rng.standard_normal((n, k)), grupos
+
+
+def _preparar_mc2e(tamano):
+    n, q, m = tamano
+    rng = np.random.default_rng(SEMILLA)
+    W = np.column_stack([np.ones(n), rng.standard_normal(n)])
+    Z1 = rng.standard_normal((n, q))
+    E = Z1.sum(axis=1) + rng.standard_normal(n)
+    return W, E, Z1, rng.standard_normal((n, m))
+
+
+def _mc2e(W, E, Z1, Y):
+    return EstimadorMC2E(W, E, Z1).ajustar(Y)
+
+
+def _preparar_acf(tamano):
+    m, n, rezagos = tamano
+    return np.random.default_rng(SEMILLA).standard_normal((m, n)), rezagos
+
+
+def _preparar_arma(tamano):
+    e = np.random.default_rng(SEMILLA).standard_normal(tamano + 1)
+    return e[1:] + 0.5 * e[:-1], [0.6], [0.5]
+
+
+def _preparar_normales(tamano):
+    return (np.random.default_rng(SEMILLA).standard_normal(tamano),)
+
+
+CASOS = [
+    CasoBenchmark('tcl_medias_muestrales', [(30, 1_000), (30, 100_000), (100, 100_000)],
+                  _preparar_tcl, medias_muestrales),
+    CasoBenchmark('tcl_medias_bucle', [(30, 1_000)],
+                  _preparar_tcl, medias_muestrales_bucle),
+    CasoBenchmark('loglik_grid_normal', [(100, 50), (1_000, 200), (1_000, 1_000)],
+                  _preparar_loglik, loglik_grid_normal),
+    CasoBenchmark('convergencia_media', [10**5, 10**6, 10**7],
+                  _preparar_convergencia, _convergencia),
+    CasoBenchmark('prueba_t', [(1_000, 30), (100_000, 30)],
+                  _preparar_prueba_t, _prueba_t),
+    CasoBenchmark('cuantiles_t_cache', [10**4],
+                  _preparar_cuantiles, _cuantiles_t),
+    CasoBenchmark('p_valores_t_tabla', [10**4, 10**6],
+                  _preparar_p_valores, _p_valores_tabla),
+    CasoBenchmark('superficie_potencia', [1_000, 20_000],
+                  _preparar_potencia, _potencia),
+    CasoBenchmark('momentos', [10**4, 10**6],
+                  _preparar_normales, momentos),
+    CasoBenchmark('bootstrap_media', [(25, 10_000), (10**6, 20)],
+                  _preparar_bootstrap, replicas_bootstrap),
+    CasoBenchmark('mco_qr_bloques', [(10**5, 5, 1), (10**6, 10, 1), (10**4, 5, 500)],
+                  _preparar_mco, mco),
+    CasoBenchmark('covarianza_hac', [(10**6, 5, 30), (10**6, 5, 10_000)],
+                  _preparar_hac, covarianza_hac),
+    CasoBenchmark('efectos_fijos', [(10**5, 5, 3), (10**6, 5, 3)],
+                  _preparar_panel, efectos_fijos),
+    CasoBenchmark('mc2e_lotes', [(10**5, 3, 1), (10**4, 3, 500)],
+                  _preparar_mc2e, _mc2e),
+    CasoBenchmark('acf_fft', [(1, 10**6, 100), (1_000, 1_000, 50)],
+                  _preparar_acf, acf),
+    CasoBenchmark('loglik_arma_kalman', [500, 10**5],
+                  _preparar_arma, loglik_exacta),
+    CasoBenchmark('bateria_normalidad', [(4, 1_000), (1_000, 100)],
+                  _preparar_normales, bateria_normalidad),
+]
+
+
+def escalamiento_tcl(n=N_ESCALAMIENTO, m=M_ESCALAMIENTO):
+    """
+    Tiempo de simular_tcl_paralelo con 1, 2, 4, ... procesos
+    """
+    print("\n" + "=" * 70)
+    print("ESCALAMIENTO PARALELO DEL TCL (distribución × bloque de réplicas)")
+    print("=" * 70)
+    print(f"\n  n = {n}, réplicas por distribución: {m}")
+    print(f"  Semillas: np.random.SeedSequence({SEMILLA}).spawn por tarea\n")
+    print(f"  {'Procesos':>8}  {'Tiempo (s)':>10}  {'Aceleración':>11}  {'Idéntico':>8}")
+    for fila in informe_escalamiento(n, m, semilla=SEMILLA):
+        print(f"  {fila['trabajadores']:>8d}  {fila['tiempo']:>10.3f}  "
+              f"{fila['aceleracion']:>10.2f}x  {'✓' if fila['identico'] else '✗':>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de los núcleos numéricos")
+    parser.add_argument('--rapido', action='store_true',
+                        help="solo el primer tamaño de cada caso")
+    parser.add_argument('--filtro', help="solo los casos cuyo nombre contenga este texto")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--tiempo-minimo', type=float, default=0.2)
+    parser.add_argument('--base', type=Path, default=CARPETA / 'base.json',
+                        help="línea base contra la que comparar")
+    parser.add_argument('--guardar-base', action='store_true',
+                        help="guardar esta ejecución como línea base")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_REGRESION,
+                        help="aumento relativo que se considera regresión")
+    parser.add_argument('--escalamiento', action='store_true',
+                        help="solo el estudio de escalamiento paralelo del TCL")
+    args = parser.parse_args(argv)
+
+    if args.escalamiento:
+        escalamiento_tcl()
+        return 0
+
+    print("=" * 70)
+    print("BENCHMARKS DE LOS NÚCLEOS NUMÉRICOS")
+    print("=" * 70)
+
+    resultados = ejecutar_casos(CASOS, args.repeticiones, args.tiempo_minimo,
+                                args.filtro, args.rapido)
+
+    ruta = guardar_resultados(resultados, CARPETA / 'resultados' /
+                              f"{time.strftime('%Y%m%d_%H%M%S')}.json")
+    print(f"\n✓ Resultados guardados en {ruta}")
+
+    if args.guardar_base:
+        guardar_resultados(resultados, args.base)
+        print(f"✓ Línea base guardada en {args.base}")
+        return 0
+
+    if not args.base.exists():
+        print(f"(Sin línea base en {args.base}; use --guardar-base para crearla)")
+        return 0
+
+    filas = comparar_con_base(resultados, cargar_resultados(args.base), args.umbral)
+    print(f"\n=== COMPARACIÓN CON LA LÍNEA BASE (umbral {args.umbral:.0%}) ===")
+    imprimir_comparacion(filas)
+
+    regresiones = [f for f in filas if f['estado'] == 'regresion']
+    if regresiones:
+        print(f"\n✗ {len(regresiones)} regresión(es) detectada(s)")
+        return 1
+    print("\n✓ Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,70 +2,132 @@
 # Modulo 1: Validacion de Distribucion Normal
 # ============================================
 
+import sys
+from pathlib import Path
+
 import numpy as np
-import pandas as pd
-from scipy import stats
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utilidades.acumulados import momentos
+from utilidades.aleatorio import obtener_generador
+from utilidades.distribuciones import cdf, cuantil
+from utilidades.normalidad import bateria_normalidad, shapiro_lote
+from utilidades.perfilado import etapa
+from utilidades.visualizacion import renderizar
+
+FIGURAS = Path(__file__).resolve().parents[1] / 'figuras'
 
 # Configuracion
-np.random.seed(123)
-n = 1000
-
-# Generar datos N(0,1)
-x = np.random.normal(loc=0, scale=1, size=n)
-
-# Estadisticas descriptivas
-estadisticas = pd.DataFrame({
-    'Estadistico': ['Media', 'Desv.Est.', 'Asimetria', 'Curtosis'],
-    'Valor': [
-        np.mean(x),
-        np.std(x, ddof=1),
-        stats.skew(x),
-        stats.kurtosis(x, fisher=False)
-    ],
-    'Teorico': [0, 1, 0, 3]
-})
-
-print(estadisticas)
-
-# Prueba de normalidad Shapiro-Wilk
-w_stat, p_value = stats.shapiro(x)
-print(f"\nShapiro-Wilk Test:")
-print(f"W = {w_stat:.4f}")
-print(f"p-value = {p_value:.4f}")
-
-# Probabilidades y cuantiles
-prob_menor_196 = stats.norm.cdf(1.96)
-prob_entre_196 = stats.norm.cdf(1.96) - stats.norm.cdf(-1.96)
-q_025 = stats.norm.ppf(0.025)
-q_975 = stats.norm.ppf(0.975)
-
-print(f"\nProbabilidades y Cuantiles:")
-print(f"P(Z <= 1.96) = {prob_menor_196:.4f}")
-print(f"P(-1.96 <= Z <= 1.96) = {prob_entre_196:.4f}")
-print(f"Cuantil 2.5% = {q_025:.4f}")
-print(f"Cuantil 97.5% = {q_975:.4f}")
-
-# Visualizacion
-fig, axes = plt.subplots(1, 2, figsize=(14, 6))
-
-# Figura 1: Histograma vs densidad teorica
-axes[0].hist(x, bins=30, density=True, alpha=0.7, 
-             color='lightblue', edgecolor='black')
-x_range = np.linspace(-4, 4, 100)
-axes[0].plot(x_range, stats.norm.pdf(x_range, 0, 1), 
-             'r-', linewidth=2, label='Densidad N(0,1)')
-axes[0].set_xlabel('Valor')
-axes[0].set_ylabel('Densidad')
-axes[0].set_title('Histograma vs Densidad Teorica N(0,1)')
-axes[0].legend()
-axes[0].grid(alpha=0.3)
-
-# Figura 2: Q-Q plot
-stats.probplot(x, dist="norm", plot=axes[1])
-axes[1].set_title('Grafico Q-Q Normal')
-axes[1].grid(alpha=0.3)
-
-plt.tight_layout()
-plt.show()
+SEMILLA = 123
+N = 1000
+
+
+# Calculos (sin salida por pantalla)
+def analizar_normal(x):
+    """
+    Estadisticas descriptivas, Shapiro-Wilk y bateria de normalidad
+
+    Retorna:
+    --------
+    resultado : dict
+        'estadisticas' (lista de (nombre, valor, teorico)), 'shapiro'
+        (W, p) y 'bateria' ({prueba: (estadistico, p)})
+    """
+    # Estadisticas descriptivas (un solo recorrido de x)
+    mom = momentos(x)
+    estadisticas = [
+        ('Media', mom.media, 0),
+        ('Desv.Est.', mom.desviacion(ddof=1), 1),
+        ('Asimetria', mom.asimetria(), 0),
+        ('Curtosis', mom.curtosis(fisher=False), 3),
+    ]
+    return {
+        'estadisticas': estadisticas,
+        'shapiro': shapiro_lote(x),
+        'bateria': bateria_normalidad(x),
+    }
+
+
+def probabilidades_normal():
+    """
+    Probabilidades y cuantiles de N(0,1)
+    (servicio con cache LRU: ver utilidades/distribuciones.py)
+    """
+    return {
+        'P(Z <= 1.96)': cdf('norm', 1.96),
+        'P(-1.96 <= Z <= 1.96)': cdf('norm', 1.96) - cdf('norm', -1.96),
+        'Cuantil 2.5%': cuantil('norm', 0.025),
+        'Cuantil 97.5%': cuantil('norm', 0.975),
+    }
+
+
+# Visualizacion (renderizado sin pantalla, con cache de figuras)
+def dibujar_normal(fig, datos, estilo):
+    """
+    Histograma vs densidad teorica y grafico Q-Q
+    """
+    from scipy import stats
+
+    x = datos['x']
+    axes = fig.subplots(1, 2)
+
+    # Figura 1: Histograma vs densidad teorica
+    axes[0].hist(x, bins=estilo['bins'], density=True, alpha=0.7,
+                 color='lightblue', edgecolor='black')
+    x_range = np.linspace(-4, 4, 100)
+    axes[0].plot(x_range, stats.norm.pdf(x_range, 0, 1),
+                 'r-', linewidth=2, label='Densidad N(0,1)')
+    axes[0].set_xlabel('Valor')
+    axes[0].set_ylabel('Densidad')
+    axes[0].set_title('Histograma vs Densidad Teorica N(0,1)')
+    axes[0].legend()
+    axes[0].grid(alpha=0.3)
+
+    # Figura 2: Q-Q plot
+    stats.probplot(x, dist="norm", plot=axes[1])
+    axes[1].set_title('Grafico Q-Q Normal')
+    axes[1].grid(alpha=0.3)
+
+    fig.tight_layout()
+
+
+def main():
+    import pandas as pd
+
+    rng = obtener_generador('cap02/01_distribucion_normal', semilla=SEMILLA)
+
+    # Generar datos N(0,1)
+    with etapa('datos'):
+        x = rng.normal(loc=0, scale=1, size=N)
+    with etapa('estadisticos'):
+        resultado = analizar_normal(x)
+
+    estadisticas = pd.DataFrame(resultado['estadisticas'],
+                                columns=['Estadistico', 'Valor', 'Teorico'])
+    print(estadisticas)
+
+    # Prueba de normalidad Shapiro-Wilk
+    w_stat, p_value = resultado['shapiro']
+    print(f"\nShapiro-Wilk Test:")
+    print(f"W = {w_stat:.4f}")
+    print(f"p-value = {p_value:.4f}")
+
+    # Bateria de pruebas de normalidad
+    print(f"\nBateria de normalidad:")
+    for prueba, (estadistico, p) in resultado['bateria'].items():
+        print(f"{prueba:<18} estadistico = {estadistico[0]:.4f}, p-value = {p[0]:.4f}")
+
+    print(f"\nProbabilidades y Cuantiles:")
+    for nombre, valor in probabilidades_normal().items():
+        print(f"{nombre} = {valor:.4f}")
+
+    with etapa('graficos'):
+        renderizar(dibujar_normal, FIGURAS / 'distribucion_normal_python',
+                   datos={'x': x}, estilo={'figsize': (14, 6), 'bins': 30})
+    print("\nGrafico guardado: figuras/distribucion_normal_python.pdf")
+
+
+if __name__ == "__main__":
+    main()
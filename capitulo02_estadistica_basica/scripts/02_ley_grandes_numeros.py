@@ -6,58 +6,96 @@ CAPÍTULO 2: LEY DE GRANDES NÚMEROS
 ==============================================================================
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-print("=== LEY DE GRANDES NÚMEROS ===\n")
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utilidades.acumulados import simular_convergencia
+from utilidades.aleatorio import obtener_generador
+from utilidades.perfilado import etapa
+from utilidades.visualizacion import diezmar_lttb, renderizar
 
-np.random.seed(123)
+FIGURAS = Path(__file__).resolve().parents[1] / 'figuras'
 
 # Parámetros
-mu = 5
-sigma = 2
-n_max = 10000
-
-# Generar datos
-datos = np.random.normal(loc=mu, scale=sigma, size=n_max)
-
-# Calcular media acumulada
-media_acumulada = np.cumsum(datos) / np.arange(1, n_max + 1)
-
-# Estadísticas finales
-media_final = media_acumulada[-1]
-error_abs = abs(media_final - mu)
-error_rel = (error_abs / mu) * 100
-
-print(f"Parámetros: μ = {mu}, σ = {sigma}")
-print(f"Media final (n = {n_max}): {media_final:.4f}")
-print(f"Error absoluto: {error_abs:.4f}")
-print(f"Error relativo: {error_rel:.2f}%\n")
-
-# Visualización
-fig, axes = plt.subplots(1, 2, figsize=(12, 5))
-
-# Panel 1: Convergencia
-n_vals = np.arange(1, n_max + 1)
-axes[0].plot(n_vals, media_acumulada, color='blue', linewidth=0.8)
-axes[0].axhline(y=mu, color='red', linestyle='--', linewidth=1.5, label=f'μ = {mu}')
-axes[0].set_xlabel('Tamaño de Muestra (n)')
-axes[0].set_ylabel('Media Muestral')
-axes[0].set_title('Convergencia de la Media Muestral', fontweight='bold')
-axes[0].legend()
-axes[0].grid(alpha=0.3)
-
-# Panel 2: Velocidad de Convergencia (Escala Log)
-desviacion = np.abs(media_acumulada - mu)
-axes[1].plot(n_vals, desviacion, color='darkgreen', linewidth=0.8)
-axes[1].set_yscale('log')
-axes[1].set_xlabel('Tamaño de Muestra (n)')
-axes[1].set_ylabel('Desviación Absoluta (escala log)')
-axes[1].set_title('Velocidad de Convergencia', fontweight='bold')
-axes[1].grid(alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('../figuras/convergencia_velocidad_python.pdf', dpi=300, bbox_inches='tight')
-print("Gráfico guardado: figuras/convergencia_velocidad_python.pdf")
-plt.show()
+SEMILLA = 123
+MU = 5
+SIGMA = 2
+N_MAX = 10000
+PUNTOS_TRAYECTORIA = 100000  # Puntos (espaciados en log) que se registran
+MAX_VERTICES = 2000          # Vértices por línea tras el diezmado
+
+
+def errores_convergencia(acumulador, mu):
+    """
+    Error absoluto y relativo (%) de la media final respecto a mu
+    """
+    error_abs = abs(acumulador.media - mu)
+    return error_abs, (error_abs / mu) * 100
+
+
+# Visualización (renderizado sin pantalla, con caché de figuras)
+def dibujar_convergencia(fig, datos, estilo):
+    """
+    Convergencia de la media muestral y velocidad de convergencia (log)
+    """
+    mu = datos['mu']
+    axes = fig.subplots(1, 2)
+
+    # Panel 1: Convergencia
+    axes[0].plot(*datos['convergencia'], color='blue', linewidth=0.8)
+    axes[0].axhline(y=mu, color='red', linestyle='--', linewidth=1.5, label=f'μ = {mu}')
+    axes[0].set_xlabel('Tamaño de Muestra (n)')
+    axes[0].set_ylabel('Media Muestral')
+    axes[0].set_title('Convergencia de la Media Muestral', fontweight='bold')
+    axes[0].legend()
+    axes[0].grid(alpha=0.3)
+
+    # Panel 2: Velocidad de Convergencia (Escala Log)
+    axes[1].plot(*datos['desviacion'], color='darkgreen', linewidth=0.8)
+    axes[1].set_yscale('log')
+    axes[1].set_xlabel('Tamaño de Muestra (n)')
+    axes[1].set_ylabel('Desviación Absoluta (escala log)')
+    axes[1].set_title('Velocidad de Convergencia', fontweight='bold')
+    axes[1].grid(alpha=0.3)
+
+    fig.tight_layout()
+
+
+def main():
+    print("=== LEY DE GRANDES NÚMEROS ===\n")
+
+    rng = obtener_generador('cap02/02_ley_grandes_numeros', semilla=SEMILLA)
+    with etapa('simulacion'):
+        n_vals, media_acumulada, acumulador = simular_convergencia(
+            MU, SIGMA, N_MAX, rng, puntos=PUNTOS_TRAYECTORIA)
+
+    # Estadísticas finales
+    error_abs, error_rel = errores_convergencia(acumulador, MU)
+
+    print(f"Parámetros: μ = {MU}, σ = {SIGMA}")
+    print(f"Media final (n = {N_MAX}): {acumulador.media:.4f}")
+    print(f"Error absoluto: {error_abs:.4f}")
+    print(f"Error relativo: {error_rel:.2f}%")
+    print(f"Desv. estándar muestral: {np.sqrt(acumulador.varianza()):.4f}\n")
+
+    # Diezmado previo al dibujo: a lo sumo MAX_VERTICES por línea, calculado
+    # en la escala de cada panel (lineal; y logarítmica para la desviación)
+    with etapa('diezmado'):
+        desviacion = np.abs(media_acumulada - MU)
+        convergencia = diezmar_lttb(n_vals, media_acumulada, MAX_VERTICES)
+        desviacion = diezmar_lttb(n_vals, desviacion, MAX_VERTICES, escala_y='log')
+
+    with etapa('graficos'):
+        renderizar(dibujar_convergencia, FIGURAS / 'convergencia_velocidad_python',
+                   datos={'convergencia': convergencia, 'desviacion': desviacion, 'mu': MU},
+                   estilo={'figsize': (12, 5), 'dpi': 300})
+    print("Gráfico guardado: figuras/convergencia_velocidad_python.pdf")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,27 +7,52 @@ MÓDULO 3: TEOREMA CENTRAL DEL LÍMITE (VERSIÓN PROFESIONAL)
 Simulación de convergencia a normalidad para diferentes distribuciones poblacionales
 """
 
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from scipy import stats
+import sys
 import warnings
+from pathlib import Path
+
+import numpy as np
 
-# Ignorar warnings de deprecación
-warnings.filterwarnings('ignore')
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-print("="*70)
-print("TEOREMA CENTRAL DEL LÍMITE (VISUALIZACIÓN PROFESIONAL)")
-print("="*70)
+from utilidades.acumulados import momentos
+from utilidades.datos import SUBCARPETA_SIMULADOS, obtener_o_generar
+from utilidades.normalidad import bateria_normalidad, shapiro_lote
+from utilidades.perfilado import etapa
+from utilidades.resultados import en_cache
+from utilidades.simulacion import (
+    DISTRIBUCIONES_TCL,
+    medias_paralelo,
+    simular_tcl,
+)
+from utilidades.visualizacion import (
+    curva_normal,
+    dibujar_histograma,
+    histograma_densidad,
+    renderizar_lote,
+    tarea_figura,
+)
+
+CARPETA = Path(__file__).resolve().parents[1]
+FIGURAS = CARPETA / 'figuras'
+RESULTADOS = CARPETA / 'resultados'
+# Medias muestrales guardadas en datos/simulados/ y reutilizadas (sin copia,
+# memmap) si n, m y la semilla no cambian
+DATOS = CARPETA / 'datos' / SUBCARPETA_SIMULADOS
 
 # Parámetros de simulación
-np.random.seed(789)
-n = 30      # Tamaño de cada muestra
-m = 1000    # Número de réplicas
+SEMILLA = 789
+N = 30      # Tamaño de cada muestra
+M = 1000    # Número de réplicas
 
-print(f"\nParámetros:")
-print(f"  Tamaño muestral (n): {n}")
-print(f"  Número de réplicas (m): {m}\n")
+# Archivo de la figura individual de cada distribución
+ARCHIVOS_TCL = {
+    'uniform': 'tcl_uniforme_python',
+    'exponential': 'tcl_exponencial_python',
+    'binomial': 'tcl_binomial_python',
+    'chisquare': 'tcl_chicuadrado_python',
+}
 
 # Paleta de colores profesional
 COL_HIST = '#FF8C00'      # Naranja profesional
@@ -36,175 +61,233 @@ COL_BORDE = '#2c2c2c'     # Gris oscuro casi negro
 COL_FONDO = 'white'       # Blanco puro
 COL_TEXTO = '#333333'     # Gris oscuro para texto
 
-def simular_tcl(dist_func, params, n, m, nombre):
-    """
-    Simula el Teorema Central del Límite para una distribución dada
-    
-    Parámetros:
-    -----------
-    dist_func : función
-        Función de distribución (np.random)
-    params : dict
-        Parámetros de la distribución
-    n : int
-        Tamaño de muestra
-    m : int
-        Número de réplicas
-    nombre : str
-        Nombre de la distribución
-        
+# Estilo común de las figuras (entra en la huella de la caché)
+ESTILO = {
+    'col_hist': COL_HIST,
+    'col_normal': COL_NORMAL,
+    'col_borde': COL_BORDE,
+    'col_fondo': COL_FONDO,
+    'col_texto': COL_TEXTO,
+    'bins': 40,
+    'dpi': 300,
+}
+
+
+def resumen_tcl(z):
+    """
+    Media, desviación estándar y Shapiro-Wilk de los valores estandarizados
+
     Retorna:
     --------
-    z : array
-        Valores estandarizados según TCL
-    """
-    # Generar medias muestrales
-    medias = np.array([np.mean(dist_func(size=n, **params)) for _ in range(m)])
-    
-    # Calcular parámetros teóricos
-    if dist_func == np.random.uniform:
-        mu = 0.5
-        sigma = np.sqrt(1/12)
-    elif dist_func == np.random.exponential:
-        mu = 1
-        sigma = 1
-    elif dist_func == np.random.binomial:
-        mu = params['n'] * params['p']
-        sigma = np.sqrt(mu * (1 - params['p']))
-    elif dist_func == np.random.chisquare:
-        mu = params['df']
-        sigma = np.sqrt(2 * params['df'])
-    
-    # Estandarizar según TCL
-    z = np.sqrt(n) * (medias - mu) / sigma
-    
-    # Prueba de normalidad de Shapiro-Wilk
-    shapiro_stat, shapiro_p = stats.shapiro(z)
-    
-    print(f"--- {nombre} ---")
-    print(f"  Media Z = {np.mean(z):.4f} (esperado: 0)")
-    print(f"  SD Z    = {np.std(z, ddof=1):.4f} (esperado: 1)")
-    print(f"  Shapiro-Wilk W = {shapiro_stat:.4f}")
-    print(f"  Shapiro-Wilk p = {shapiro_p:.4f}")
-    
-    if shapiro_p > 0.05:
-        print("  ✓ Normalidad NO rechazada al 5%\n")
-    else:
-        print("  ✗ Normalidad RECHAZADA al 5%\n")
-    
-    return z
-
-# 1. Uniforme(0,1): mu=0.5, sigma²=1/12
-z_unif = simular_tcl(np.random.uniform, {'low':0, 'high':1}, n, m, "Uniforme(0,1)")
-
-# 2. Exponencial(lambda=1): mu=1, sigma²=1
-z_exp = simular_tcl(np.random.exponential, {}, n, m, "Exponencial(1)")
-
-# 3. Binomial(size=10, p=0.5): mu=5, sigma²=2.5
-z_binom = simular_tcl(np.random.binomial, {'n':10, 'p':0.5}, n, m, "Binomial(10, 0.5)")
-
-# 4. Chi-cuadrado(df=5): mu=5, sigma²=10
-z_chi = simular_tcl(np.random.chisquare, {'df':5}, n, m, "Chi-cuadrado(5)")
-
-print("="*70)
-print("GENERANDO GRÁFICO PROFESIONAL")
-print("="*70)
-
-def crear_histograma(z, titulo):
-    """
-    Crea histograma con estilo profesional para validación visual del TCL
-    """
-    fig, ax = plt.subplots(figsize=(6, 4.5))
-    
-    # Histograma
-    ax.hist(z, bins=40, density=True, alpha=0.8, 
-            color=COL_HIST, edgecolor=COL_BORDE, linewidth=0.5)
-    
-    # Curva normal teórica
-    x = np.linspace(-4, 4, 100)
-    y = stats.norm.pdf(x, 0, 1)
-    ax.plot(x, y, color=COL_NORMAL, linewidth=1.8, label='N(0,1) Teórica')
-    
-    # Configuración del estilo
-    ax.set_title(titulo, fontsize=13, fontweight='bold', 
-                 color=COL_TEXTO, pad=15)
-    ax.set_xlabel('Estadístico Z', fontsize=11, fontweight='bold', color=COL_TEXTO)
-    ax.set_ylabel('Densidad', fontsize=11, fontweight='bold', color=COL_TEXTO)
-    
-    # Ejes
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_color(COL_BORDE)
-    ax.spines['bottom'].set_color(COL_BORDE)
-    ax.spines['left'].set_linewidth(0.5)
-    ax.spines['bottom'].set_linewidth(0.5)
-    
-    # Límites y ticks
-    ax.set_xlim(-4, 4)
-    ax.tick_params(colors=COL_TEXTO, labelsize=10, width=0.5)
-    
-    # Fondo
-    ax.set_facecolor(COL_FONDO)
-    fig.patch.set_facecolor(COL_FONDO)
-    
-    # Leyenda
-    ax.legend(loc='upper right', frameon=False, fontsize=9)
-    
-    plt.tight_layout()
-    return fig
-
-# Crear los 4 gráficos
-fig1 = crear_histograma(z_unif, "Uniforme(0,1)")
-fig2 = crear_histograma(z_exp, "Exponencial(1)")
-fig3 = crear_histograma(z_binom, "Binomial(10, 0.5)")
-fig4 = crear_histograma(z_chi, "Chi-cuadrado(5)")
-
-# Mostrar en ventana emergente
-print("\n=== MOSTRANDO GRÁFICOS EN VENTANA ===\n")
-
-# Crear figura combinada
-fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 10))
-fig.patch.set_facecolor(COL_FONDO)
-
-def plot_en_subplot(ax, z, titulo):
-    ax.hist(z, bins=40, density=True, alpha=0.8, 
-            color=COL_HIST, edgecolor=COL_BORDE, linewidth=0.5)
-    
-    x = np.linspace(-4, 4, 100)
-    y = stats.norm.pdf(x, 0, 1)
-    ax.plot(x, y, color=COL_NORMAL, linewidth=1.8)
-    
-    ax.set_title(titulo, fontsize=13, fontweight='bold', 
-                 color=COL_TEXTO, pad=15)
-    ax.set_xlabel('Estadístico Z', fontsize=11, fontweight='bold', color=COL_TEXTO)
-    ax.set_ylabel('Densidad', fontsize=11, fontweight='bold', color=COL_TEXTO)
-    
-    # Remover grid
+    resumen : dict
+        'media', 'sd', 'shapiro_w' y 'shapiro_p'
+    """
+    mom = momentos(z)
+    shapiro_stat, shapiro_p = shapiro_lote(z)
+    return {
+        'media': mom.media,
+        'sd': mom.desviacion(ddof=1),
+        'shapiro_w': shapiro_stat,
+        'shapiro_p': shapiro_p,
+    }
+
+
+def medias_tcl(n=N, m=M, semilla=SEMILLA, distribuciones=DISTRIBUCIONES_TCL):
+    """
+    Medias muestrales de cada distribución del TCL (memmap de datos/simulados)
+
+    Se generan con medias_paralelo: tareas (distribución × bloque de
+    réplicas) repartidas entre procesos, cada una con su hijo de
+    np.random.SeedSequence(semilla). El resultado no depende del número de
+    procesos, así que los metadatos (n, m, semilla) identifican los datos.
+
+    Retorna:
+    --------
+    medias : dict
+        método de np.random.Generator -> array (m,)
+    """
+    return obtener_o_generar(
+        DATOS, 'tcl_medias',
+        lambda: medias_paralelo(n, m, semilla, distribuciones),
+        metadatos={'n': n, 'm': m, 'semilla': semilla,
+                   'distribuciones': distribuciones})
+
+
+def simular_tcl_distribuciones(n=N, m=M, semilla=SEMILLA):
+    """
+    Valores estandarizados del TCL para las cuatro distribuciones
+
+    Retorna:
+    --------
+    resultados : list of tuple
+        (nombre, método, z) en el orden de DISTRIBUCIONES_TCL
+    """
+    medias = medias_tcl(n, m, semilla)
+    return [(nombre, metodo,
+             simular_tcl(getattr(np.random.Generator, metodo), params, n, m,
+                         medias=medias[metodo]))
+            for nombre, metodo, params in DISTRIBUCIONES_TCL]
+
+
+def histogramas_tcl(resultados_tcl, bins=ESTILO['bins']):
+    """
+    Histogramas y curva N(0,1) de referencia, calculados una sola vez
+
+    Las figuras individuales y el panel se dibujan desde estos arrays.
+
+    Retorna:
+    --------
+    histogramas : dict
+        método -> Histograma (densidad, bordes)
+    curva : tuple
+        (x, y) de la densidad N(0,1) en [-4, 4]
+    """
+    histogramas = {metodo: histograma_densidad(z, bins)
+                   for _, metodo, z in resultados_tcl}
+    return histogramas, curva_normal(-4, 4, 100)
+
+
+def dibujar_tcl(ax, histograma, curva, titulo, estilo, leyenda=False):
+    """
+    Histograma precalculado con la curva normal teórica, estilo profesional
+    """
+    dibujar_histograma(ax, histograma, alpha=0.8, color=estilo['col_hist'],
+                       edgecolor=estilo['col_borde'], linewidth=0.5)
+    ax.plot(*curva, color=estilo['col_normal'], linewidth=1.8,
+            label='N(0,1) Teórica')
+
+    ax.set_title(titulo, fontsize=13, fontweight='bold',
+                 color=estilo['col_texto'], pad=15)
+    ax.set_xlabel('Estadístico Z', fontsize=11, fontweight='bold', color=estilo['col_texto'])
+    ax.set_ylabel('Densidad', fontsize=11, fontweight='bold', color=estilo['col_texto'])
+
+    # Sin cuadrícula
     ax.grid(False)
-    
-    # Configurar ejes
+
+    # Ejes
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_color(COL_BORDE)
-    ax.spines['bottom'].set_color(COL_BORDE)
+    ax.spines['left'].set_color(estilo['col_borde'])
+    ax.spines['bottom'].set_color(estilo['col_borde'])
     ax.spines['left'].set_linewidth(0.5)
     ax.spines['bottom'].set_linewidth(0.5)
-    
+
+    # Límites, ticks y fondo
     ax.set_xlim(-4, 4)
-    ax.set_facecolor(COL_FONDO)
-    ax.tick_params(colors=COL_TEXTO, labelsize=10, width=0.5)
-
-plot_en_subplot(ax1, z_unif, "Uniforme(0,1)")
-plot_en_subplot(ax2, z_exp, "Exponencial(1)")
-plot_en_subplot(ax3, z_binom, "Binomial(10, 0.5)")
-plot_en_subplot(ax4, z_chi, "Chi-cuadrado(5)")
-
-plt.tight_layout()
-plt.show()
-
-print("\n=== GRÁFICO PROFESIONAL GENERADO ===\n")
-print("Características:")
-print("  ✓ Sin cuadrícula/grid")
-print("  ✓ Colores profesionales (naranja/rojo)")
-print("  ✓ Tema limpio y minimalista")
-print("  ✓ Listo para presentación o reporte\n")
+    ax.tick_params(colors=estilo['col_texto'], labelsize=10, width=0.5)
+    ax.set_facecolor(estilo['col_fondo'])
+
+    if leyenda:
+        ax.legend(loc='upper right', frameon=False, fontsize=9)
+
+
+def crear_histograma(fig, datos, estilo):
+    """
+    Figura individual de una distribución para validación visual del TCL
+    """
+    fig.patch.set_facecolor(estilo['col_fondo'])
+    dibujar_tcl(fig.subplots(), datos['histograma'], datos['curva'],
+                datos['titulo'], estilo, leyenda=True)
+    fig.tight_layout()
+
+
+def crear_panel(fig, datos, estilo):
+    """
+    Figura combinada 2×2 con las cuatro distribuciones
+    """
+    fig.patch.set_facecolor(estilo['col_fondo'])
+    axes = fig.subplots(2, 2)
+    for ax, (titulo, histograma) in zip(axes.flat, datos['paneles']):
+        dibujar_tcl(ax, histograma, datos['curva'], titulo, estilo)
+    fig.tight_layout()
+
+
+def tareas_figuras(resultados_tcl):
+    """
+    Los 4 gráficos individuales y la figura combinada, como un solo lote
+
+    Cada histograma se calcula una vez y se comparte entre su figura
+    individual y el panel. La huella de cada tarea incluye el código de
+    este módulo, así que un cambio en dibujar_tcl vuelve a renderizar las
+    cinco figuras.
+    """
+    histogramas, curva = histogramas_tcl(resultados_tcl)
+    tareas = [
+        tarea_figura(crear_histograma, FIGURAS / ARCHIVOS_TCL[metodo],
+                     datos={'histograma': histogramas[metodo], 'curva': curva,
+                            'titulo': titulo},
+                     estilo={**ESTILO, 'figsize': (6, 4.5)})
+        for titulo, metodo, _ in resultados_tcl
+    ]
+    tareas.append(
+        tarea_figura(crear_panel, FIGURAS / 'tcl_python',
+                     datos={'paneles': [(titulo, histogramas[metodo])
+                                        for titulo, metodo, _ in resultados_tcl],
+                            'curva': curva},
+                     estilo={**ESTILO, 'figsize': (12, 10)})
+    )
+    return tareas
+
+
+def main():
+    # Ignorar warnings de deprecación
+    warnings.filterwarnings('ignore')
+
+    print("="*70)
+    print("TEOREMA CENTRAL DEL LÍMITE (VISUALIZACIÓN PROFESIONAL)")
+    print("="*70)
+
+    print(f"\nParámetros:")
+    print(f"  Tamaño muestral (n): {N}")
+    print(f"  Número de réplicas (m): {M}\n")
+
+    with etapa('simulacion'):
+        resultados_tcl = simular_tcl_distribuciones()
+
+    with etapa('estadisticos'):
+        resumenes = [resumen_tcl(z) for _, _, z in resultados_tcl]
+
+    for (nombre, _, _), resumen in zip(resultados_tcl, resumenes):
+        print(f"--- {nombre} ---")
+        print(f"  Media Z = {resumen['media']:.4f} (esperado: 0)")
+        print(f"  SD Z    = {resumen['sd']:.4f} (esperado: 1)")
+        print(f"  Shapiro-Wilk W = {resumen['shapiro_w']:.4f}")
+        print(f"  Shapiro-Wilk p = {resumen['shapiro_p']:.4f}")
+
+        if resumen['shapiro_p'] > 0.05:
+            print("  ✓ Normalidad NO rechazada al 5%\n")
+        else:
+            print("  ✗ Normalidad RECHAZADA al 5%\n")
+
+    # Batería de normalidad sobre las cuatro muestras a la vez (matriz 4 × m)
+    with etapa('pruebas'):
+        bateria = en_cache(RESULTADOS)(bateria_normalidad)(
+            np.vstack([z for _, _, z in resultados_tcl]))
+
+    print("--- Batería de normalidad (p-valores) ---")
+    print(f"  {'Distribución':<20}" + "".join(f"{prueba:>18}" for prueba in bateria))
+    for i, (nombre, _, _) in enumerate(resultados_tcl):
+        print(f"  {nombre:<20}" + "".join(f"{p[i]:>18.4f}" for _, p in bateria.values()))
+    print()
+
+    print("="*70)
+    print("GENERANDO GRÁFICO PROFESIONAL")
+    print("="*70)
+
+    # Solo se renderizan las figuras cuyos datos o estilo cambiaron
+    print("\n=== RENDERIZANDO GRÁFICOS (SIN PANTALLA) ===\n")
+    with etapa('graficos'):
+        estados = renderizar_lote(tareas_figuras(resultados_tcl))
+    for ruta, estado in estados.items():
+        print(f"  {Path(ruta).name}.pdf: {estado}")
+
+    print("\n=== GRÁFICO PROFESIONAL GENERADO ===\n")
+    print("Características:")
+    print("  ✓ Sin cuadrícula/grid")
+    print("  ✓ Colores profesionales (naranja/rojo)")
+    print("  ✓ Tema limpio y minimalista")
+    print("  ✓ Listo para presentación o reporte\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,72 +6,187 @@ CAPÍTULO 2: MÁXIMA VEROSIMILITUD
 ==============================================================================
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy import stats
-
-print("=== ESTIMACIÓN POR MÁXIMA VEROSIMILITUD ===\n")
-
-np.random.seed(123)
-
-# Generar datos
-n = 100
-mu_verdadero = 10
-sigma_verdadero = 2
-datos = np.random.normal(mu_verdadero, sigma_verdadero, n)
-
-# Estimadores MLE
-mu_hat = np.mean(datos)
-sigma_hat_sesgado = np.sqrt(np.sum((datos - mu_hat)**2) / n)
-sigma_hat_insesgado = np.std(datos, ddof=1)
-
-print("--- Estimadores MLE ---")
-print(f"μ̂ (MLE) = {mu_hat:.4f}")
-print(f"σ̂ sesgado = {sigma_hat_sesgado:.4f}")
-print(f"σ̂ insesgado = {sigma_hat_insesgado:.4f}\n")
-
-print("Parámetros verdaderos:")
-print(f"μ = {mu_verdadero}")
-print(f"σ = {sigma_verdadero}\n")
-
-# Errores estándar asintóticos
-se_mu = sigma_hat_insesgado / np.sqrt(n)
-se_sigma = sigma_hat_insesgado / np.sqrt(2 * n)
-
-print("Errores estándar asintóticos:")
-print(f"SE(μ̂) = {se_mu:.4f}")
-print(f"SE(σ̂) = {se_sigma:.4f}\n")
-
-# Intervalos de confianza
-ic_mu_lower = mu_hat - 1.96 * se_mu
-ic_mu_upper = mu_hat + 1.96 * se_mu
-
-print(f"IC 95% para μ: [{ic_mu_lower:.3f}, {ic_mu_upper:.3f}]")
-contiene = mu_verdadero >= ic_mu_lower and mu_verdadero <= ic_mu_upper
-print(f"¿Contiene μ verdadero? {'SÍ' if contiene else 'NO'}\n")
-
-# Superficie de verosimilitud
-mu_seq = np.linspace(mu_hat - 1, mu_hat + 1, 50)
-sigma_seq = np.linspace(sigma_hat_sesgado - 0.5, sigma_hat_sesgado + 0.5, 50)
-MU, SIGMA = np.meshgrid(mu_seq, sigma_seq)
-
-loglik = np.zeros_like(MU)
-for i in range(len(mu_seq)):
-    for j in range(len(sigma_seq)):
-        loglik[j, i] = np.sum(stats.norm.logpdf(datos, loc=MU[j, i], scale=SIGMA[j, i]))
-
-# Visualización
-plt.figure(figsize=(8, 6))
-contour = plt.contour(MU, SIGMA, loglik, levels=20, cmap='viridis')
-plt.colorbar(contour, label='Log-Verosimilitud')
-plt.plot(mu_hat, sigma_hat_sesgado, 'ro', markersize=10, label='MLE')
-plt.plot(mu_verdadero, sigma_verdadero, 'b^', markersize=10, label='Verdadero')
-plt.xlabel('μ')
-plt.ylabel('σ')
-plt.title('Superficie de Log-Verosimilitud', fontweight='bold')
-plt.legend()
-plt.grid(alpha=0.3)
-plt.tight_layout()
-plt.savefig('../figuras/superficie_verosimilitud_python.pdf', dpi=300, bbox_inches='tight')
-print("Gráfico guardado: figuras/superficie_verosimilitud_python.pdf")
-plt.show()
+
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utilidades.aleatorio import obtener_generador
+from utilidades.bootstrap import (
+    error_estandar_media,
+    estadistico_desviacion_mle,
+    estadistico_media,
+    intervalos_bootstrap,
+)
+from utilidades.perfilado import etapa
+from utilidades.resultados import en_cache
+from utilidades.verosimilitud import (
+    ajustar_mle,
+    estimadores_mle,
+    loglik_grid_normal,
+    modelo_normal,
+)
+from utilidades.visualizacion import renderizar
+
+CARPETA = Path(__file__).resolve().parents[1]
+FIGURAS = CARPETA / 'figuras'
+RESULTADOS = CARPETA / 'resultados'
+
+# Parámetros
+SEMILLA = 123
+N = 100
+MU_VERDADERO = 10
+SIGMA_VERDADERO = 2
+
+# Bootstrap: máximo de remuestras y error Monte Carlo tolerado en los extremos
+REMUESTRAS_BOOTSTRAP = 20000
+TOLERANCIA_BOOTSTRAP = 0.005
+
+
+# Ajuste numérico (Newton-Raphson con score y Hessiana analíticos),
+# memoizado en resultados/.cache según los datos
+@en_cache(RESULTADOS)
+def ajustar_normal(datos):
+    loglik_f, score_f, hessiana_f = modelo_normal(datos)
+    return ajustar_mle(loglik_f, theta0=[np.median(datos), 1.0],
+                       score=score_f, hessiana=hessiana_f)
+
+
+def error_estandar_sigma(muestras):
+    """
+    Error estándar asintótico de σ̂ (MLE) en cada remuestra: σ̂ / √(2n)
+    """
+    return estadistico_desviacion_mle(muestras) / np.sqrt(2 * muestras.shape[1])
+
+
+def intervalos_mle(datos, rng, remuestras=REMUESTRAS_BOOTSTRAP,
+                   tolerancia=TOLERANCIA_BOOTSTRAP):
+    """
+    Intervalos bootstrap (percentil, BCa, studentizado) para μ̂ y σ̂
+
+    Retorna:
+    --------
+    intervalos : dict
+        'μ' y 'σ' -> dict método -> IntervaloBootstrap
+    """
+    return {
+        'μ': intervalos_bootstrap(datos, estadistico_media, rng,
+                                  remuestras=remuestras,
+                                  error_estandar=error_estandar_media,
+                                  tolerancia=tolerancia),
+        'σ': intervalos_bootstrap(datos, estadistico_desviacion_mle, rng,
+                                  remuestras=remuestras,
+                                  error_estandar=error_estandar_sigma,
+                                  tolerancia=tolerancia),
+    }
+
+
+def superficie_loglik(datos, mu_hat, sigma_hat, puntos=50):
+    """
+    Log-verosimilitud en una rejilla alrededor del MLE
+
+    Evaluación vectorizada con estadísticos suficientes (n, Σx, Σx²):
+    cada celda cuesta O(1) en lugar de O(n).
+
+    Retorna:
+    --------
+    MU, SIGMA, loglik : array (puntos, puntos)
+    """
+    mu_seq = np.linspace(mu_hat - 1, mu_hat + 1, puntos)
+    sigma_seq = np.linspace(sigma_hat - 0.5, sigma_hat + 0.5, puntos)
+    MU, SIGMA = np.meshgrid(mu_seq, sigma_seq)
+    return MU, SIGMA, loglik_grid_normal(datos, mu_seq, sigma_seq)
+
+
+# Visualización (renderizado sin pantalla, con caché de figuras)
+def dibujar_superficie(fig, datos, estilo):
+    """
+    Curvas de nivel de la log-verosimilitud con el MLE y el valor verdadero
+    """
+    ax = fig.subplots()
+    contour = ax.contour(datos['MU'], datos['SIGMA'], datos['loglik'],
+                         levels=estilo['niveles'], cmap='viridis')
+    fig.colorbar(contour, ax=ax, label='Log-Verosimilitud')
+    ax.plot(*datos['mle'], 'ro', markersize=10, label='MLE')
+    ax.plot(*datos['verdadero'], 'b^', markersize=10, label='Verdadero')
+    ax.set_xlabel('μ')
+    ax.set_ylabel('σ')
+    ax.set_title('Superficie de Log-Verosimilitud', fontweight='bold')
+    ax.legend()
+    ax.grid(alpha=0.3)
+    fig.tight_layout()
+
+
+def main():
+    print("=== ESTIMACIÓN POR MÁXIMA VEROSIMILITUD ===\n")
+
+    rng = obtener_generador('cap02/04_maxima_verosimilitud', semilla=SEMILLA)
+
+    # Generar datos
+    with etapa('datos'):
+        datos = rng.normal(MU_VERDADERO, SIGMA_VERDADERO, N)
+
+    with etapa('estimadores'):
+        mu_hat, sigma_hat_sesgado, sigma_hat_insesgado = estimadores_mle(datos)
+
+    print("--- Estimadores MLE ---")
+    print(f"μ̂ (MLE) = {mu_hat:.4f}")
+    print(f"σ̂ sesgado = {sigma_hat_sesgado:.4f}")
+    print(f"σ̂ insesgado = {sigma_hat_insesgado:.4f}\n")
+
+    print("Parámetros verdaderos:")
+    print(f"μ = {MU_VERDADERO}")
+    print(f"σ = {SIGMA_VERDADERO}\n")
+
+    with etapa('ajuste'):
+        ajuste = ajustar_normal(datos)
+
+    print("--- Ajuste numérico (Newton-Raphson) ---")
+    print(f"μ̂ = {ajuste.theta[0]:.4f}, σ̂ = {ajuste.theta[1]:.4f}")
+    print(f"Iteraciones: {ajuste.iteraciones} "
+          f"({'convergió' if ajuste.convergio else 'NO convergió'})\n")
+
+    # Errores estándar asintóticos: inversa de la información observada
+    se_mu, se_sigma = ajuste.se
+
+    print("Errores estándar asintóticos (inversa de la Hessiana):")
+    print(f"SE(μ̂) = {se_mu:.4f}")
+    print(f"SE(σ̂) = {se_sigma:.4f}\n")
+
+    # Intervalos de confianza
+    ic_mu_lower = mu_hat - 1.96 * se_mu
+    ic_mu_upper = mu_hat + 1.96 * se_mu
+
+    print(f"IC 95% para μ: [{ic_mu_lower:.3f}, {ic_mu_upper:.3f}]")
+    contiene = MU_VERDADERO >= ic_mu_lower and MU_VERDADERO <= ic_mu_upper
+    print(f"¿Contiene μ verdadero? {'SÍ' if contiene else 'NO'}\n")
+
+    with etapa('bootstrap'):
+        intervalos = intervalos_mle(datos, rng)
+
+    print("--- Intervalos bootstrap 95% ---")
+    for parametro, por_metodo in intervalos.items():
+        remuestras = next(iter(por_metodo.values())).remuestras
+        print(f"{parametro} ({remuestras} remuestras):")
+        for metodo, ic in por_metodo.items():
+            print(f"  {metodo:<13} [{ic.inferior:.3f}, {ic.superior:.3f}]"
+                  f"  (error MC ±{ic.error_mc.max():.4f})")
+    print()
+
+    with etapa('superficie'):
+        MU, SIGMA, loglik = superficie_loglik(datos, mu_hat, sigma_hat_sesgado)
+
+    with etapa('graficos'):
+        renderizar(dibujar_superficie, FIGURAS / 'superficie_verosimilitud_python',
+                   datos={'MU': MU, 'SIGMA': SIGMA, 'loglik': loglik,
+                          'mle': (mu_hat, sigma_hat_sesgado),
+                          'verdadero': (MU_VERDADERO, SIGMA_VERDADERO)},
+                   estilo={'figsize': (8, 6), 'dpi': 300, 'niveles': 20})
+    print("Gráfico guardado: figuras/superficie_verosimilitud_python.pdf")
+
+
+if __name__ == "__main__":
+    main()
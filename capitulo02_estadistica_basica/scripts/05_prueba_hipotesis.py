@@ -6,182 +6,299 @@ CAPÍTULO 2: PRUEBA DE HIPÓTESIS
 ==============================================================================
 """
 
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from scipy import stats
+import sys
 import warnings
+from pathlib import Path
+
+import numpy as np
+
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-warnings.filterwarnings('ignore')
+from utilidades.aleatorio import obtener_generador
+from utilidades.bootstrap import error_estandar_media, estadistico_media, intervalos_bootstrap
+from utilidades.perfilado import etapa
+from utilidades.potencia import potencia_teorica, prueba_t, superficie_potencia
+from utilidades.resultados import en_cache
+from utilidades.visualizacion import renderizar
 
-print("="*70)
-print("PRUEBA T PARA LA MEDIA (VISUALIZACIÓN PROFESIONAL)")
-print("="*70)
+CARPETA = Path(__file__).resolve().parents[1]
+FIGURAS = CARPETA / 'figuras'
+RESULTADOS = CARPETA / 'resultados'
 
 # Parámetros del experimento
-np.random.seed(20231115)  # Semilla para reproducibilidad exacta
-mu_0 = 100         # H0: μ = 100
-mu_real = 103      # Media poblacional real (para generar datos)
-sigma_real = 15    # Desviación poblacional
-n = 25             # Tamaño muestral
-alpha = 0.05       # Nivel de significancia
-
-print(f"\nDiseño del experimento:")
-print(f"  H0: μ = {mu_0}")
-print(f"  H1: μ ≠ {mu_0} (prueba bilateral)")
-print(f"  Nivel de significancia α = {alpha}")
-print(f"  Tamaño muestral n = {n}\n")
-
-# Generar datos
-X = np.random.normal(loc=mu_real, scale=sigma_real, size=n)
-
-# Estadísticos muestrales
-x_bar = np.mean(X)
-s = np.std(X, ddof=1)  # Desviación estándar muestral (corregida)
-se = s / np.sqrt(n)    # Error estándar
-
-print("Estadísticos muestrales:")
-print(f"  Media muestral (X̄) = {x_bar:.2f}")
-print(f"  Desviación estándar (S) = {s:.2f}")
-print(f"  Error estándar (S/√n) = {se:.2f}\n")
+SEMILLA = 20231115  # Reproducibilidad exacta
+MU_0 = 100          # H0: μ = 100
+MU_REAL = 103       # Media poblacional real (para generar datos)
+SIGMA_REAL = 15     # Desviación poblacional
+N = 25              # Tamaño muestral
+ALPHA = 0.05        # Nivel de significancia
+
+# Rejilla del análisis de potencia
+REPLICAS_POTENCIA = 20000
+MU_GRID = np.array([100, 103, 106, 109])
+N_GRID = np.array([10, 25, 50])
+
+# Bootstrap: máximo de remuestras y error Monte Carlo tolerado en los extremos
+REMUESTRAS_BOOTSTRAP = 20000
+TOLERANCIA_BOOTSTRAP = 0.1
+
 
 # ==============================================================
-# PRUEBA T
+# INTERVALOS BOOTSTRAP
 # ==============================================================
 
-gl = n - 1  # Grados de libertad
-t_obs = (x_bar - mu_0) / se  # Estadístico t
-t_crit = stats.t.ppf(1 - alpha/2, df=gl)  # Valor crítico bilateral
-p_valor = 2 * (1 - stats.t.cdf(abs(t_obs), df=gl))  # p-valor bilateral
+def intervalos_media(X, rng, alpha=ALPHA, remuestras=REMUESTRAS_BOOTSTRAP,
+                     tolerancia=TOLERANCIA_BOOTSTRAP):
+    """
+    Intervalos bootstrap percentil, BCa y studentizado para la media
 
-# Intervalo de confianza 95%
-ic_95 = x_bar + np.array([-1, 1]) * stats.t.ppf(0.975, df=gl) * se
+    Los índices se extraen de hijos de la SeedSequence de ``rng``: su
+    estado no cambia y las simulaciones posteriores no se ven afectadas.
 
-print("=== RESULTADOS DE LA PRUEBA T ===")
-print(f"  Grados de libertad = {gl}")
-print(f"  Estadístico t = {t_obs:.3f}")
-print(f"  Valor crítico = ±{t_crit:.3f}")
-print(f"  p-valor = {p_valor:.4f}\n")
+    Retorna:
+    --------
+    intervalos : dict
+        método -> IntervaloBootstrap
+    """
+    return intervalos_bootstrap(X, estadistico_media, rng, nivel=1 - alpha,
+                                remuestras=remuestras,
+                                error_estandar=error_estandar_media,
+                                tolerancia=tolerancia)
 
-print(f"  IC 95% = [{ic_95[0]:.2f}, {ic_95[1]:.2f}]")
-print(f"  ¿Contiene μ0={mu_0}? {'✓ SÍ' if ic_95[0] <= mu_0 <= ic_95[1] else '✗ NO'}\n")
 
-print("=== DECISIÓN ===")
-if p_valor < alpha:
-    print(f"  ✗ RECHAZAR H0 al nivel {alpha}")
-else:
-    print(f"  ✓ NO RECHAZAR H0 al nivel {alpha}")
-print()
+# ==============================================================
+# ANÁLISIS DE POTENCIA (MONTE CARLO VECTORIZADO)
+# ==============================================================
+
+def analisis_potencia(rng, mu_grid=MU_GRID, n_grid=N_GRID, sigma=SIGMA_REAL,
+                      alpha=ALPHA, mu_0=MU_0, replicas=REPLICAS_POTENCIA):
+    """
+    Potencia Monte Carlo y exacta sobre la rejilla (μ, n)
+
+    La superficie Monte Carlo se memoiza en resultados/.cache: con la misma
+    semilla y parámetros no se vuelve a simular (por eso debe ser el último
+    uso de ``rng``).
+
+    Retorna:
+    --------
+    potencia, exacta : array (len(mu_grid), 1, len(n_grid), 1)
+    """
+    potencia = en_cache(RESULTADOS)(superficie_potencia)(
+        mu_grid, [sigma], n_grid, [alpha], mu_0, replicas, rng)
+    exacta = potencia_teorica(mu_grid, [sigma], n_grid, [alpha], mu_0)
+    return potencia, exacta
+
 
 # ==============================================================
 # VISUALIZACIÓN PROFESIONAL
 # ==============================================================
 
-print("=== GENERANDO GRÁFICO PROFESIONAL ===")
-
 # Paleta de colores corporativa
-COL_REGION_CRITICA = "#e41a1c"  # Rojo intenso
-COL_T_OBS = "#377eb8"           # Azul profesional
-COL_NORMAL = "#2c2c2c"          # Negro suave
-COL_TEXT = "#333333"            # Gris oscuro para texto
-COL_FONDO = "white"             # Fondo blanco puro
-COL_SOMBRA = "#ffcccc"          # Rojo claro para área p-valor
-
-# Secuencia para densidad t
-x_t = np.linspace(-4, 4, 500)
-y_t = stats.t.pdf(x_t, df=gl)
-
-# Data frames para regiones
-df_plot = pd.DataFrame({'t': x_t, 'densidad': y_t})
-df_crit_left = pd.DataFrame({
-    't': np.linspace(-4, -t_crit, 100),
-    'densidad': stats.t.pdf(np.linspace(-4, -t_crit, 100), gl)
-})
-df_crit_right = pd.DataFrame({
-    't': np.linspace(t_crit, 4, 100),
-    'densidad': stats.t.pdf(np.linspace(t_crit, 4, 100), gl)
-})
-df_pval = pd.DataFrame({
-    't': np.linspace(t_obs, 4, 100),
-    'densidad': stats.t.pdf(np.linspace(t_obs, 4, 100), gl)
-})
-
-# Crear figura
-fig, ax = plt.subplots(figsize=(10, 6), facecolor=COL_FONDO)
-
-# Densidad t
-ax.plot(df_plot['t'], df_plot['densidad'], color=COL_NORMAL, linewidth=1.5)
-
-# Regiones críticas
-ax.fill_between(df_crit_left['t'], 0, df_crit_left['densidad'],
-                color=COL_REGION_CRITICA, alpha=0.3, label='Región crítica')
-ax.fill_between(df_crit_right['t'], 0, df_crit_right['densidad'],
-                color=COL_REGION_CRITICA, alpha=0.3)
-
-# Valores críticos
-ax.axvline(-t_crit, color=COL_REGION_CRITICA, linestyle='--', linewidth=1.5)
-ax.axvline(t_crit, color=COL_REGION_CRITICA, linestyle='--', linewidth=1.5)
-
-# Estadístico observado
-ax.axvline(t_obs, color=COL_T_OBS, linestyle='-', linewidth=2)
-
-# Área p-valor
-ax.fill_between(df_pval['t'], 0, df_pval['densidad'],
-                color=COL_SOMBRA, alpha=0.5, label='Área p-valor')
-
-# Etiquetas
-# Construir la cadena del título de forma robusta para MathText
-title_string = r'Distribución t de Student con Región Crítica (alpha = {:.2f})'.format(alpha)
-ax.set_title(title_string,
-             fontsize=14, fontweight='bold', color=COL_TEXT, pad=20)
-ax.set_xlabel('Estadístico t', fontsize=12, fontweight='bold', color=COL_TEXT)
-ax.set_ylabel('Densidad de Probabilidad', fontsize=12, fontweight='bold', color=COL_TEXT)
-
-# Texto con valores
-ax.text(-3.5, 0.35, f't obs = {t_obs:.3f}\np = {p_valor:.4f}',
-        fontsize=10, color=COL_T_OBS, fontweight='bold',
-        bbox=dict(boxstyle="round,pad=0.3", facecolor=COL_FONDO, edgecolor=COL_T_OBS))
-
-ax.text(2.5, 0.35, f't crit = \u00b1{t_crit:.3f}',
-        fontsize=10, color=COL_REGION_CRITICA, fontweight='bold',
-        bbox=dict(boxstyle="round,pad=0.3", facecolor=COL_FONDO, edgecolor=COL_REGION_CRITICA))
-
-# Ejes
-ax.set_xlim(-4, 4)
-ax.set_ylim(0, 0.4)
-ax.tick_params(colors=COL_TEXT, labelsize=11, width=0.5)
-for spine in ax.spines.values():
-    spine.set_visible(False)
-ax.spines['bottom'].set_visible(True)
-ax.spines['left'].set_visible(True)
-ax.spines['bottom'].set_color(COL_NORMAL)
-ax.spines['left'].set_color(COL_NORMAL)
-ax.spines['bottom'].set_linewidth(0.5)
-ax.spines['left'].set_linewidth(0.5)
-
-# Eliminar grid
-ax.grid(False)
-
-# Añadir línea vertical en 0
-# Construir la cadena para H0 de forma robusta para MathText
-h0_text_string = r'H_0: mu = {}'.format(mu_0)
-ax.text(0.1, 0.3, h0_text_string, fontsize=10, color=COL_NORMAL,
-        bbox=dict(boxstyle="round,pad=0.2", facecolor=COL_FONDO, edgecolor=COL_NORMAL))
-
-# IC 95%
-ax.text(0, 0.02, f'IC 95% = [{ic_95[0]:.2f}, {ic_95[1]:.2f}]',
-        fontsize=9, color=COL_T_OBS, ha='center',
-        bbox=dict(boxstyle="round,pad=0.3", facecolor=COL_FONDO, edgecolor=COL_T_OBS))
-
-plt.tight_layout()
-plt.savefig('t_test_plot.pdf', bbox_inches='tight')
-plt.show()
-
-print("\n=== GRÁFICO PROFESIONAL GENERADO ===\n")
-print("Características:")
-print("  \u2713 Sin cuadrícula/grid")
-print("  \u2713 Colores corporativos (rojo/azul profesional)")
-print("  \u2713 Regiones críticas sombreadas")
-print("  \u2713 Estadístico observado marcado")
-print("  \u2713 Área p-valor visualizada")
-print("  \u2713 Ejes limpios y minimalistas\n")
+ESTILO = {
+    'col_region_critica': "#e41a1c",  # Rojo intenso
+    'col_t_obs': "#377eb8",           # Azul profesional
+    'col_normal': "#2c2c2c",          # Negro suave
+    'col_text': "#333333",            # Gris oscuro para texto
+    'col_fondo': "white",             # Fondo blanco puro
+    'col_sombra': "#ffcccc",          # Rojo claro para área p-valor
+    'figsize': (10, 6),
+    'facecolor': "white",
+}
+
+def dibujar_prueba_t(fig, datos, estilo):
+    """
+    Densidad t con regiones críticas, estadístico observado y área p-valor
+    """
+    gl, t_obs, t_crit = datos['gl'], datos['t_obs'], datos['t_crit']
+    p_valor, ic_95 = datos['p_valor'], datos['ic_95']
+    alpha, mu_0 = datos['alpha'], datos['mu_0']
+
+    COL_REGION_CRITICA = estilo['col_region_critica']
+    COL_T_OBS = estilo['col_t_obs']
+    COL_NORMAL = estilo['col_normal']
+    COL_TEXT = estilo['col_text']
+    COL_FONDO = estilo['col_fondo']
+    COL_SOMBRA = estilo['col_sombra']
+
+    import pandas as pd
+    from scipy import stats
+
+    # Secuencia para densidad t
+    x_t = np.linspace(-4, 4, 500)
+    y_t = stats.t.pdf(x_t, df=gl)
+
+    # Data frames para regiones
+    df_plot = pd.DataFrame({'t': x_t, 'densidad': y_t})
+    df_crit_left = pd.DataFrame({
+        't': np.linspace(-4, -t_crit, 100),
+        'densidad': stats.t.pdf(np.linspace(-4, -t_crit, 100), gl)
+    })
+    df_crit_right = pd.DataFrame({
+        't': np.linspace(t_crit, 4, 100),
+        'densidad': stats.t.pdf(np.linspace(t_crit, 4, 100), gl)
+    })
+    df_pval = pd.DataFrame({
+        't': np.linspace(t_obs, 4, 100),
+        'densidad': stats.t.pdf(np.linspace(t_obs, 4, 100), gl)
+    })
+
+    # Crear ejes
+    ax = fig.subplots()
+
+    # Densidad t
+    ax.plot(df_plot['t'], df_plot['densidad'], color=COL_NORMAL, linewidth=1.5)
+
+    # Regiones críticas
+    ax.fill_between(df_crit_left['t'], 0, df_crit_left['densidad'],
+                    color=COL_REGION_CRITICA, alpha=0.3, label='Región crítica')
+    ax.fill_between(df_crit_right['t'], 0, df_crit_right['densidad'],
+                    color=COL_REGION_CRITICA, alpha=0.3)
+
+    # Valores críticos
+    ax.axvline(-t_crit, color=COL_REGION_CRITICA, linestyle='--', linewidth=1.5)
+    ax.axvline(t_crit, color=COL_REGION_CRITICA, linestyle='--', linewidth=1.5)
+
+    # Estadístico observado
+    ax.axvline(t_obs, color=COL_T_OBS, linestyle='-', linewidth=2)
+
+    # Área p-valor
+    ax.fill_between(df_pval['t'], 0, df_pval['densidad'],
+                    color=COL_SOMBRA, alpha=0.5, label='Área p-valor')
+
+    # Etiquetas
+    # Construir la cadena del título de forma robusta para MathText
+    title_string = r'Distribución t de Student con Región Crítica (alpha = {:.2f})'.format(alpha)
+    ax.set_title(title_string,
+                 fontsize=14, fontweight='bold', color=COL_TEXT, pad=20)
+    ax.set_xlabel('Estadístico t', fontsize=12, fontweight='bold', color=COL_TEXT)
+    ax.set_ylabel('Densidad de Probabilidad', fontsize=12, fontweight='bold', color=COL_TEXT)
+
+    # Texto con valores
+    ax.text(-3.5, 0.35, f't obs = {t_obs:.3f}\np = {p_valor:.4f}',
+            fontsize=10, color=COL_T_OBS, fontweight='bold',
+            bbox=dict(boxstyle="round,pad=0.3", facecolor=COL_FONDO, edgecolor=COL_T_OBS))
+
+    ax.text(2.5, 0.35, f't crit = \u00b1{t_crit:.3f}',
+            fontsize=10, color=COL_REGION_CRITICA, fontweight='bold',
+            bbox=dict(boxstyle="round,pad=0.3", facecolor=COL_FONDO, edgecolor=COL_REGION_CRITICA))
+
+    # Ejes
+    ax.set_xlim(-4, 4)
+    ax.set_ylim(0, 0.4)
+    ax.tick_params(colors=COL_TEXT, labelsize=11, width=0.5)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.spines['bottom'].set_visible(True)
+    ax.spines['left'].set_visible(True)
+    ax.spines['bottom'].set_color(COL_NORMAL)
+    ax.spines['left'].set_color(COL_NORMAL)
+    ax.spines['bottom'].set_linewidth(0.5)
+    ax.spines['left'].set_linewidth(0.5)
+
+    # Eliminar grid
+    ax.grid(False)
+
+    # Añadir línea vertical en 0
+    # Construir la cadena para H0 de forma robusta para MathText
+    h0_text_string = r'H_0: mu = {}'.format(mu_0)
+    ax.text(0.1, 0.3, h0_text_string, fontsize=10, color=COL_NORMAL,
+            bbox=dict(boxstyle="round,pad=0.2", facecolor=COL_FONDO, edgecolor=COL_NORMAL))
+
+    # IC 95%
+    ax.text(0, 0.02, f'IC 95% = [{ic_95[0]:.2f}, {ic_95[1]:.2f}]',
+            fontsize=9, color=COL_T_OBS, ha='center',
+            bbox=dict(boxstyle="round,pad=0.3", facecolor=COL_FONDO, edgecolor=COL_T_OBS))
+
+    fig.tight_layout()
+
+
+
+def main():
+    warnings.filterwarnings('ignore')
+
+    print("="*70)
+    print("PRUEBA T PARA LA MEDIA (VISUALIZACIÓN PROFESIONAL)")
+    print("="*70)
+
+    rng = obtener_generador('cap02/05_prueba_hipotesis', semilla=SEMILLA)
+
+    print(f"\nDiseño del experimento:")
+    print(f"  H0: μ = {MU_0}")
+    print(f"  H1: μ ≠ {MU_0} (prueba bilateral)")
+    print(f"  Nivel de significancia α = {ALPHA}")
+    print(f"  Tamaño muestral n = {N}\n")
+
+    # Generar datos
+    with etapa('datos'):
+        X = rng.normal(loc=MU_REAL, scale=SIGMA_REAL, size=N)
+    with etapa('prueba_t'):
+        r = prueba_t(X, MU_0, ALPHA)
+
+    print("Estadísticos muestrales:")
+    print(f"  Media muestral (X̄) = {r['x_bar']:.2f}")
+    print(f"  Desviación estándar (S) = {r['s']:.2f}")
+    print(f"  Error estándar (S/√n) = {r['se']:.2f}\n")
+
+    print("=== RESULTADOS DE LA PRUEBA T ===")
+    print(f"  Grados de libertad = {r['gl']}")
+    print(f"  Estadístico t = {r['t_obs']:.3f}")
+    print(f"  Valor crítico = ±{r['t_crit']:.3f}")
+    print(f"  p-valor = {r['p_valor']:.4f}\n")
+
+    ic_95 = r['ic_95']
+    print(f"  IC 95% = [{ic_95[0]:.2f}, {ic_95[1]:.2f}]")
+    print(f"  ¿Contiene μ0={MU_0}? {'✓ SÍ' if ic_95[0] <= MU_0 <= ic_95[1] else '✗ NO'}\n")
+
+    with etapa('bootstrap'):
+        intervalos = intervalos_media(X, rng)
+
+    remuestras = next(iter(intervalos.values())).remuestras
+    print(f"=== INTERVALOS BOOTSTRAP PARA μ ({remuestras} remuestras) ===")
+    for metodo, ic in intervalos.items():
+        print(f"  {metodo:<13} [{ic.inferior:.2f}, {ic.superior:.2f}]"
+              f"  (error MC ±{ic.error_mc.max():.3f})")
+    print(f"  (t de Student:  [{ic_95[0]:.2f}, {ic_95[1]:.2f}])\n")
+
+    print("=== DECISIÓN ===")
+    if r['rechazar']:
+        print(f"  ✗ RECHAZAR H0 al nivel {ALPHA}")
+    else:
+        print(f"  ✓ NO RECHAZAR H0 al nivel {ALPHA}")
+    print()
+
+    with etapa('potencia'):
+        potencia, exacta = analisis_potencia(rng)
+
+    print(f"=== POTENCIA DE LA PRUEBA (σ = {SIGMA_REAL}, α = {ALPHA}) ===")
+    print(f"  Réplicas por celda: {REPLICAS_POTENCIA}")
+    print(f"  {'μ real':>8}" + "".join(f"  {'n = ' + str(k):>16}" for k in N_GRID))
+    for i, mu_i in enumerate(MU_GRID):
+        celdas = "".join(f"  {potencia[i, 0, k, 0]:>6.3f} ({exacta[i, 0, k, 0]:.3f})"
+                         for k in range(N_GRID.size))
+        print(f"  {mu_i:>8}" + celdas)
+    print("  (entre paréntesis: potencia exacta con la t no central;")
+    print("   en μ = μ0 la tasa de rechazo es el tamaño empírico)\n")
+
+    print("=== GENERANDO GRÁFICO PROFESIONAL ===")
+
+    with etapa('graficos'):
+        renderizar(dibujar_prueba_t, FIGURAS / 't_test_plot',
+                   datos={'gl': r['gl'], 't_obs': r['t_obs'], 't_crit': r['t_crit'],
+                          'p_valor': r['p_valor'], 'ic_95': ic_95,
+                          'alpha': ALPHA, 'mu_0': MU_0},
+                   estilo=ESTILO)
+    print("Gráfico guardado: figuras/t_test_plot.pdf")
+
+    print("\n=== GRÁFICO PROFESIONAL GENERADO ===\n")
+    print("Características:")
+    print("  \u2713 Sin cuadrícula/grid")
+    print("  \u2713 Colores corporativos (rojo/azul profesional)")
+    print("  \u2713 Regiones críticas sombreadas")
+    print("  \u2713 Estadístico observado marcado")
+    print("  \u2713 Área p-valor visualizada")
+    print("  \u2713 Ejes limpios y minimalistas\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+CAPÍTULO 5: MCO INCREMENTAL (QR ACUMULADA)
+==============================================================================
+Regresión múltiple con el factor R de la QR acumulado por bloques:
+inferencia t/F, ventana móvil con altas y bajas de filas y muchas
+variables dependientes con la misma X.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utilidades.aleatorio import obtener_generador
+from utilidades.perfilado import etapa
+from utilidades.regresion import AcumuladorMCO, mco
+
+# Parámetros
+SEMILLA = 505
+N = 100_000
+BETA = np.array([2.0, 1.5, -0.8, 0.0, 0.3])   # constante + 4 regresores
+SIGMA = 2.0
+ALPHA = 0.05
+
+VENTANA = 20_000    # Observaciones de la ventana móvil
+PASOS = 500         # Desplazamientos de la ventana
+M_Y = 500           # Variables dependientes con la misma X
+
+
+def simular_datos(rng, n=N, beta=BETA, sigma=SIGMA, m=1):
+    """
+    X con constante y regresores N(0, 1); Y = Xβ + ε (m columnas si m > 1)
+
+    Retorna:
+    --------
+    X : array (n, k)
+    Y : array (n,) o (n, m)
+    """
+    k = beta.size
+    X = np.empty((n, k))
+    X[:, 0] = 1.0
+    X[:, 1:] = rng.standard_normal((n, k - 1))
+    if m == 1:
+        return X, X @ beta + sigma * rng.standard_normal(n)
+    B = beta[:, None] + rng.standard_normal((k, m))
+    return X, X @ B + sigma * rng.standard_normal((n, m))
+
+
+def ventana_movil(X, y, ventana=VENTANA, pasos=PASOS):
+    """
+    Coeficientes de una ventana móvil: una alta y una baja por paso
+
+    Retorna:
+    --------
+    coeficientes : array (pasos + 1, k)
+    """
+    acumulador = AcumuladorMCO.desde_bloque(X[:ventana], y[:ventana])
+    coeficientes = [acumulador.coeficientes()]
+    for i in range(pasos):
+        acumulador.agregar_fila(X[ventana + i], y[ventana + i])
+        acumulador.quitar_fila(X[i], y[i])
+        coeficientes.append(acumulador.coeficientes())
+    return np.array(coeficientes)
+
+
+def ventana_movil_reajuste(X, y, ventana=VENTANA, pasos=PASOS):
+    """
+    Misma ventana móvil reajustando con las n filas en cada paso (referencia)
+    """
+    return np.array([np.linalg.lstsq(X[i:i + ventana], y[i:i + ventana],
+                                     rcond=None)[0]
+                     for i in range(pasos + 1)])
+
+
+def main():
+    print("=" * 70)
+    print("MCO INCREMENTAL: QR ACUMULADA POR BLOQUES")
+    print("=" * 70)
+
+    rng = obtener_generador('cap05/01_mco_incremental', semilla=SEMILLA)
+
+    with etapa('datos'):
+        X, y = simular_datos(rng)
+
+    # ==============================================================
+    # AJUSTE E INFERENCIA
+    # ==============================================================
+
+    with etapa('ajuste'):
+        acumulador = mco(X, y)
+        r = acumulador.ajustar(nivel=1 - ALPHA)
+
+    print(f"\nn = {r.n}, k = {BETA.size}, gl = {r.gl}\n")
+    print(f"  {'':>6}{'β verdadero':>13}{'β̂':>10}{'EE':>9}{'t':>10}"
+          f"{'p-valor':>10}   IC {100 * (1 - ALPHA):.0f}%")
+    for j in range(BETA.size):
+        print(f"  {'β' + str(j):>6}{BETA[j]:>13.3f}{r.coeficientes[j]:>10.4f}"
+              f"{r.errores_estandar[j]:>9.4f}{r.t[j]:>10.2f}{r.p_valores[j]:>10.4f}"
+              f"   [{r.ic[j, 0]:.4f}, {r.ic[j, 1]:.4f}]")
+    print(f"\n  σ̂ = {np.sqrt(r.sigma2):.4f}, R² = {r.r2:.4f}")
+    print(f"  F global = {r.f:.2f} (p = {r.p_valor_f:.4g})")
+
+    # H0: β3 = 0 y β4 = 0.3 (ambas ciertas en la simulación)
+    C = np.array([[0, 0, 0, 1, 0], [0, 0, 0, 0, 1]])
+    f, p = acumulador.prueba_f(C, [0.0, 0.3])
+    print(f"  H0: β3 = 0, β4 = 0.3  →  F = {f:.3f}, p = {p:.4f} "
+          f"({'RECHAZAR' if p < ALPHA else 'NO rechazar'} al {ALPHA})\n")
+
+    # Combinación de particiones: dos mitades ajustadas por separado
+    with etapa('particiones'):
+        mitad = N // 2
+        partes = AcumuladorMCO.desde_bloque(X[:mitad], y[:mitad])
+        partes.combinar(AcumuladorMCO.desde_bloque(X[mitad:], y[mitad:]))
+    diferencia = np.abs(partes.coeficientes() - r.coeficientes).max()
+    print(f"  Dos particiones combinadas: |Δβ̂| máx = {diferencia:.1e}\n")
+
+    # ==============================================================
+    # VENTANA MÓVIL: ALTAS Y BAJAS DE FILAS
+    # ==============================================================
+
+    print("=" * 70)
+    print(f"VENTANA MÓVIL ({VENTANA} observaciones, {PASOS} pasos)")
+    print("=" * 70)
+    with etapa('ventana_movil'):
+        t0 = time.perf_counter()
+        incremental = ventana_movil(X, y)
+        t_incremental = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        reajuste = ventana_movil_reajuste(X, y)
+        t_reajuste = time.perf_counter() - t0
+    print(f"\n  Reajuste completo: {t_reajuste:.4f} s")
+    print(f"  Alta + baja (QR): {t_incremental:.4f} s "
+          f"({t_reajuste / t_incremental:.1f}x)")
+    print(f"  |Δβ̂| máx: {np.abs(incremental - reajuste).max():.1e}\n")
+
+    # ==============================================================
+    # MUCHAS VARIABLES DEPENDIENTES CON LA MISMA X
+    # ==============================================================
+
+    print("=" * 70)
+    print(f"{M_Y} VARIABLES DEPENDIENTES CON LA MISMA X")
+    print("=" * 70)
+    with etapa('lote_y'):
+        X_m, Y = simular_datos(rng, n=N // 10, m=M_Y)
+        t0 = time.perf_counter()
+        lote = mco(X_m, Y).ajustar()
+        t_lote = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        separados = np.column_stack([np.linalg.lstsq(X_m, Y[:, j], rcond=None)[0]
+                                     for j in range(M_Y)])
+        t_separados = time.perf_counter() - t0
+    print(f"\n  {M_Y} ajustes por separado: {t_separados:.4f} s")
+    print(f"  Una factorización:      {t_lote:.4f} s "
+          f"({t_separados / t_lote:.1f}x)")
+    print(f"  |Δβ̂| máx: {np.abs(lote.coeficientes - separados).max():.1e}")
+    print(f"  R² mediano: {np.median(lote.r2):.4f}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+CAPÍTULO 8: ERRORES ESTÁNDAR ROBUSTOS A HETEROCEDASTICIDAD
+==============================================================================
+Errores estándar clásicos frente a HC0-HC3 (White, MacKinnon-White) con
+varianza del error creciente en un regresor. El apalancamiento se obtiene
+de las normas de las filas de Q (QR de X), sin formar la matriz sombrero.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utilidades.aleatorio import obtener_generador
+from utilidades.covarianza import (
+    TIPOS_HC,
+    apalancamiento,
+    covarianza_hc,
+    mco_robusto,
+    residuos,
+)
+from utilidades.perfilado import etapa
+from utilidades.regresion import inferencia_t, mco
+
+# Parámetros
+SEMILLA = 808
+N = 1_000_000
+BETA = np.array([1.0, 0.5, -0.3])   # constante + 2 regresores
+ALPHA = 0.05
+
+# Monte Carlo de cobertura en muestra pequeña
+N_PEQUENA = 40
+REPLICAS = 2_000
+
+
+def simular_datos(rng, n=N, beta=BETA):
+    """
+    X con constante y regresores N(0, 1); la desviación del error crece
+    con |x₁|: σᵢ = 0.5 + |x₁ᵢ|
+
+    Retorna:
+    --------
+    X : array (n, k)
+    y : array (n,)
+    """
+    k = beta.size
+    X = np.empty((n, k))
+    X[:, 0] = 1.0
+    X[:, 1:] = rng.standard_normal((n, k - 1))
+    sigma = 0.5 + np.abs(X[:, 1])
+    return X, X @ beta + sigma * rng.standard_normal(n)
+
+
+def imprimir_tabla(r, titulo):
+    """
+    Tabla de inferencia con el formato de AcumuladorMCO.ajustar
+    """
+    print(f"\n  {titulo}")
+    print(f"  {'':>6}{'β̂':>10}{'EE':>9}{'t':>10}{'p-valor':>10}"
+          f"   IC {100 * (1 - ALPHA):.0f}%")
+    for j in range(r.coeficientes.size):
+        print(f"  {'β' + str(j):>6}{r.coeficientes[j]:>10.4f}"
+              f"{r.errores_estandar[j]:>9.4f}{r.t[j]:>10.2f}{r.p_valores[j]:>10.4f}"
+              f"   [{r.ic[j, 0]:.4f}, {r.ic[j, 1]:.4f}]")
+    print(f"  F global = {r.f:.2f} (p = {r.p_valor_f:.4g})")
+
+
+def cobertura(rng, n=N_PEQUENA, replicas=REPLICAS, beta=BETA, alpha=ALPHA):
+    """
+    Cobertura empírica del IC de β₁ con errores clásicos y HC0-HC3
+
+    Retorna:
+    --------
+    cobertura : dict {tipo: proporción de intervalos que contienen β₁}
+    """
+    aciertos = dict.fromkeys(('Clásico',) + TIPOS_HC, 0)
+    for _ in range(replicas):
+        X, y = simular_datos(rng, n=n, beta=beta)
+        acumulador = mco(X, y)
+        r = acumulador.ajustar(nivel=1 - alpha)
+        aciertos['Clásico'] += r.ic[1, 0] <= beta[1] <= r.ic[1, 1]
+        e = residuos(X, y, r.coeficientes)
+        for tipo in TIPOS_HC:
+            se = np.sqrt(np.diag(covarianza_hc(X, e, acumulador.R, tipo)))
+            _, _, ic = inferencia_t(r.coeficientes, se, r.gl, 1 - alpha)
+            aciertos[tipo] += ic[1, 0] <= beta[1] <= ic[1, 1]
+    return {tipo: a / replicas for tipo, a in aciertos.items()}
+
+
+def main():
+    print("=" * 70)
+    print("ERRORES ESTÁNDAR ROBUSTOS A HETEROCEDASTICIDAD (HC0-HC3)")
+    print("=" * 70)
+
+    rng = obtener_generador('cap08/01_errores_robustos', semilla=SEMILLA)
+
+    with etapa('datos'):
+        X, y = simular_datos(rng)
+
+    # ==============================================================
+    # INFERENCIA CLÁSICA FRENTE A ROBUSTA
+    # ==============================================================
+
+    with etapa('clasico'):
+        acumulador = mco(X, y)
+        clasico = acumulador.ajustar(nivel=1 - ALPHA)
+    print(f"\nn = {clasico.n}, k = {BETA.size}, gl = {clasico.gl}")
+    imprimir_tabla(clasico, "Errores estándar clásicos (homocedasticidad)")
+
+    with etapa('robusto'):
+        t0 = time.perf_counter()
+        robusto = mco_robusto(X, y, 'HC3', nivel=1 - ALPHA)
+        t_robusto = time.perf_counter() - t0
+    imprimir_tabla(robusto, f"Errores estándar HC3 ({t_robusto:.2f} s)")
+
+    print(f"\n  {'':>6}" + "".join(f"{tipo:>10}" for tipo in ('Clásico',) + TIPOS_HC))
+    errores = {tipo: mco_robusto(X, y, tipo).errores_estandar for tipo in TIPOS_HC}
+    for j in range(BETA.size):
+        print(f"  {'EE β' + str(j):>6}{clasico.errores_estandar[j]:>10.5f}"
+              + "".join(f"{errores[tipo][j]:>10.5f}" for tipo in TIPOS_HC))
+
+    with etapa('apalancamiento'):
+        h = apalancamiento(X, acumulador.R)
+    print(f"\n  Apalancamiento: Σhᵢ = {h.sum():.4f} (= k), "
+          f"máx hᵢ = {h.max():.2e}, memoria O(nk) sin matriz n × n")
+
+    # ==============================================================
+    # COBERTURA EN MUESTRA PEQUEÑA
+    # ==============================================================
+
+    print("\n" + "=" * 70)
+    print(f"COBERTURA DEL IC {100 * (1 - ALPHA):.0f}% DE β1 "
+          f"(n = {N_PEQUENA}, {REPLICAS} réplicas)")
+    print("=" * 70 + "\n")
+    with etapa('cobertura'):
+        resultado = cobertura(rng)
+    for tipo, c in resultado.items():
+        print(f"  {tipo:>8}: {c:.3f}")
+    print("\n  HC2 y HC3 corrigen el sesgo de HC0 cuando n es pequeña.\n")
+
+
+if __name__ == "__main__":
+    main()
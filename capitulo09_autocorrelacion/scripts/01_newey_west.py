@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+CAPÍTULO 9: ERRORES ESTÁNDAR HAC (NEWEY-WEST)
+==============================================================================
+Regresor y error AR(1): los errores estándar clásicos subestiman la
+variabilidad de β̂. La covarianza de Newey-West se construye con sumas
+acumuladas de productos cruzados rezagados, con costo independiente del
+número de rezagos.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utilidades.aleatorio import obtener_generador
+from utilidades.covarianza import (
+    NUCLEOS,
+    covarianza_hac,
+    mco_robusto,
+    pesos_nucleo,
+    residuos,
+    rezagos_newey_west,
+)
+from utilidades.perfilado import etapa
+from utilidades.regresion import mco
+
+# Parámetros
+SEMILLA = 909
+N = 1_000_000
+BETA = np.array([1.0, 0.5])   # constante + 1 regresor
+RHO_X = 0.7                   # Persistencia del regresor
+RHO_E = 0.6                   # Persistencia del error
+ALPHA = 0.05
+
+REZAGOS_ESCALA = (10, 100, 1_000, 10_000)   # Anchos de banda para el tiempo
+N_DIRECTO = 20_000                          # Muestra para comparar con el bucle
+
+
+def ar1(rng, n, rho):
+    """
+    Proceso AR(1) estacionario con innovaciones N(0, 1)
+    """
+    from scipy.signal import lfilter
+
+    z = rng.standard_normal(n)
+    z[0] /= np.sqrt(1 - rho**2)
+    return lfilter([1.0], [1.0, -rho], z)
+
+
+def simular_datos(rng, n=N, beta=BETA, rho_x=RHO_X, rho_e=RHO_E):
+    """
+    y = β₀ + β₁x + ε con x y ε AR(1) independientes
+
+    Retorna:
+    --------
+    X : array (n, 2)
+    y : array (n,)
+    """
+    X = np.empty((n, 2))
+    X[:, 0] = 1.0
+    X[:, 1] = ar1(rng, n, rho_x)
+    return X, X @ beta + ar1(rng, n, rho_e)
+
+
+def hac_directo(X, e, rezagos, nucleo='bartlett'):
+    """
+    Newey-West con un bucle sobre los rezagos (referencia, O(nkL))
+    """
+    n, k = X.shape
+    u = X * e[:, None]
+    S = u.T @ u
+    for l, w in enumerate(pesos_nucleo(rezagos, nucleo), start=1):
+        G = u[l:].T @ u[:-l]
+        S += w * (G + G.T)
+    XtX_inv = np.linalg.inv(X.T @ X)
+    return XtX_inv @ S @ XtX_inv * n / (n - k)
+
+
+def main():
+    print("=" * 70)
+    print("ERRORES ESTÁNDAR HAC: NEWEY-WEST")
+    print("=" * 70)
+
+    rng = obtener_generador('cap09/01_newey_west', semilla=SEMILLA)
+
+    with etapa('datos'):
+        X, y = simular_datos(rng)
+
+    # ==============================================================
+    # CLÁSICO FRENTE A NEWEY-WEST
+    # ==============================================================
+
+    L = rezagos_newey_west(N)
+    with etapa('ajuste'):
+        clasico = mco(X, y).ajustar(nivel=1 - ALPHA)
+        hac = mco_robusto(X, y, 'HAC', rezagos=L, nivel=1 - ALPHA)
+
+    # Varianza de largo plazo teórica de xε con AR(1) independientes
+    factor = (1 + RHO_X * RHO_E) / (1 - RHO_X * RHO_E)
+    print(f"\nn = {N}, ρx = {RHO_X}, ρε = {RHO_E}, "
+          f"rezagos (Newey-West 1994) = {L}\n")
+    print(f"  {'':>6}{'β̂':>10}{'EE clásico':>13}{'EE HAC':>10}{'t HAC':>10}"
+          f"   IC {100 * (1 - ALPHA):.0f}% HAC")
+    for j in range(BETA.size):
+        print(f"  {'β' + str(j):>6}{hac.coeficientes[j]:>10.4f}"
+              f"{clasico.errores_estandar[j]:>13.5f}{hac.errores_estandar[j]:>10.5f}"
+              f"{hac.t[j]:>10.2f}   [{hac.ic[j, 0]:.4f}, {hac.ic[j, 1]:.4f}]")
+    razon = (hac.errores_estandar[1] / clasico.errores_estandar[1])**2
+    print(f"\n  Var HAC / Var clásica (β1) = {razon:.3f} "
+          f"(teórica: {factor:.3f})")
+
+    # ==============================================================
+    # NÚCLEOS Y COMPARACIÓN CON EL BUCLE SOBRE REZAGOS
+    # ==============================================================
+
+    print("\n" + "=" * 70)
+    print(f"NÚCLEOS (n = {N_DIRECTO}, rezagos = {L})")
+    print("=" * 70 + "\n")
+    X_d, y_d = X[:N_DIRECTO], y[:N_DIRECTO]
+    acumulador = mco(X_d, y_d)
+    e_d = residuos(X_d, y_d, acumulador.coeficientes())
+    for nucleo in NUCLEOS:
+        V = covarianza_hac(X_d, e_d, acumulador.R, L, nucleo)
+        diferencia = np.abs(V - hac_directo(X_d, e_d, L, nucleo)).max()
+        print(f"  {nucleo:>10}: EE β1 = {np.sqrt(V[1, 1]):.5f}, "
+              f"|ΔV| frente al bucle = {diferencia:.1e}")
+
+    # ==============================================================
+    # ESCALA CON EL NÚMERO DE REZAGOS
+    # ==============================================================
+
+    print("\n" + "=" * 70)
+    print(f"TIEMPO SEGÚN EL NÚMERO DE REZAGOS (n = {N})")
+    print("=" * 70 + "\n")
+    acumulador = mco(X, y)
+    e = residuos(X, y, acumulador.coeficientes())
+    with etapa('escala'):
+        for rezagos in REZAGOS_ESCALA:
+            t0 = time.perf_counter()
+            V = covarianza_hac(X, e, acumulador.R, rezagos)
+            t_hac = time.perf_counter() - t0
+            print(f"  L = {rezagos:>6}: {t_hac:.3f} s, EE β1 = {np.sqrt(V[1, 1]):.5f}")
+    print("\n  Con Bartlett el costo es O(nk) para cualquier L; el bucle directo")
+    print("  sobre los rezagos sería O(nkL).\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+CAPÍTULO 11: EFECTOS FIJOS, EFECTOS ALEATORIOS Y PRUEBA DE HAUSMAN
+==============================================================================
+Panel de trabajadores, empresas y años con efectos individuales
+correlacionados con el regresor: MCO agrupado, efectos fijos (within),
+efectos aleatorios y prueba de Hausman. Los efectos fijos se absorben con
+medias por grupo y proyecciones alternadas, sin matrices de ficticias.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utilidades.aleatorio import obtener_generador
+from utilidades.panel import (
+    Agrupacion,
+    efectos_aleatorios,
+    efectos_fijos,
+    prueba_hausman,
+)
+from utilidades.perfilado import etapa
+from utilidades.regresion import mco
+
+# Parámetros
+SEMILLA = 1111
+N_INDIVIDUOS = 100_000
+T = 5                      # Años por individuo (panel balanceado)
+N_EMPRESAS = 10_000
+MOVILIDAD = 0.2            # Probabilidad de cambiar de empresa cada año
+BETA = np.array([1.0, -0.5])
+CORRELACION = 1.0          # Carga del efecto individual en x₁
+ALPHA = 0.05
+
+N_FICTICIAS = 300          # Individuos para comparar con la regresión de ficticias
+
+
+def simular_panel(rng, n_individuos=N_INDIVIDUOS, t=T, n_empresas=N_EMPRESAS,
+                  movilidad=MOVILIDAD, beta=BETA, correlacion=CORRELACION):
+    """
+    yᵢₜ = xᵢₜ'β + αᵢ + ψ_empresa(i,t) + λₜ + εᵢₜ, con x₁ correlacionado
+    con αᵢ y ψ
+
+    Retorna:
+    --------
+    datos : dict
+        'y', 'X', 'individuo', 'empresa', 'anio' (filas ordenadas por
+        individuo y año)
+    """
+    n = n_individuos * t
+    individuo = np.repeat(np.arange(n_individuos), t)
+    anio = np.tile(np.arange(t), n_individuos)
+
+    empresa = rng.integers(0, n_empresas, n_individuos)[individuo]
+    cambia = rng.random(n) < movilidad
+    empresa[cambia] = rng.integers(0, n_empresas, cambia.sum())
+
+    alfa = rng.standard_normal(n_individuos)[individuo]
+    psi = rng.standard_normal(n_empresas)[empresa]
+    lam = 0.1 * np.arange(t)[anio]
+
+    X = rng.standard_normal((n, beta.size))
+    X[:, 0] += correlacion * (alfa + psi)
+    y = X @ beta + alfa + psi + lam + rng.standard_normal(n)
+    return {'y': y, 'X': X, 'individuo': individuo, 'empresa': empresa, 'anio': anio}
+
+
+def ficticias(y, X, grupos):
+    """
+    Efectos fijos con la matriz de ficticias explícita (referencia, n × G)
+    """
+    D = np.eye(grupos.max() + 1)[grupos]
+    return np.linalg.lstsq(np.column_stack([X, D]), y, rcond=None)[0][:X.shape[1]]
+
+
+def main():
+    print("=" * 70)
+    print("DATOS PANEL: EFECTOS FIJOS Y ALEATORIOS")
+    print("=" * 70)
+
+    rng = obtener_generador('cap11/01_efectos_fijos', semilla=SEMILLA)
+
+    with etapa('datos'):
+        datos = simular_panel(rng)
+    y, X = datos['y'], datos['X']
+    n, k = X.shape
+    individuo = Agrupacion(datos['individuo'])
+
+    # ==============================================================
+    # AGRUPADO, EFECTOS FIJOS Y EFECTOS ALEATORIOS
+    # ==============================================================
+
+    with etapa('estimacion'):
+        agrupado = mco(np.column_stack([np.ones(n), X]), y).ajustar(nivel=1 - ALPHA)
+        fijos = efectos_fijos(y, X, individuo, nivel=1 - ALPHA)
+        aleatorios = efectos_aleatorios(y, X, individuo, nivel=1 - ALPHA)
+        hausman = prueba_hausman(fijos, aleatorios)
+
+    print(f"\nn = {n} ({N_INDIVIDUOS} individuos × {T} años)\n")
+    print(f"  {'':>6}{'β verdadero':>13}{'Agrupado':>11}{'EF':>11}{'EE EF':>9}{'EA':>11}")
+    for j in range(k):
+        print(f"  {'β' + str(j + 1):>6}{BETA[j]:>13.3f}{agrupado.coeficientes[j + 1]:>11.4f}"
+              f"{fijos.coeficientes[j]:>11.4f}{fijos.errores_estandar[j]:>9.4f}"
+              f"{aleatorios.coeficientes[j + 1]:>11.4f}")
+    print(f"\n  EF: R² within = {fijos.r2:.4f}, gl = {fijos.gl}")
+    print(f"  EA: σ̂²_u = {aleatorios.sigma2_u:.4f}, σ̂²_e = {aleatorios.sigma2:.4f}, "
+          f"θ = {aleatorios.theta[0]:.4f}")
+    print(f"  Hausman: H = {hausman.estadistico:.2f}, gl = {hausman.gl}, "
+          f"p = {hausman.p_valor:.4g} "
+          f"({'RECHAZAR' if hausman.p_valor < ALPHA else 'NO rechazar'} EA al {ALPHA})")
+
+    # Comprobación con la regresión de ficticias en una submuestra
+    filas = datos['individuo'] < N_FICTICIAS
+    referencia = ficticias(y[filas], X[filas], datos['individuo'][filas])
+    submuestra = efectos_fijos(y[filas], X[filas], datos['individuo'][filas])
+    print(f"\n  Ficticias ({N_FICTICIAS} individuos): "
+          f"|Δβ̂| máx = {np.abs(submuestra.coeficientes - referencia).max():.1e}")
+
+    # ==============================================================
+    # VARIOS EFECTOS FIJOS: PROYECCIONES ALTERNADAS
+    # ==============================================================
+
+    print("\n" + "=" * 70)
+    print("VARIOS EFECTOS FIJOS (PROYECCIONES ALTERNADAS)")
+    print("=" * 70 + "\n")
+    especificaciones = {
+        'individuo': [individuo],
+        'individuo + año': [individuo, Agrupacion(datos['anio'])],
+        'individuo + empresa + año': [individuo, Agrupacion(datos['empresa']),
+                                      Agrupacion(datos['anio'])],
+    }
+    print(f"  {'Efectos':<28}{'β̂1':>9}{'β̂2':>9}{'Iter.':>7}{'Tiempo':>9}"
+          f"{'Ficticias (GB)':>16}")
+    with etapa('multiples'):
+        for nombre, agrupaciones in especificaciones.items():
+            t0 = time.perf_counter()
+            r = efectos_fijos(y, X, agrupaciones, nivel=1 - ALPHA)
+            t_ef = time.perf_counter() - t0
+            columnas = sum(a.n_grupos for a in agrupaciones)
+            print(f"  {nombre:<28}{r.coeficientes[0]:>9.4f}{r.coeficientes[1]:>9.4f}"
+                  f"{r.iteraciones:>7}{t_ef:>8.2f}s{n * columnas * 8 / 1e9:>16.1f}")
+    print("\n  Solo con el efecto de empresa absorbido se recupera β1 = 1.")
+    print("  La última columna es la memoria que ocuparía la matriz de ficticias.\n")
+
+
+if __name__ == "__main__":
+    main()
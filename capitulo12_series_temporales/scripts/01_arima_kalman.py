@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+CAPÍTULO 12: ACF, PACF Y MODELOS ARIMA
+==============================================================================
+ACF por FFT y PACF por Durbin-Levinson para identificar AR y MA, la
+verosimilitud exacta de un ARMA con el filtro de Kalman y la selección
+automática de (p, d, q) en muchas series repartidas entre procesos.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Permitir importar el paquete utilidades/ desde la raíz del repositorio
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from utilidades.aleatorio import obtener_generador
+from utilidades.paralelo import numero_trabajadores
+from utilidades.perfilado import etapa
+from utilidades.series import (
+    acf,
+    buscar_orden,
+    buscar_ordenes,
+    espacio_estados,
+    loglik_exacta,
+    nucleo_kalman,
+    pacf,
+)
+
+# Parámetros
+SEMILLA = 1212
+N = 100_000                 # Longitud de las series de ACF/PACF
+REZAGOS = 6
+PHI_AR2 = [0.6, -0.3]
+THETA_MA1 = [0.7]
+
+M_ACF = 1_000               # Series para comparar FFT con el cálculo directo
+N_ACF = 1_000
+REZAGOS_ACF = 50
+
+N_VEROSIMILITUD = 500       # Longitud para comparar con la verosimilitud directa
+
+ORDENES = [((1, 0, 0), [0.6], []), ((0, 0, 1), [], [0.5]), ((2, 0, 0), [0.6, -0.3], []),
+           ((1, 0, 1), [0.6], [0.5]), ((0, 1, 1), [], [0.5]), ((1, 1, 1), [0.6], [0.5])]
+M_SERIES = 120              # Series para la búsqueda de órdenes
+N_SERIE = 500
+P_MAX = 3                   # Rejilla de la búsqueda: p ≤ P_MAX, q ≤ Q_MAX
+Q_MAX = 3
+
+
+def simular_arima(rng, phi, theta, d=0, n=N, quemado=200):
+    """
+    ARIMA(p, d, q) con innovaciones N(0, 1): φ(L)(1 - L)ᵈyₜ = θ(L)εₜ
+    """
+    from scipy.signal import lfilter
+
+    e = rng.standard_normal(n + quemado)
+    x = lfilter(np.r_[1.0, theta], np.r_[1.0, -np.asarray(phi, dtype=float)], e)[quemado:]
+    for _ in range(d):
+        x = np.cumsum(x)
+    return x
+
+
+def acf_directa(X, rezagos):
+    """
+    ACF con un producto por rezago (referencia, O(nL))
+    """
+    centrada = X - X.mean(axis=-1, keepdims=True)
+    n = X.shape[-1]
+    gamma = np.stack([np.sum(centrada[..., :n - l] * centrada[..., l:], axis=-1)
+                      for l in range(rezagos + 1)], axis=-1)
+    return gamma / gamma[..., :1]
+
+
+def loglik_directa(y, phi, theta):
+    """
+    Log-verosimilitud exacta con la matriz de covarianzas n × n (referencia)
+    """
+    from scipy.linalg import cho_factor, cho_solve, toeplitz
+
+    n = y.size
+    T, _, P0 = espacio_estados(phi, theta)
+    gamma = np.empty(n)
+    M = P0
+    for h in range(n):
+        gamma[h] = M[0, 0]
+        M = T @ M
+    factor = cho_factor(toeplitz(gamma), lower=True)
+    sigma2 = y @ cho_solve(factor, y) / n
+    logdet = 2 * np.sum(np.log(np.diag(factor[0])))
+    return -0.5 * n * (np.log(2 * np.pi * sigma2) + 1) - 0.5 * logdet
+
+
+def main():
+    print("=" * 70)
+    print("SERIES TEMPORALES: ACF, PACF Y ARIMA")
+    print("=" * 70)
+
+    rng = obtener_generador('cap12/01_arima_kalman', semilla=SEMILLA)
+
+    # ==============================================================
+    # ACF Y PACF
+    # ==============================================================
+
+    with etapa('acf_pacf'):
+        ar2 = simular_arima(rng, PHI_AR2, [])
+        ma1 = simular_arima(rng, [], THETA_MA1)
+        series = np.stack([ar2, ma1])
+        rho = acf(series, REZAGOS)
+        pac = pacf(series, REZAGOS)
+
+    print(f"\nn = {N}; AR(2) φ = {PHI_AR2}, MA(1) θ = {THETA_MA1}\n")
+    print(f"  {'Rezago':>6}{'ACF AR(2)':>12}{'PACF AR(2)':>12}{'ACF MA(1)':>12}{'PACF MA(1)':>12}")
+    for k in range(1, REZAGOS + 1):
+        print(f"  {k:>6}{rho[0, k]:>12.4f}{pac[0, k]:>12.4f}{rho[1, k]:>12.4f}{pac[1, k]:>12.4f}")
+    print(f"\n  Banda ±1.96/√n = ±{1.96 / np.sqrt(N):.4f}: la PACF del AR(2) se corta en 2 "
+          f"y la ACF del MA(1) en 1")
+
+    with etapa('acf_lote'):
+        X = rng.standard_normal((M_ACF, N_ACF))
+        t0 = time.perf_counter()
+        rapida = acf(X, REZAGOS_ACF)
+        t_fft = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        directa = acf_directa(X, REZAGOS_ACF)
+        t_directa = time.perf_counter() - t0
+    print(f"\n  ACF de {M_ACF} series (n = {N_ACF}, {REZAGOS_ACF} rezagos): "
+          f"FFT {t_fft:.4f} s, directa {t_directa:.4f} s, "
+          f"|Δ| máx = {np.abs(rapida - directa).max():.1e}")
+
+    # ==============================================================
+    # VEROSIMILITUD EXACTA CON EL FILTRO DE KALMAN
+    # ==============================================================
+
+    print("\n" + "=" * 70)
+    print(f"VEROSIMILITUD EXACTA ARMA(1,1) (n = {N_VEROSIMILITUD})")
+    print("=" * 70 + "\n")
+    phi, theta = [0.6], [0.5]
+    y = simular_arima(rng, phi, theta, n=N_VEROSIMILITUD)
+    with etapa('verosimilitud'):
+        referencia = loglik_directa(y, phi, theta)
+        completa = loglik_exacta(y, phi, theta, tolerancia=0.0)[0]
+        estacionaria = loglik_exacta(y, phi, theta)[0]
+        t0 = time.perf_counter()
+        for _ in range(100):
+            loglik_exacta(y, phi, theta, tolerancia=0.0)
+        t_completa = (time.perf_counter() - t0) / 100
+        t0 = time.perf_counter()
+        for _ in range(100):
+            loglik_exacta(y, phi, theta)
+        t_estacionaria = (time.perf_counter() - t0) / 100
+    compilado = nucleo_kalman() is not nucleo_kalman(False)
+    print(f"  Covarianza n × n:              ℓ = {referencia:.6f}")
+    print(f"  Kalman en todos los pasos:      ℓ = {completa:.6f} ({1e3 * t_completa:.3f} ms)")
+    print(f"  Kalman + estado estacionario:   ℓ = {estacionaria:.6f} "
+          f"({1e3 * t_estacionaria:.3f} ms, {t_completa / t_estacionaria:.0f}x)")
+    print(f"  Núcleo compilado con numba: {'sí' if compilado else 'no'}")
+
+    # ==============================================================
+    # SELECCIÓN AUTOMÁTICA DE ÓRDENES
+    # ==============================================================
+
+    print("\n" + "=" * 70)
+    print(f"SELECCIÓN DE (p, d, q) EN {M_SERIES} SERIES (n = {N_SERIE}, BIC)")
+    print("=" * 70 + "\n")
+    y = simular_arima(rng, [0.6], [0.5], d=1, n=4 * N_SERIE)
+    r = buscar_orden(y, p_max=P_MAX, q_max=Q_MAX)
+    print(f"  Una serie ARIMA(1,1,1), φ = 0.6, θ = 0.5: elegido {r.orden}, "
+          f"φ̂ = {np.round(r.phi, 3)}, θ̂ = {np.round(r.theta, 3)}, σ̂² = {r.sigma2:.3f}\n")
+
+    with etapa('busqueda'):
+        verdaderos = [ORDENES[i % len(ORDENES)] for i in range(M_SERIES)]
+        muestras = [simular_arima(rng, phi, theta, orden[1], N_SERIE)
+                    for orden, phi, theta in verdaderos]
+        trabajadores = numero_trabajadores()
+        t0 = time.perf_counter()
+        resultados = buscar_ordenes(muestras, trabajadores=trabajadores,
+                                    p_max=P_MAX, q_max=Q_MAX)
+        t_busqueda = time.perf_counter() - t0
+
+    print(f"  {'Orden verdadero':<18}{'Aciertos':>10}{'d correcto':>12}")
+    for orden, _, _ in ORDENES:
+        elegidos = [r.orden for r, v in zip(resultados, verdaderos) if v[0] == orden]
+        aciertos = np.mean([e == orden for e in elegidos])
+        d_correcto = np.mean([e[1] == orden[1] for e in elegidos])
+        print(f"  {str(orden):<18}{aciertos:>10.2f}{d_correcto:>12.2f}")
+    candidatos = (P_MAX + 1) * (Q_MAX + 1)
+    print(f"\n  {t_busqueda:.2f} s con {trabajadores} proceso(s): "
+          f"{1e3 * t_busqueda / M_SERIES:.1f} ms por serie ({candidatos} candidatos CSS + "
+          f"reajuste exacto)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Ejecuta los scripts Python de todos los capítulos del libro como un grafo
+de tareas en paralelo.
+
+- Descubre ``capituloNN_nombre/scripts/*.py`` a partir de CAPITULOS.
+- Cada script se ejecuta en su propio proceso (desde su carpeta scripts/),
+  con un tiempo máximo por tarea.
+- Un script puede declarar dependencias con una constante de módulo
+  ``DEPENDENCIAS = ('01_otro_script.py', ...)`` (rutas relativas a su
+  carpeta scripts/); solo se ejecuta cuando todas terminaron bien.
+- Se omiten los scripts cuya huella no cambió desde la última ejecución
+  exitosa y cuyas salidas (las figuras que anotó utilidades.visualizacion)
+  siguen existiendo. La huella cubre el código del script, el paquete
+  utilidades/, las versiones de Python, numpy, scipy y matplotlib, los
+  archivos de datos/ del capítulo (salvo datos/simulados/) y las huellas
+  de sus dependencias.
+- Los pools de procesos de cada script (utilidades.paralelo) reciben
+  os.cpu_count() // -j núcleos mediante ECONOMETRIA_TRABAJADORES.
+- La salida de cada script se guarda en resultados/registros/ y el informe
+  de tiempos en informe_ejecucion.json.
+- Con ``--perfil`` cada script registra sus etapas (utilidades.perfilado)
+  en resultados/perfiles/<script>.jsonl.
+
+Uso:
+    python ejecutar_libro.py                    # todos los capítulos
+    python ejecutar_libro.py -c 2 3 -j 4        # capítulos 2 y 3, 4 procesos
+    python ejecutar_libro.py --forzar --timeout 300
+    python ejecutar_libro.py --forzar --perfil tiempo,memoria
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib.metadata
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from crear_estructura_repositorio import CAPITULOS
+from utilidades.paralelo import VARIABLE_TRABAJADORES
+from utilidades.resultados import huella_entorno
+from utilidades.visualizacion import VARIABLE_SALIDAS
+
+RAIZ = Path(__file__).resolve().parent
+
+# Huellas de la última ejecución exitosa, una por capítulo (en resultados/)
+MANIFIESTO_EJECUCION = '.cache_ejecucion.json'
+
+TIMEOUT_POR_DEFECTO = 600
+
+
+# ====================================================================
+# DESCUBRIMIENTO DE TAREAS
+# ====================================================================
+
+def carpeta_capitulo(capitulo_info, ruta_base=RAIZ):
+    """
+    Carpeta del capítulo, con el mismo nombre que crear_estructura_capitulo
+    """
+    return Path(ruta_base) / f"capitulo{capitulo_info['num']:02d}_{capitulo_info['nombre']}"
+
+
+def leer_dependencias(script):
+    """
+    Valor de la constante DEPENDENCIAS del script (sin ejecutarlo)
+    """
+    try:
+        arbol = ast.parse(script.read_text(encoding='utf-8'))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return ()
+    for nodo in arbol.body:
+        if (isinstance(nodo, ast.Assign)
+                and any(isinstance(t, ast.Name) and t.id == 'DEPENDENCIAS'
+                        for t in nodo.targets)):
+            try:
+                return tuple(ast.literal_eval(nodo.value))
+            except ValueError:
+                return ()
+    return ()
+
+
+def descubrir_tareas(capitulos=None, ruta_base=RAIZ):
+    """
+    Scripts de los capítulos seleccionados
+
+    Retorna:
+    --------
+    tareas : dict
+        ruta del script -> {'capitulo': num, 'dependencias': [rutas]}
+    """
+    tareas = {}
+    for info in CAPITULOS:
+        if capitulos and info['num'] not in capitulos:
+            continue
+        carpeta = carpeta_capitulo(info, ruta_base) / 'scripts'
+        if not carpeta.is_dir():
+            continue
+        for script in sorted(carpeta.glob('*.py')):
+            if script.name.startswith('_'):
+                continue
+            dependencias = [(carpeta / d).resolve() for d in leer_dependencias(script)]
+            tareas[script.resolve()] = {'capitulo': info['num'],
+                                        'dependencias': dependencias}
+
+    # Dependencias fuera de la selección: se asumen ya satisfechas
+    for info in tareas.values():
+        info['dependencias'] = [d for d in info['dependencias'] if d in tareas]
+    return tareas
+
+
+def orden_topologico(tareas):
+    """
+    Scripts ordenados de modo que cada uno va después de sus dependencias
+
+    Lanza ValueError si hay un ciclo.
+    """
+    orden, estado = [], {}
+
+    def visitar(script, camino):
+        if estado.get(script) == 'hecho':
+            return
+        if estado.get(script) == 'visitando':
+            ciclo = ' -> '.join(p.name for p in camino + [script])
+            raise ValueError(f"Dependencias circulares: {ciclo}")
+        estado[script] = 'visitando'
+        for dep in tareas[script]['dependencias']:
+            visitar(dep, camino + [script])
+        estado[script] = 'hecho'
+        orden.append(script)
+
+    for script in tareas:
+        visitar(script, [])
+    return orden
+
+
+# ====================================================================
+# HUELLAS (OMITIR TAREAS SIN CAMBIOS)
+# ====================================================================
+
+def _actualizar_con_archivo(h, ruta):
+    h.update(str(ruta.relative_to(RAIZ)).encode())
+    h.update(ruta.read_bytes())
+
+
+def huella_base():
+    """
+    Versiones de las bibliotecas y código de utilidades/ (comunes a todos)
+
+    Reutiliza resultados.huella_entorno (Python, numpy, scipy y
+    utilidades/) y añade matplotlib sin importarlo.
+    """
+    try:
+        matplotlib = importlib.metadata.version('matplotlib')
+    except importlib.metadata.PackageNotFoundError:
+        matplotlib = 'ausente'
+    return hashlib.sha256(f'{huella_entorno()};matplotlib={matplotlib}'
+                          .encode()).hexdigest()
+
+
+def huella_tarea(script, dependencias, huellas, base):
+    """
+    SHA-256 del script, entorno, datos/ del capítulo y dependencias
+    """
+    h = hashlib.sha256()
+    h.update(base.encode())
+    _actualizar_con_archivo(h, script)
+
+    datos = script.parents[1] / 'datos'
+    if datos.is_dir():
+        for ruta in sorted(datos.rglob('*')):
+            relativa = ruta.relative_to(datos)
+            if ruta.is_file() and relativa.parts[0] != 'simulados' \
+                    and not ruta.name.startswith('.'):
+                _actualizar_con_archivo(h, ruta)
+
+    for dep in dependencias:
+        h.update(huellas[dep].encode())
+    return h.hexdigest()
+
+
+def _ruta_manifiesto(script):
+    return script.parents[1] / 'resultados' / MANIFIESTO_EJECUCION
+
+
+def leer_manifiesto(script):
+    try:
+        return json.loads(_ruta_manifiesto(script).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def _ruta_salidas(script):
+    return script.parents[1] / 'resultados' / 'registros' / f'{script.stem}.salidas'
+
+
+def leer_salidas(script):
+    """
+    Rutas (relativas al capítulo) que anotó el script en su última ejecución
+    """
+    try:
+        lineas = _ruta_salidas(script).read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return []
+    capitulo = script.parents[1]
+    return sorted({os.path.relpath(linea, capitulo) for linea in lineas if linea})
+
+
+def vigente(script, huella):
+    """
+    True si la última ejecución exitosa tiene la misma huella y todas sus
+    salidas siguen en disco
+    """
+    entrada = leer_manifiesto(script).get(script.name)
+    if not isinstance(entrada, dict) or entrada.get('huella') != huella:
+        return False
+    capitulo = script.parents[1]
+    return all((capitulo / salida).exists() for salida in entrada.get('salidas', []))
+
+
+def registrar_exito(script, huella):
+    ruta = _ruta_manifiesto(script)
+    manifiesto = leer_manifiesto(script)
+    manifiesto[script.name] = {'huella': huella, 'salidas': leer_salidas(script)}
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ruta.with_name(f'.{ruta.name}.tmp-{os.getpid()}')
+    temporal.write_text(json.dumps(manifiesto, indent=2, sort_keys=True),
+                        encoding='utf-8')
+    os.replace(temporal, ruta)
+
+
+# ====================================================================
+# EJECUCIÓN
+# ====================================================================
+
+def ejecutar_script(script, timeout, perfil=None, procesos=None):
+    """
+    Ejecuta un script en un proceso nuevo y guarda su salida
+
+    Con ``perfil`` (p. ej. 'tiempo,memoria') se activa utilidades.perfilado
+    y los registros por etapa se escriben en resultados/perfiles/. Con
+    ``procesos`` se fija ECONOMETRIA_TRABAJADORES: los pools del script no
+    usan más núcleos que los que le tocan.
+
+    Retorna:
+    --------
+    resultado : dict
+        'estado' ('ok', 'error' o 'timeout'), 'codigo', 'tiempo' y 'registro'
+    """
+    registro = script.parents[1] / 'resultados' / 'registros' / f'{script.stem}.log'
+    registro.parent.mkdir(parents=True, exist_ok=True)
+
+    # Cada script anota en su propio archivo las figuras que produce
+    salidas = _ruta_salidas(script)
+    salidas.unlink(missing_ok=True)
+    entorno = {**os.environ, 'MPLBACKEND': 'Agg', VARIABLE_SALIDAS: str(salidas)}
+    if procesos and VARIABLE_TRABAJADORES not in os.environ:
+        entorno[VARIABLE_TRABAJADORES] = str(procesos)
+    if perfil:
+        perfiles = script.parents[1] / 'resultados' / 'perfiles' / f'{script.stem}.jsonl'
+        perfiles.parent.mkdir(parents=True, exist_ok=True)
+        perfiles.unlink(missing_ok=True)
+        entorno['ECONOMETRIA_PERFIL'] = perfil
+        entorno['ECONOMETRIA_PERFIL_ARCHIVO'] = str(perfiles)
+    posix = hasattr(os, 'killpg')
+
+    t0 = time.perf_counter()
+    with open(registro, 'w', encoding='utf-8') as salida:
+        proceso = subprocess.Popen([sys.executable, script.name], cwd=script.parent,
+                                   stdout=salida, stderr=subprocess.STDOUT,
+                                   env=entorno, start_new_session=posix)
+        try:
+            codigo = proceso.wait(timeout=timeout)
+            estado = 'ok' if codigo == 0 else 'error'
+        except subprocess.TimeoutExpired:
+            # Terminar también los procesos hijos (pools de trabajadores)
+            if posix:
+                os.killpg(proceso.pid, signal.SIGKILL)
+            else:
+                proceso.kill()
+            codigo = proceso.wait()
+            estado = 'timeout'
+
+    return {
+        'estado': estado,
+        'codigo': codigo,
+        'tiempo': time.perf_counter() - t0,
+        'registro': str(registro.relative_to(RAIZ)),
+    }
+
+
+def ejecutar_grafo(tareas, trabajadores=None, timeout=TIMEOUT_POR_DEFECTO,
+                   forzar=False, perfil=None):
+    """
+    Ejecuta las tareas en paralelo respetando sus dependencias
+
+    Retorna:
+    --------
+    informe : dict
+        ruta relativa del script -> resultado (ver ejecutar_script); las
+        tareas omitidas tienen estado 'sin cambios' o 'dependencia fallida'
+    """
+    orden = orden_topologico(tareas)
+    base = huella_base()
+    huellas = {}
+    for script in orden:
+        huellas[script] = huella_tarea(script, tareas[script]['dependencias'],
+                                       huellas, base)
+
+    informe = {}
+    terminadas = {}   # script -> True si terminó bien (o sin cambios)
+    pendientes = list(orden)
+    en_curso = {}
+
+    def nombre(script):
+        return str(script.relative_to(RAIZ))
+
+    def anotar(script, resultado):
+        informe[nombre(script)] = resultado
+        marca = {'ok': '✓', 'sin cambios': '='}.get(resultado['estado'], '✗')
+        tiempo = f"{resultado['tiempo']:8.2f} s" if 'tiempo' in resultado else ' ' * 10
+        print(f"  {marca} {nombre(script):<60} {tiempo}  {resultado['estado']}")
+
+    trabajadores = trabajadores or os.cpu_count() or 1
+    # Núcleos para los pools internos de cada script que corre a la vez
+    procesos = max((os.cpu_count() or 1) // trabajadores, 1)
+    with ThreadPoolExecutor(max_workers=trabajadores) as pool:
+        while pendientes or en_curso:
+            for script in list(pendientes):
+                deps = tareas[script]['dependencias']
+                if any(d in terminadas and not terminadas[d] for d in deps):
+                    pendientes.remove(script)
+                    terminadas[script] = False
+                    anotar(script, {'estado': 'dependencia fallida'})
+                    continue
+                if not all(d in terminadas for d in deps):
+                    continue
+                pendientes.remove(script)
+                if not forzar and vigente(script, huellas[script]):
+                    terminadas[script] = True
+                    anotar(script, {'estado': 'sin cambios'})
+                    continue
+                en_curso[pool.submit(ejecutar_script, script, timeout, perfil,
+                                     procesos)] = script
+
+            if not en_curso:
+                continue
+            listas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in listas:
+                script = en_curso.pop(futuro)
+                resultado = futuro.result()
+                terminadas[script] = resultado['estado'] == 'ok'
+                if terminadas[script]:
+                    registrar_exito(script, huellas[script])
+                anotar(script, resultado)
+
+    return informe
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ejecuta los scripts del libro en paralelo")
+    parser.add_argument('-c', '--capitulos', type=int, nargs='+',
+                        help="números de capítulo (por defecto, todos)")
+    parser.add_argument('-j', '--trabajadores', type=int, default=None,
+                        help="scripts simultáneos (por defecto, os.cpu_count())")
+    parser.add_argument('--timeout', type=float, default=TIMEOUT_POR_DEFECTO,
+                        help="segundos máximos por script")
+    parser.add_argument('--forzar', action='store_true',
+                        help="ejecutar también los scripts sin cambios")
+    parser.add_argument('--informe', type=Path, default=RAIZ / 'informe_ejecucion.json',
+                        help="archivo JSON con el informe de tiempos")
+    parser.add_argument('--perfil', default=None,
+                        help="perfilado por etapa: tiempo, memoria y/o cprofile "
+                             "(separados por comas)")
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("EJECUCIÓN DE LOS SCRIPTS DEL LIBRO")
+    print("=" * 70)
+    print()
+
+    tareas = descubrir_tareas(args.capitulos)
+    if not tareas:
+        print("No se encontraron scripts.")
+        return 0
+
+    t0 = time.perf_counter()
+    informe = ejecutar_grafo(tareas, args.trabajadores, args.timeout, args.forzar,
+                             args.perfil)
+    total = time.perf_counter() - t0
+
+    args.informe.write_text(json.dumps({'tiempo_total': total, 'scripts': informe},
+                                       indent=2, ensure_ascii=False),
+                            encoding='utf-8')
+
+    fallidos = [s for s, r in informe.items()
+                if r['estado'] not in ('ok', 'sin cambios')]
+    print()
+    print(f"Scripts: {len(informe)}, fallidos: {len(fallidos)}, "
+          f"tiempo total: {total:.2f} s")
+    print(f"Informe de tiempos: {args.informe.name}")
+    return 1 if fallidos else 0
+
+
+# ====================================================================
+# EJECUTAR
+# ====================================================================
+
+if __name__ == "__main__":
+    sys.exit(main())
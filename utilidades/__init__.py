@@ -0,0 +1,9 @@
+"""
+==============================================================================
+UTILIDADES: FUNCIONES AUXILIARES REUTILIZABLES
+==============================================================================
+Núcleos numéricos compartidos por los scripts de los capítulos del libro.
+
+Los scripts de cada capítulo se ejecutan desde su carpeta ``scripts/`` y
+agregan la raíz del repositorio a ``sys.path`` para importar este paquete.
+"""
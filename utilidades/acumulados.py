@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+ESTADÍSTICOS ACUMULADOS EN FLUJO (STREAMING)
+==============================================================================
+Media y varianza acumuladas con memoria constante.
+
+Los datos llegan por bloques desde un generador; nunca se materializa el
+vector completo de n_max observaciones. La trayectoria de convergencia se
+registra solo en un subconjunto de tamaños muestrales espaciados
+logarítmicamente, suficiente para graficar.
+
+AcumuladorMomentos extiende la idea a los cuatro primeros momentos, de
+modo que media, varianza, asimetría y curtosis salen de una sola lectura
+de los datos y pueden combinarse entre bloques y procesos.
+"""
+
+import numpy as np
+
+from .aleatorio import llenar_normal
+
+# Tamaño por defecto de los bloques generados (2**20 valores = 8 MB)
+TAMANO_BLOQUE = 2**20
+
+
+class AcumuladorMedia:
+    """
+    Acumulador de media y varianza (Welford/Chan) con compensación de Kahan
+
+    Cada bloque se resume con su propia media y suma de cuadrados centrada
+    y se combina con el estado acumulado mediante la actualización paralela
+    de Chan et al. El incremento de la media se suma con compensación de
+    Kahan para que el error de redondeo no crezca con el número de bloques.
+
+    Atributos:
+    ----------
+    n : int
+        Observaciones procesadas
+    media : float
+        Media acumulada
+    m2 : float
+        Suma de cuadrados centrada Σ(x - x̄)²
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self._compensacion = 0.0
+
+    def actualizar(self, bloque):
+        """
+        Incorpora un bloque de observaciones
+        """
+        bloque = np.asarray(bloque, dtype=float).ravel()
+        n_b = bloque.size
+        if n_b == 0:
+            return self
+
+        media_b = bloque.mean()
+        m2_b = np.sum((bloque - media_b)**2)
+
+        n_total = self.n + n_b
+        delta = media_b - self.media
+
+        # Suma compensada (Kahan) del incremento de la media
+        incremento = delta * n_b / n_total - self._compensacion
+        nueva_media = self.media + incremento
+        self._compensacion = (nueva_media - self.media) - incremento
+        self.media = nueva_media
+
+        self.m2 += m2_b + delta**2 * self.n * n_b / n_total
+        self.n = n_total
+        return self
+
+    def varianza(self, ddof=1):
+        """
+        Varianza acumulada (ddof=1: insesgada)
+        """
+        if self.n - ddof <= 0:
+            return np.nan
+        return self.m2 / (self.n - ddof)
+
+
+def indices_log(n_max, puntos=1000):
+    """
+    Tamaños muestrales 1..n_max espaciados logarítmicamente (sin repetir)
+    """
+    indices = np.logspace(0, np.log10(n_max), puntos)
+    return np.unique(np.round(indices).astype(np.int64))
+
+
+def bloques_normal(mu, sigma, n_max, rng, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Genera n_max observaciones N(mu, sigma²) en bloques de tamaño acotado
+
+    Todos los bloques se escriben en un único buffer preasignado que se
+    reutiliza: el consumidor debe procesar cada bloque antes de pedir el
+    siguiente (como hace trayectoria_media).
+    """
+    buffer = np.empty(min(tamano_bloque, n_max))
+    restantes = n_max
+    while restantes > 0:
+        b = min(tamano_bloque, restantes)
+        yield llenar_normal(rng, buffer[:b], loc=mu, scale=sigma)
+        restantes -= b
+
+
+def trayectoria_media(bloques, indices):
+    """
+    Recorre un flujo de bloques y registra la media acumulada en ``indices``
+
+    Parámetros:
+    -----------
+    bloques : iterable de arrays
+        Observaciones en orden, por bloques
+    indices : array de int
+        Tamaños muestrales (base 1, crecientes) donde registrar la media
+
+    Retorna:
+    --------
+    n_vals : array
+        Tamaños muestrales registrados (los que alcanzó el flujo)
+    medias : array
+        Media acumulada en cada tamaño de n_vals
+    acumulador : AcumuladorMedia
+        Estado final (media y varianza de todo el flujo)
+
+    Notas:
+    ------
+    Dentro de cada bloque la media en la posición j se obtiene como
+    x̄_prev + Σ(x_i - x̄_prev) / (N + j), acumulando desviaciones respecto
+    de la media previa en lugar de sumas brutas que crecen con n.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    medias = np.empty(indices.size)
+    acumulador = AcumuladorMedia()
+    k = 0
+
+    for bloque in bloques:
+        bloque = np.asarray(bloque, dtype=float).ravel()
+        inicio = acumulador.n
+        fin = inicio + bloque.size
+
+        # Índices de la trayectoria que caen dentro de este bloque
+        k_fin = np.searchsorted(indices, fin, side='right')
+        if k_fin > k:
+            posiciones = indices[k:k_fin] - inicio - 1
+            desvios = np.cumsum(bloque - acumulador.media)
+            medias[k:k_fin] = (acumulador.media
+                               + desvios[posiciones] / indices[k:k_fin])
+            k = k_fin
+
+        acumulador.actualizar(bloque)
+
+    return indices[:k], medias[:k], acumulador
+
+
+def simular_convergencia(mu, sigma, n_max, rng, puntos=100_000):
+    """
+    Trayectoria de la media muestral de n_max observaciones N(mu, sigma²)
+
+    Los datos se generan por bloques y la media se acumula en flujo
+    (memoria constante): solo se conserva la trayectoria en tamaños
+    muestrales espaciados en log.
+
+    Retorna:
+    --------
+    n_vals, media_acumulada : array
+        Tamaños muestrales registrados y media acumulada en cada uno
+    acumulador : AcumuladorMedia
+        Estado final (media y varianza de todo el flujo)
+    """
+    return trayectoria_media(bloques_normal(mu, sigma, n_max, rng=rng),
+                             indices_log(n_max, puntos))
+
+
+class AcumuladorMomentos:
+    """
+    Media, varianza, asimetría y curtosis en un solo recorrido de los datos
+
+    Cada bloque se resume con sus momentos centrales (M2, M3, M4) en una
+    pasada sobre la memoria y se combina con el estado acumulado mediante
+    las fórmulas de actualización paralela de Pébay (2008), que generalizan
+    las de Chan et al. Dos acumuladores construidos sobre particiones
+    distintas (bloques de un memmap, trabajadores de un pool) se combinan
+    con ``combinar`` sin volver a leer los datos.
+
+    Atributos:
+    ----------
+    n : int
+        Observaciones procesadas
+    media : float
+        Media acumulada
+    m2, m3, m4 : float
+        Sumas de potencias de desviaciones Σ(x - x̄)^k
+    """
+
+    def __init__(self, n=0, media=0.0, m2=0.0, m3=0.0, m4=0.0):
+        self.n = n
+        self.media = media
+        self.m2 = m2
+        self.m3 = m3
+        self.m4 = m4
+
+    @classmethod
+    def desde_bloque(cls, bloque):
+        """
+        Momentos de un bloque en memoria
+        """
+        bloque = np.asarray(bloque, dtype=float).ravel()
+        if bloque.size == 0:
+            return cls()
+        media = bloque.mean()
+        d = bloque - media
+        d2 = d * d
+        return cls(bloque.size, media, d2.sum(), np.dot(d2, d), np.dot(d2, d2))
+
+    def combinar(self, otro):
+        """
+        Combina (en el lugar) los momentos de otra partición
+        """
+        na, nb = self.n, otro.n
+        if nb == 0:
+            return self
+        if na == 0:
+            self.n, self.media = otro.n, otro.media
+            self.m2, self.m3, self.m4 = otro.m2, otro.m3, otro.m4
+            return self
+
+        n = na + nb
+        delta = otro.media - self.media
+        d_n = delta / n
+
+        m4 = (self.m4 + otro.m4
+              + delta * d_n**3 * na * nb * (na * na - na * nb + nb * nb)
+              + 6 * d_n**2 * (na * na * otro.m2 + nb * nb * self.m2)
+              + 4 * d_n * (na * otro.m3 - nb * self.m3))
+        m3 = (self.m3 + otro.m3
+              + delta * d_n**2 * na * nb * (na - nb)
+              + 3 * d_n * (na * otro.m2 - nb * self.m2))
+        m2 = self.m2 + otro.m2 + delta * d_n * na * nb
+
+        self.n = n
+        self.media = self.media + d_n * nb
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        return self
+
+    def actualizar(self, bloque):
+        """
+        Incorpora un bloque de observaciones
+        """
+        return self.combinar(AcumuladorMomentos.desde_bloque(bloque))
+
+    def varianza(self, ddof=1):
+        """
+        Varianza (ddof=1: insesgada)
+        """
+        if self.n - ddof <= 0:
+            return np.nan
+        return self.m2 / (self.n - ddof)
+
+    def desviacion(self, ddof=1):
+        """
+        Desviación estándar (ddof=1: insesgada)
+        """
+        return np.sqrt(self.varianza(ddof))
+
+    def asimetria(self):
+        """
+        Coeficiente de asimetría g1 (como stats.skew con bias=True)
+        """
+        return np.sqrt(self.n) * self.m3 / self.m2**1.5
+
+    def curtosis(self, fisher=True):
+        """
+        Curtosis g2 (como stats.kurtosis con bias=True); exceso si fisher
+        """
+        k = self.n * self.m4 / self.m2**2
+        return k - 3 if fisher else k
+
+
+def momentos(datos, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Los cuatro momentos de un array (p. ej. un np.memmap) en una sola
+    lectura, por bloques de tamaño acotado
+
+    Retorna:
+    --------
+    acumulador : AcumuladorMomentos
+    """
+    datos = np.asarray(datos).reshape(-1)
+    acumulador = AcumuladorMomentos()
+    for inicio in range(0, datos.size, tamano_bloque):
+        acumulador.actualizar(datos[inicio:inicio + tamano_bloque])
+    return acumulador
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+ALEATORIO: GENERADORES DE NÚMEROS ALEATORIOS COMPARTIDOS
+==============================================================================
+Capa común sobre ``np.random.Generator`` para todos los scripts del libro.
+
+- Flujos identificados por (clave, semilla): cada script pide su propio
+  generador en lugar de sembrar el estado global ``np.random``.
+- Llenado en arrays preasignados (``out=``) para evitar copias.
+- Derivación de generadores hijos segura entre hilos: cada hilo o proceso
+  debe usar su propio hijo, nunca compartir un mismo Generator.
+"""
+
+import threading
+import zlib
+
+import numpy as np
+
+# Generadores de bits disponibles
+ALGORITMOS = {
+    'PCG64': np.random.PCG64,
+    'PCG64DXSM': np.random.PCG64DXSM,
+    'SFC64': np.random.SFC64,
+    'Philox': np.random.Philox,
+}
+
+ALGORITMO_POR_DEFECTO = 'PCG64'
+
+_registro = {}
+_candado = threading.Lock()
+
+
+def secuencia_semilla(clave, semilla):
+    """
+    SeedSequence determinista para el flujo (clave, semilla)
+
+    La clave (p. ej. 'cap02/03_teorema_central_limite') se convierte en un
+    entero estable con CRC32, de modo que dos scripts con la misma semilla
+    no comparten flujo.
+    """
+    clave_int = zlib.crc32(str(clave).encode('utf-8'))
+    return np.random.SeedSequence([int(semilla), clave_int])
+
+
+def generador_desde_semilla(semilla, algoritmo=ALGORITMO_POR_DEFECTO):
+    """
+    Nuevo Generator a partir de un entero o un np.random.SeedSequence
+    """
+    try:
+        bit_generator = ALGORITMOS[algoritmo]
+    except KeyError:
+        raise ValueError(f"Algoritmo desconocido: {algoritmo!r}. "
+                         f"Opciones: {sorted(ALGORITMOS)}") from None
+    return np.random.Generator(bit_generator(semilla))
+
+
+def obtener_generador(clave, semilla, algoritmo=ALGORITMO_POR_DEFECTO):
+    """
+    Generador del flujo (clave, semilla), creado una sola vez por proceso
+
+    Parámetros:
+    -----------
+    clave : str
+        Identificador del flujo, normalmente 'capNN/nombre_script'
+    semilla : int
+        Semilla del script
+    algoritmo : str
+        Generador de bits ('PCG64', 'PCG64DXSM', 'SFC64', 'Philox')
+
+    Retorna:
+    --------
+    rng : np.random.Generator
+        El mismo objeto en llamadas repetidas con los mismos argumentos
+    """
+    llave = (str(clave), int(semilla), algoritmo)
+    with _candado:
+        rng = _registro.get(llave)
+        if rng is None:
+            rng = generador_desde_semilla(secuencia_semilla(clave, semilla),
+                                          algoritmo)
+            _registro[llave] = rng
+    return rng
+
+
+def generar_hijos(rng, k):
+    """
+    k generadores hijos independientes de ``rng`` (seguro entre hilos)
+
+    Cada hijo proviene de ``SeedSequence.spawn``; la llamada se protege con
+    un candado porque spawn modifica el contador de hijos del padre.
+    """
+    # BitGenerator.seed_seq es público desde numpy 1.25; antes, _seed_seq
+    bit_generator = rng.bit_generator
+    semillas = getattr(bit_generator, 'seed_seq', None) or bit_generator._seed_seq
+    algoritmo = type(bit_generator).__name__
+    with _candado:
+        hijos = semillas.spawn(k)
+    return [generador_desde_semilla(s, algoritmo) for s in hijos]
+
+
+def llenar_normal(rng, out, loc=0.0, scale=1.0):
+    """
+    Llena ``out`` (float64, contiguo) con N(loc, scale²) sin copias extra
+    """
+    rng.standard_normal(out=out)
+    if scale != 1.0:
+        out *= scale
+    if loc != 0.0:
+        out += loc
+    return out
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+BENCHMARK: MEDICIÓN DE NÚCLEOS NUMÉRICOS Y DETECCIÓN DE REGRESIONES
+==============================================================================
+Arnés mínimo al estilo de asv para medir los núcleos de ``utilidades/``.
+
+Un caso (``CasoBenchmark``) tiene un nombre, una escalera de tamaños y dos
+funciones: ``preparar(tamano)`` construye las entradas (no se cronometra) y
+``ejecutar(*entradas)`` es el código medido. Para cada tamaño se repite la
+llamada hasta acumular ``tiempo_minimo`` segundos (y al menos
+``repeticiones`` muestras) y se guardan el mínimo, la mediana y el rango
+intercuartílico por llamada.
+
+Los resultados se guardan en JSON junto con las versiones de las
+bibliotecas y la máquina, y se comparan contra una línea base: un caso es
+una regresión si su mínimo supera al de la base en más de ``umbral``.
+"""
+
+import json
+import os
+import platform
+import time
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+CasoBenchmark = namedtuple('CasoBenchmark',
+                           ['nombre', 'tamanos', 'preparar', 'ejecutar'])
+
+# Tolerancia relativa por defecto para marcar regresiones (20 %)
+UMBRAL_REGRESION = 0.20
+
+
+def medir(funcion, args=(), repeticiones=5, tiempo_minimo=0.2):
+    """
+    Tiempos por llamada de ``funcion(*args)``
+
+    Retorna:
+    --------
+    estadisticos : dict
+        'min', 'mediana', 'iqr' (segundos por llamada) y 'muestras'
+    """
+    # Calentamiento (cachés, importaciones perezosas, tablas)
+    funcion(*args)
+
+    tiempos = []
+    inicio = time.perf_counter()
+    while len(tiempos) < repeticiones or time.perf_counter() - inicio < tiempo_minimo:
+        t0 = time.perf_counter()
+        funcion(*args)
+        tiempos.append(time.perf_counter() - t0)
+
+    tiempos = np.array(tiempos)
+    q1, mediana, q3 = np.percentile(tiempos, [25, 50, 75])
+    return {
+        'min': float(tiempos.min()),
+        'mediana': float(mediana),
+        'iqr': float(q3 - q1),
+        'muestras': int(tiempos.size),
+    }
+
+
+def info_entorno():
+    """
+    Máquina y versiones de las bibliotecas (para interpretar los tiempos)
+    """
+    import scipy
+
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'maquina': platform.machine(),
+        'procesador': platform.processor(),
+        'nucleos': os.cpu_count(),
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def ejecutar_casos(casos, repeticiones=5, tiempo_minimo=0.2, filtro=None,
+                   rapido=False, verbose=True):
+    """
+    Mide cada caso en su escalera de tamaños
+
+    Parámetros:
+    -----------
+    casos : list of CasoBenchmark
+        Casos a medir
+    repeticiones : int
+        Muestras mínimas por tamaño
+    tiempo_minimo : float
+        Segundos mínimos de medición por tamaño
+    filtro : str, opcional
+        Solo los casos cuyo nombre contenga esta cadena
+    rapido : bool
+        Solo el primer tamaño de cada escalera
+    verbose : bool
+        Imprimir cada medición
+
+    Retorna:
+    --------
+    resultados : dict
+        {'entorno': ..., 'casos': {nombre: {str(tamano): estadisticos}}}
+    """
+    resultados = {'entorno': info_entorno(), 'casos': {}}
+
+    for caso in casos:
+        if filtro and filtro not in caso.nombre:
+            continue
+        tamanos = caso.tamanos[:1] if rapido else caso.tamanos
+        filas = {}
+        for tamano in tamanos:
+            entradas = caso.preparar(tamano)
+            estadisticos = medir(caso.ejecutar, entradas, repeticiones,
+                                 tiempo_minimo)
+            filas[str(tamano)] = estadisticos
+            if verbose:
+                print(f"  {caso.nombre:<28} {str(tamano):>14}  "
+                      f"min = {estadisticos['min'] * 1e3:10.3f} ms  "
+                      f"mediana = {estadisticos['mediana'] * 1e3:10.3f} ms")
+        resultados['casos'][caso.nombre] = filas
+
+    return resultados
+
+
+def guardar_resultados(resultados, ruta):
+    """
+    Guarda los resultados en JSON
+    """
+    ruta = Path(ruta)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_text(json.dumps(resultados, indent=2, sort_keys=True),
+                    encoding='utf-8')
+    return ruta
+
+
+def cargar_resultados(ruta):
+    """
+    Resultados guardados con guardar_resultados
+    """
+    return json.loads(Path(ruta).read_text(encoding='utf-8'))
+
+
+def comparar_con_base(actual, base, umbral=UMBRAL_REGRESION):
+    """
+    Compara dos ejecuciones caso a caso y tamaño a tamaño
+
+    Retorna:
+    --------
+    filas : list of dict
+        'caso', 'tamano', 'base', 'actual' (mínimos en segundos), 'razon'
+        (actual / base) y 'estado': 'regresion', 'mejora' o 'igual'
+    """
+    filas = []
+    for caso, tamanos in actual['casos'].items():
+        for tamano, est in tamanos.items():
+            previo = base.get('casos', {}).get(caso, {}).get(tamano)
+            if previo is None:
+                continue
+            razon = est['min'] / previo['min'] if previo['min'] > 0 else np.inf
+            if razon > 1 + umbral:
+                estado = 'regresion'
+            elif razon < 1 / (1 + umbral):
+                estado = 'mejora'
+            else:
+                estado = 'igual'
+            filas.append({'caso': caso, 'tamano': tamano, 'base': previo['min'],
+                          'actual': est['min'], 'razon': razon, 'estado': estado})
+    return filas
+
+
+def imprimir_comparacion(filas):
+    """
+    Tabla de la comparación contra la línea base
+    """
+    marcas = {'regresion': '✗ REGRESIÓN', 'mejora': '✓ mejora', 'igual': ''}
+    print(f"  {'Caso':<28} {'Tamaño':>14} {'Base (ms)':>11} {'Actual (ms)':>12} {'Razón':>7}")
+    for f in filas:
+        print(f"  {f['caso']:<28} {f['tamano']:>14} {f['base'] * 1e3:>11.3f} "
+              f"{f['actual'] * 1e3:>12.3f} {f['razon']:>6.2f}x  {marcas[f['estado']]}")
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+COVARIANZA: ERRORES ESTÁNDAR ROBUSTOS (HC0-HC3) Y HAC (NEWEY-WEST)
+==============================================================================
+Estimadores sándwich de la covarianza de β̂ sin matrices n × n.
+
+Todo se expresa con el factor R de la QR de X (ver utilidades.regresion):
+con qᵢ = R⁻ᵀxᵢ (la fila i de Q), el apalancamiento es hᵢ = ‖qᵢ‖² y
+
+    V = R⁻¹ [Σ wᵢ qᵢqᵢ'] R⁻ᵀ
+
+donde los pesos wᵢ dependen de eᵢ² y hᵢ (HC0-HC3). Las filas se procesan
+por bloques: la memoria es O(bloque · k).
+
+Para HAC se usa uᵢ = qᵢeᵢ y la suma ponderada de autocovarianzas
+
+    Σₗ wₗ Γₗ = Σₜ uₜ vₜ',   vₜ = Σₗ₌₁ᴸ wₗ uₜ₋ₗ
+
+es decir, una convolución causal de cada columna de u con el núcleo. Con
+Bartlett se obtiene con dos sumas acumuladas en O(nk); con otros núcleos
+con FFT en O(nk log n). En ambos casos el costo no depende del número de
+rezagos L, y la memoria es O(nk).
+"""
+
+import numpy as np
+
+from .regresion import (
+    TAMANO_BLOQUE,
+    _solve_triangular,
+    inferencia_t,
+    mco,
+    prueba_wald,
+)
+
+TIPOS_HC = ('HC0', 'HC1', 'HC2', 'HC3')
+NUCLEOS = ('bartlett', 'parzen', 'cuadratico')
+
+
+def _filas_q(X, R, inicio, fin):
+    """
+    Filas inicio:fin de Q = X R⁻¹, como array (fin - inicio, k)
+    """
+    return _solve_triangular(R, np.asarray(X[inicio:fin], dtype=float).T,
+                             trans=1).T
+
+
+def apalancamiento(X, R, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Diagonal de la matriz sombrero hᵢ = xᵢ'(X'X)⁻¹xᵢ = ‖qᵢ‖²
+
+    Retorna:
+    --------
+    h : array (n,)
+    """
+    n = X.shape[0]
+    h = np.empty(n)
+    for inicio in range(0, n, tamano_bloque):
+        fin = min(inicio + tamano_bloque, n)
+        q = _filas_q(X, R, inicio, fin)
+        h[inicio:fin] = np.einsum('ij,ij->i', q, q)
+    return h
+
+
+def residuos(X, y, beta, tamano_bloque=TAMANO_BLOQUE):
+    """
+    e = y - Xβ por bloques
+    """
+    n = X.shape[0]
+    e = np.empty(n)
+    for inicio in range(0, n, tamano_bloque):
+        fin = min(inicio + tamano_bloque, n)
+        e[inicio:fin] = y[inicio:fin] - np.asarray(X[inicio:fin], dtype=float) @ beta
+    return e
+
+
+def covarianza_hc(X, e, R, tipo='HC1', tamano_bloque=TAMANO_BLOQUE):
+    """
+    Covarianza robusta a heterocedasticidad (White / MacKinnon-White)
+
+    Parámetros:
+    -----------
+    X : array (n, k)
+        Regresores (puede ser un np.memmap)
+    e : array (n,)
+        Residuos MCO
+    R : array (k, k)
+        Factor triangular de la QR de X (AcumuladorMCO.R)
+    tipo : str
+        'HC0' (eᵢ²), 'HC1' (eᵢ²·n/(n-k)), 'HC2' (eᵢ²/(1-hᵢ)) o
+        'HC3' (eᵢ²/(1-hᵢ)²)
+
+    Retorna:
+    --------
+    V : array (k, k)
+    """
+    if tipo not in TIPOS_HC:
+        raise ValueError(f"Tipo no soportado: {tipo!r}. Opciones: {TIPOS_HC}")
+    n, k = X.shape
+    carne = np.zeros((k, k))
+    for inicio in range(0, n, tamano_bloque):
+        fin = min(inicio + tamano_bloque, n)
+        q = _filas_q(X, R, inicio, fin)
+        w = np.asarray(e[inicio:fin], dtype=float)**2
+        if tipo in ('HC2', 'HC3'):
+            h = np.einsum('ij,ij->i', q, q)
+            w = w / (1 - h) if tipo == 'HC2' else w / (1 - h)**2
+        carne += (q * w[:, None]).T @ q
+    if tipo == 'HC1':
+        carne *= n / (n - k)
+    return _sandwich(R, carne)
+
+
+def _sandwich(R, carne):
+    """
+    R⁻¹ · carne · R⁻ᵀ
+    """
+    A = _solve_triangular(R, carne)
+    return _solve_triangular(R, A.T).T
+
+
+def rezagos_newey_west(n):
+    """
+    Regla de Newey y West (1994) para el número de rezagos:
+    ⌊4 (n/100)^(2/9)⌋
+    """
+    return int(np.floor(4 * (n / 100)**(2 / 9)))
+
+
+def pesos_nucleo(rezagos, nucleo='bartlett'):
+    """
+    Pesos w₁..w_L del núcleo para los rezagos 1..L
+
+    Retorna:
+    --------
+    w : array (rezagos,)
+    """
+    if nucleo not in NUCLEOS:
+        raise ValueError(f"Núcleo no soportado: {nucleo!r}. Opciones: {NUCLEOS}")
+    x = np.arange(1, rezagos + 1) / (rezagos + 1)
+    if nucleo == 'bartlett':
+        return 1 - x
+    if nucleo == 'parzen':
+        return np.where(x <= 0.5, 1 - 6 * x**2 + 6 * x**3, 2 * (1 - x)**3)
+    # Espectral cuadrático (Andrews, 1991) truncado en L
+    z = 6 * np.pi * x / 5
+    return 3 / z**2 * (np.sin(z) / z - np.cos(z))
+
+
+def _convolucion_bartlett(u, rezagos):
+    """
+    vₜ = Σₗ₌₁ᴸ (1 - l/(L+1)) uₜ₋ₗ con sumas acumuladas, O(nk)
+
+    Con Cₜ = Σₛ≤ₜ uₛ y Dₜ = Σₛ≤ₜ Cₛ:
+    Σₗ uₜ₋ₗ = Cₜ₋₁ - Cₜ₋ₗ₋₁ y Σₗ l·uₜ₋ₗ = Dₜ₋₁ - Dₜ₋ₗ₋₁ - L·Cₜ₋ₗ₋₁
+    """
+    n, k = u.shape
+    L = rezagos
+    # Prefijos con ceros al inicio: C[t + 1] = Σₛ≤ₜ uₛ
+    C = np.zeros((n + 1, k))
+    np.cumsum(u, axis=0, out=C[1:])
+    D = np.zeros((n + 1, k))
+    np.cumsum(C[1:], axis=0, out=D[1:])
+
+    t = np.arange(n)
+    atras = np.maximum(t - L, 0)          # índice de Cₜ₋ₗ₋₁ en C (0 si no existe)
+    suma = C[t] - C[atras]
+    suma_l = D[t] - D[atras] - L * C[atras]
+    # Para t ≤ L, Dₜ₋ₗ₋₁ y Cₜ₋ₗ₋₁ son cero: los prefijos ya lo reflejan
+    return suma - suma_l / (L + 1)
+
+
+def _convolucion_fft(u, pesos):
+    """
+    vₜ = Σₗ₌₁ᴸ wₗ uₜ₋ₗ con FFT, O(nk log n)
+    """
+    n = u.shape[0]
+    L = pesos.size
+    tamano = 1 << int(np.ceil(np.log2(n + L)))
+    nucleo = np.zeros(L + 1)
+    nucleo[1:] = pesos
+    F = np.fft.rfft(u, n=tamano, axis=0) * np.fft.rfft(nucleo, n=tamano)[:, None]
+    return np.fft.irfft(F, n=tamano, axis=0)[:n]
+
+
+def covarianza_hac(X, e, R, rezagos=None, nucleo='bartlett', correccion=True,
+                   tamano_bloque=TAMANO_BLOQUE):
+    """
+    Covarianza HAC (Newey-West y núcleos de Andrews)
+
+    Parámetros:
+    -----------
+    X : array (n, k)
+        Regresores ordenados en el tiempo
+    e : array (n,)
+        Residuos MCO
+    R : array (k, k)
+        Factor triangular de la QR de X
+    rezagos : int, opcional
+        Ancho de banda L (por defecto rezagos_newey_west(n))
+    nucleo : str
+        'bartlett' (Newey-West), 'parzen' o 'cuadratico'
+    correccion : bool
+        Multiplicar por n/(n - k)
+
+    Retorna:
+    --------
+    V : array (k, k)
+    """
+    n, k = X.shape
+    if rezagos is None:
+        rezagos = rezagos_newey_west(n)
+    rezagos = int(min(rezagos, n - 1))
+
+    # u = Q·e (n × k): las puntuaciones en la base ortonormal de X
+    u = np.empty((n, k))
+    for inicio in range(0, n, tamano_bloque):
+        fin = min(inicio + tamano_bloque, n)
+        u[inicio:fin] = _filas_q(X, R, inicio, fin) * np.asarray(e[inicio:fin])[:, None]
+
+    carne = u.T @ u
+    if rezagos > 0:
+        if nucleo == 'bartlett':
+            v = _convolucion_bartlett(u, rezagos)
+        else:
+            v = _convolucion_fft(u, pesos_nucleo(rezagos, nucleo))
+        cruzado = u.T @ v
+        carne += cruzado + cruzado.T
+    if correccion:
+        carne *= n / (n - k)
+    return _sandwich(R, carne)
+
+
+def mco_robusto(X, y, covarianza='HC1', rezagos=None, nucleo='bartlett',
+                constante=0, nivel=0.95, tamano_bloque=TAMANO_BLOQUE):
+    """
+    MCO con errores estándar robustos (HC0-HC3 o HAC)
+
+    Parámetros:
+    -----------
+    X : array (n, k)
+        Regresores (puede ser un np.memmap)
+    y : array (n,)
+        Variable dependiente
+    covarianza : str
+        'HC0', 'HC1', 'HC2', 'HC3' o 'HAC'
+    rezagos, nucleo : ver covarianza_hac
+    constante : int o None
+        Columna de la constante, excluida del F global (Wald robusto);
+        None prueba todos los coeficientes
+    nivel : float
+        Nivel de confianza de los intervalos
+
+    Retorna:
+    --------
+    resultado : ResultadoMCO
+        Mismos campos que AcumuladorMCO.ajustar, con errores estándar, t,
+        p-valores, intervalos y F global calculados con la covarianza
+        robusta
+    """
+    acumulador = mco(X, y, tamano_bloque)
+    clasico = acumulador.ajustar(nivel)
+    beta = clasico.coeficientes
+    e = residuos(X, y, beta, tamano_bloque)
+
+    if covarianza == 'HAC':
+        V = covarianza_hac(X, e, acumulador.R, rezagos, nucleo,
+                           tamano_bloque=tamano_bloque)
+    else:
+        V = covarianza_hc(X, e, acumulador.R, covarianza, tamano_bloque)
+
+    gl = clasico.gl
+    se = np.sqrt(np.diag(V))
+    t, p, ic = inferencia_t(beta, se, gl, nivel)
+
+    k = beta.size
+    columnas = [j for j in range(k) if j != constante]
+    if columnas:
+        f, p_f = prueba_wald(beta, V, np.eye(k)[columnas], gl=gl)
+    else:
+        f, p_f = np.nan, np.nan
+
+    return clasico._replace(errores_estandar=se, t=t, p_valores=p, ic=ic,
+                            f=f, p_valor_f=p_f)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+DATOS: ALMACÉN COLUMNAR MAPEADO EN MEMORIA
+==============================================================================
+Conjuntos de datos guardados en las carpetas ``datos/`` de cada capítulo.
+
+Cada conjunto es una carpeta con un archivo ``.npy`` por columna y un
+``manifiesto.json`` con el tipo, la forma y el SHA-256 de cada columna,
+además de los metadatos con que se generó (parámetros, semilla). Las
+columnas se abren con ``np.load(mmap_mode='r')``: no se copian a memoria y
+el sistema operativo pagina solo lo que se lee.
+
+Las simulaciones se guardan por convención en ``datos/simulados/`` (ignorada
+por git). ``obtener_o_generar`` reutiliza un conjunto existente cuando sus
+metadatos coinciden y, si no, lo genera y lo guarda.
+
+Opcionalmente (si pyarrow está instalado) un conjunto puede exportarse a un
+archivo Arrow IPC o Parquet para otras herramientas.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+
+MANIFIESTO = 'manifiesto.json'
+VERSION_FORMATO = 1
+
+# Subcarpeta de datos/ para conjuntos simulados (regenerables)
+SUBCARPETA_SIMULADOS = 'simulados'
+
+# Bytes leídos por vez al calcular sumas de verificación
+BLOQUE_LECTURA = 2**24
+
+
+class ErrorIntegridad(Exception):
+    """
+    La suma de verificación de una columna no coincide con el manifiesto
+    """
+
+
+def sha256_archivo(ruta):
+    """
+    SHA-256 de un archivo, leído por bloques
+    """
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(BLOQUE_LECTURA), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _normalizar(metadatos):
+    """
+    Metadatos en forma JSON canónica (para comparar)
+    """
+    return json.loads(json.dumps(metadatos or {}, sort_keys=True, default=repr))
+
+
+class EscritorConjunto:
+    """
+    Escribe un conjunto columna a columna sin tenerlo entero en memoria
+
+    Uso:
+    ----
+    >>> with EscritorConjunto(carpeta, 'tcl_exponencial', metadatos) as esc:
+    ...     z = esc.columna('z', shape=(m,), dtype='float64')
+    ...     for inicio in range(0, m, bloque):
+    ...         z[inicio:inicio + bloque] = ...
+
+    Las columnas se escriben en una carpeta temporal; al salir sin errores
+    se calculan las sumas de verificación, se escribe el manifiesto y la
+    carpeta se mueve a su lugar definitivo, de modo que un lector nunca ve
+    un conjunto a medio escribir.
+    """
+
+    def __init__(self, carpeta, nombre, metadatos=None):
+        self.destino = Path(carpeta) / nombre
+        self.temporal = Path(carpeta) / f'.{nombre}.tmp-{os.getpid()}'
+        self.metadatos = metadatos or {}
+        self._columnas = {}
+
+    def __enter__(self):
+        if self.temporal.exists():
+            shutil.rmtree(self.temporal)
+        self.temporal.mkdir(parents=True)
+        return self
+
+    def columna(self, nombre, shape, dtype='float64'):
+        """
+        Nueva columna como memmap escribible (.npy)
+        """
+        ruta = self.temporal / f'{nombre}.npy'
+        shape = tuple(int(k) for k in np.atleast_1d(shape))
+        arr = np.lib.format.open_memmap(ruta, mode='w+', dtype=dtype,
+                                        shape=shape)
+        self._columnas[nombre] = arr
+        return arr
+
+    def guardar(self, nombre, valores):
+        """
+        Columna a partir de un array en memoria
+        """
+        valores = np.asarray(valores)
+        self.columna(nombre, valores.shape, valores.dtype)[...] = valores
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is not None:
+            self._columnas.clear()
+            shutil.rmtree(self.temporal, ignore_errors=True)
+            return False
+
+        columnas = {}
+        for nombre, arr in self._columnas.items():
+            arr.flush()
+            columnas[nombre] = {
+                'archivo': f'{nombre}.npy',
+                'dtype': arr.dtype.str,
+                'shape': list(arr.shape),
+                'sha256': sha256_archivo(self.temporal / f'{nombre}.npy'),
+            }
+        self._columnas.clear()
+
+        manifiesto = {
+            'version': VERSION_FORMATO,
+            'creado': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'metadatos': _normalizar(self.metadatos),
+            'columnas': columnas,
+        }
+        (self.temporal / MANIFIESTO).write_text(
+            json.dumps(manifiesto, indent=2, sort_keys=True), encoding='utf-8')
+
+        if self.destino.exists():
+            shutil.rmtree(self.destino)
+        os.replace(self.temporal, self.destino)
+        return False
+
+
+def guardar_conjunto(carpeta, nombre, columnas, metadatos=None):
+    """
+    Guarda un dict {columna: array} como conjunto mapeable
+
+    Retorna:
+    --------
+    ruta : Path
+        Carpeta del conjunto
+    """
+    with EscritorConjunto(carpeta, nombre, metadatos) as esc:
+        for col, valores in columnas.items():
+            esc.guardar(col, valores)
+    return esc.destino
+
+
+def leer_manifiesto(carpeta, nombre):
+    """
+    Manifiesto del conjunto, o None si no existe
+    """
+    ruta = Path(carpeta) / nombre / MANIFIESTO
+    try:
+        return json.loads(ruta.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def verificar_conjunto(carpeta, nombre):
+    """
+    Comprueba las sumas de verificación de todas las columnas
+
+    Lanza ErrorIntegridad si alguna no coincide.
+    """
+    manifiesto = leer_manifiesto(carpeta, nombre)
+    if manifiesto is None:
+        raise FileNotFoundError(f"No existe el conjunto {nombre!r} en {carpeta}")
+    for col, info in manifiesto['columnas'].items():
+        ruta = Path(carpeta) / nombre / info['archivo']
+        if sha256_archivo(ruta) != info['sha256']:
+            raise ErrorIntegridad(f"Columna {col!r} de {nombre!r} corrupta: "
+                                  f"la suma SHA-256 no coincide")
+
+
+def abrir_conjunto(carpeta, nombre, verificar=False):
+    """
+    Abre las columnas de un conjunto sin copiarlas (memmap de solo lectura)
+
+    Parámetros:
+    -----------
+    carpeta : str o Path
+        Carpeta que contiene el conjunto (p. ej. 'capitulo02_.../datos')
+    nombre : str
+        Nombre del conjunto
+    verificar : bool
+        Comprobar antes las sumas SHA-256 (lee todos los archivos)
+
+    Retorna:
+    --------
+    columnas : dict
+        nombre -> np.memmap de solo lectura
+    """
+    manifiesto = leer_manifiesto(carpeta, nombre)
+    if manifiesto is None:
+        raise FileNotFoundError(f"No existe el conjunto {nombre!r} en {carpeta}")
+    if verificar:
+        verificar_conjunto(carpeta, nombre)
+    return {col: np.load(Path(carpeta) / nombre / info['archivo'], mmap_mode='r')
+            for col, info in manifiesto['columnas'].items()}
+
+
+def obtener_o_generar(carpeta, nombre, generar, metadatos=None):
+    """
+    Abre el conjunto si existe con los mismos metadatos; si no, lo genera
+
+    Parámetros:
+    -----------
+    carpeta : str o Path
+        Carpeta de datos (normalmente datos/simulados)
+    nombre : str
+        Nombre del conjunto
+    generar : función
+        generar() -> dict {columna: array}, o generar(escritor) que llena
+        columnas de un EscritorConjunto por bloques y devuelve None
+    metadatos : dict
+        Parámetros y semilla de la simulación; cualquier cambio obliga a
+        regenerar
+
+    Retorna:
+    --------
+    columnas : dict
+        nombre -> np.memmap de solo lectura
+    """
+    manifiesto = leer_manifiesto(carpeta, nombre)
+    if manifiesto is not None and manifiesto['metadatos'] == _normalizar(metadatos):
+        return abrir_conjunto(carpeta, nombre)
+
+    with EscritorConjunto(carpeta, nombre, metadatos) as esc:
+        if inspect.signature(generar).parameters:
+            columnas = generar(esc)
+        else:
+            columnas = generar()
+        for col, valores in (columnas or {}).items():
+            esc.guardar(col, valores)
+    return abrir_conjunto(carpeta, nombre)
+
+
+def exportar_arrow(carpeta, nombre, ruta, formato='arrow'):
+    """
+    Exporta un conjunto 1-D a Arrow IPC ('arrow') o Parquet ('parquet')
+
+    Requiere pyarrow (dependencia opcional). Un archivo Arrow IPC se puede
+    abrir sin copias con pyarrow.memory_map.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("exportar_arrow requiere pyarrow: "
+                          "pip install pyarrow") from e
+
+    columnas = abrir_conjunto(carpeta, nombre)
+    tabla = pa.table({col: pa.array(np.asarray(arr)) for col, arr in columnas.items()})
+
+    if formato == 'arrow':
+        with pa.OSFile(str(ruta), 'wb') as f:
+            with pa.ipc.new_file(f, tabla.schema) as escritor:
+                escritor.write_table(tabla)
+    elif formato == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(tabla, str(ruta))
+    else:
+        raise ValueError(f"Formato no soportado: {formato!r}")
+    return Path(ruta)
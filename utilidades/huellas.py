@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+HUELLAS: SHA-256 DE CÓDIGO Y DATOS PARA LAS CACHÉS
+==============================================================================
+Piezas comunes de las cachés de figuras (visualizacion.py) y de resultados
+(resultados.py):
+
+- ``actualizar_huella`` agrega arrays, escalares y contenedores a un hash,
+  con los arrays por contenido y los dicts en orden de clave.
+- ``codigo_modulo`` devuelve el código del módulo que define una función,
+  de modo que un cambio en sus auxiliares también invalida la caché.
+- ``huella_paquete`` resume el código de utilidades/.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+
+def actualizar_huella(h, valor):
+    """
+    Agrega un valor (arrays, escalares, contenedores) a la huella ``h``
+    """
+    if isinstance(valor, np.ndarray):
+        valor = np.ascontiguousarray(valor)
+        h.update(f'nd:{valor.dtype.str}:{valor.shape}'.encode())
+        h.update(valor.tobytes())
+    elif isinstance(valor, dict):
+        h.update(b'dict')
+        for clave in sorted(valor, key=str):
+            h.update(str(clave).encode())
+            actualizar_huella(h, valor[clave])
+    elif isinstance(valor, (list, tuple)):
+        h.update(f'seq:{len(valor)}'.encode())
+        for v in valor:
+            actualizar_huella(h, v)
+    else:
+        h.update(json.dumps(valor, default=repr, sort_keys=True).encode())
+
+
+@functools.lru_cache(maxsize=1)
+def huella_paquete():
+    """
+    Huella del código fuente de utilidades/
+    """
+    h = hashlib.sha256()
+    for ruta in sorted(Path(__file__).resolve().parent.glob('*.py')):
+        h.update(ruta.name.encode())
+        h.update(ruta.read_bytes())
+    return h.hexdigest()
+
+
+def codigo_modulo(funcion):
+    """
+    Código del módulo que define ``funcion``
+
+    Se usa el módulo completo y no solo la función para que un cambio en
+    sus auxiliares (p. ej. un dibujar_* compartido) invalide la caché. Si
+    el módulo no tiene fuente se recurre a la de la función y, en último
+    caso, a su nombre.
+    """
+    try:
+        return inspect.getsource(sys.modules[funcion.__module__])
+    except (KeyError, OSError, TypeError):
+        pass
+    try:
+        return inspect.getsource(funcion)
+    except (OSError, TypeError):
+        return f'{funcion.__module__}.{funcion.__qualname__}'
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+VARIABLES INSTRUMENTALES: MC2E POR LOTES CON PRIMERA ETAPA EN CACHÉ
+==============================================================================
+Mínimos cuadrados en dos etapas para muchas variables dependientes que
+comparten regresores e instrumentos.
+
+Con Z = [W, Z₁] (exógenas incluidas y excluidas) = Q_Z R_Z y X = [W, E]
+(exógenas y endógenas), la proyección de X sobre Z en la base Q_Z es
+
+    A = Q_Z'X = [R_Z[:, :k_W], Q_Z'E]
+
+y MC2E se reduce a un problema de mínimos cuadrados de l × k:
+β̂ = argmin ‖Q_Z'y - Aβ‖. R_Z y Q_Z'E salen de una sola pasada de
+AcumuladorMCO (la primera etapa), y la QR de A se calcula una vez. Cada
+lote de variables dependientes cuesta Z'Y (O(nlm)), dos sistemas
+triangulares y la suma de cuadrados de los residuos.
+
+Los diagnósticos de instrumentos débiles (F parcial de la primera etapa y
+Cragg-Donald) usan los mismos factores: las primeras k_W filas de Q_Z'E
+corresponden a la proyección sobre W y las restantes a la parte de Z₁
+ortogonal a W.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .regresion import (
+    TAMANO_BLOQUE,
+    AcumuladorMCO,
+    ResultadoMCO,
+    _como_matriz,
+    _solve_triangular,
+    inferencia_t,
+)
+
+DiagnosticoInstrumentos = namedtuple(
+    'DiagnosticoInstrumentos',
+    ['f_primera_etapa', 'p_valores', 'cragg_donald', 'gl'])
+
+
+class EstimadorMC2E:
+    """
+    MC2E con la factorización de los instrumentos y la primera etapa en caché
+
+    Parámetros:
+    -----------
+    exogenas : array (n, k_W)
+        Regresores exógenos incluidos; la primera columna debe ser la
+        constante para el F global y el R²
+    endogenas : array (n,) o (n, p)
+        Regresores endógenos
+    instrumentos : array (n,) o (n, q)
+        Instrumentos excluidos, q ≥ p
+    tamano_bloque : int
+        Filas por bloque (admite np.memmap)
+
+    Atributos:
+    ----------
+    primera_etapa : AcumuladorMCO
+        Regresión de las endógenas sobre Z = [W, Z₁]
+    n, k, l : int
+        Observaciones, regresores (k_W + p) e instrumentos (k_W + q)
+    """
+
+    def __init__(self, exogenas, endogenas, instrumentos, tamano_bloque=TAMANO_BLOQUE):
+        self.W = np.asarray(exogenas, dtype=float)
+        self.E = _como_matriz(endogenas)
+        self.Z1 = _como_matriz(instrumentos)
+        self.tamano_bloque = tamano_bloque
+
+        self.k_w = self.W.shape[1]
+        self.p = self.E.shape[1]
+        self.q = self.Z1.shape[1]
+        if self.q < self.p:
+            raise ValueError(f"Modelo no identificado: {self.q} instrumentos "
+                             f"excluidos para {self.p} regresores endógenos")
+        self.n = self.W.shape[0]
+        self.k = self.k_w + self.p
+        self.l = self.k_w + self.q
+
+        self.primera_etapa = AcumuladorMCO(self.l, self.p)
+        for inicio, fin in self._bloques():
+            self.primera_etapa.actualizar(self._instrumentos(inicio, fin),
+                                          self.E[inicio:fin])
+        self.primera_etapa._verificar_rango()
+
+        # A = Q_Z'X y su QR (segunda etapa), una sola vez
+        R_Z = self.primera_etapa.R
+        self.A = np.column_stack([R_Z[:, :self.k_w], self.primera_etapa.Z])
+        self._R_A = np.linalg.qr(self.A, mode='r')
+        diagonal = np.abs(np.diag(self._R_A))
+        if diagonal.min() <= 1e-12 * max(diagonal.max(), 1.0):
+            raise ValueError("Los instrumentos no identifican todos los coeficientes")
+
+    def _bloques(self):
+        for inicio in range(0, self.n, self.tamano_bloque):
+            yield inicio, min(inicio + self.tamano_bloque, self.n)
+
+    def _instrumentos(self, inicio, fin):
+        return np.column_stack([self.W[inicio:fin], self.Z1[inicio:fin]])
+
+    def _regresores(self, inicio, fin):
+        return np.column_stack([self.W[inicio:fin], self.E[inicio:fin]])
+
+    def proyectar(self, Y):
+        """
+        Q_Z'Y = R_Z⁻ᵀ Z'Y, (l, m)
+        """
+        Y = _como_matriz(Y)
+        ZtY = np.zeros((self.l, Y.shape[1]))
+        for inicio, fin in self._bloques():
+            ZtY += self._instrumentos(inicio, fin).T @ Y[inicio:fin]
+        return _solve_triangular(self.primera_etapa.R, ZtY, trans=1)
+
+    def inversa_xpx(self):
+        """
+        (X'P_Z X)⁻¹ = (A'A)⁻¹ = R_A⁻¹R_A⁻ᵀ
+        """
+        R_inv = _solve_triangular(self._R_A, np.eye(self.k))
+        return R_inv @ R_inv.T
+
+    def coeficientes(self, Y):
+        """
+        β̂ MC2E, (k,) o (k, m); orden [W, E]
+        """
+        beta = self._coeficientes(self.proyectar(Y))
+        return beta[:, 0] if np.ndim(Y) == 1 else beta
+
+    def _coeficientes(self, QtY):
+        # Mínimos cuadrados de l × k con la QR de A: R_A β = (A R_A⁻¹)'Q_Z'Y
+        return _solve_triangular(self._R_A, _solve_triangular(
+            self._R_A, self.A.T @ QtY, trans=1))
+
+    def ajustar(self, Y, nivel=0.95):
+        """
+        Coeficientes e inferencia MC2E (clásica) para una o muchas Y
+
+        Parámetros:
+        -----------
+        Y : array (n,) o (n, m)
+            Variables dependientes con los mismos regresores e instrumentos
+        nivel : float
+            Nivel de confianza de los intervalos
+
+        Retorna:
+        --------
+        resultado : ResultadoMCO
+            Mismos campos que AcumuladorMCO.ajustar; σ² y R² usan los
+            residuos estructurales y - Xβ̂, y el F global es el de Wald de
+            todas las pendientes (excepto la constante)
+        """
+        vector = np.ndim(Y) == 1
+        Y = _como_matriz(Y)
+        k, n = self.k, self.n
+        gl = n - k
+
+        beta = self._coeficientes(self.proyectar(Y))
+        media = Y.mean(axis=0)
+        rss = np.zeros(Y.shape[1])
+        tss = np.zeros(Y.shape[1])
+        for inicio, fin in self._bloques():
+            Y_b = Y[inicio:fin]
+            rss += np.sum((Y_b - self._regresores(inicio, fin) @ beta)**2, axis=0)
+            tss += np.sum((Y_b - media)**2, axis=0)
+
+        sigma2 = rss / gl
+        R_inv = _solve_triangular(self._R_A, np.eye(k))
+        diag_inv = np.sum(R_inv**2, axis=1)
+        se = np.sqrt(np.outer(diag_inv, sigma2))
+        t, p, ic = inferencia_t(beta, se, gl, nivel)
+
+        f, p_f = self._f_global(beta, R_inv, sigma2, gl)
+        r2 = 1 - rss / tss
+
+        if vector:
+            beta, se, t, p, ic = beta[:, 0], se[:, 0], t[:, 0], p[:, 0], ic[:, 0]
+            sigma2, rss, r2, f, p_f = (float(sigma2[0]), float(rss[0]), float(r2[0]),
+                                       float(f[0]), float(p_f[0]))
+        return ResultadoMCO(beta, se, t, p, ic, sigma2, rss, r2, f, p_f, gl, n)
+
+    def _f_global(self, beta, R_inv, sigma2, gl):
+        """
+        Wald (forma F) de H0: pendientes = 0, para todas las Y a la vez
+        """
+        from scipy import stats
+
+        q = self.k - 1
+        if q == 0:
+            return np.full(sigma2.size, np.nan), np.full(sigma2.size, np.nan)
+        # La covarianza de las pendientes es σ²·(R_inv R_inv')[1:, 1:]
+        L = np.linalg.cholesky((R_inv @ R_inv.T)[1:, 1:])
+        w = np.linalg.solve(L, beta[1:])
+        f = np.sum(w**2, axis=0) / q / sigma2
+        return f, stats.f.sf(f, q, gl)
+
+    def diagnosticos(self):
+        """
+        Diagnósticos de instrumentos débiles desde los factores en caché
+
+        F parcial de cada endógena: ‖(Q_Z'E)[k_W:, j]‖²/q sobre su varianza
+        residual de la primera etapa. Cragg-Donald: menor autovalor de
+        Σ̂⁻¹ᐟ² Π'Π Σ̂⁻¹ᐟ² / q con Π = (Q_Z'E)[k_W:] y Σ̂ la covarianza de
+        los residuos de la primera etapa; con una sola endógena coincide
+        con el F parcial. Regla práctica: F < 10 indica instrumentos
+        débiles (Staiger y Stock, 1997).
+
+        Retorna:
+        --------
+        diagnostico : DiagnosticoInstrumentos
+            f_primera_etapa y p_valores (p,), cragg_donald (float) y
+            gl = (q, n - l)
+        """
+        from scipy import stats
+
+        gl = self.n - self.l
+        Pi = self.primera_etapa.Z[self.k_w:]
+
+        # Covarianza de los residuos de la primera etapa (una pasada)
+        coeficientes = self.primera_etapa.coeficientes().reshape(self.l, self.p)
+        VtV = np.zeros((self.p, self.p))
+        for inicio, fin in self._bloques():
+            V = self.E[inicio:fin] - self._instrumentos(inicio, fin) @ coeficientes
+            VtV += V.T @ V
+        Sigma = VtV / gl
+
+        f = np.sum(Pi**2, axis=0) / self.q / np.diag(Sigma)
+        p_valores = stats.f.sf(f, self.q, gl)
+
+        L = np.linalg.cholesky(Sigma)
+        M = np.linalg.solve(L, np.linalg.solve(L, Pi.T @ Pi).T)
+        cragg_donald = float(np.linalg.eigvalsh(M).min()) / self.q
+        return DiagnosticoInstrumentos(f, p_valores, cragg_donald, (self.q, gl))
+
+
+def mc2e(y, exogenas, endogenas, instrumentos, nivel=0.95, tamano_bloque=TAMANO_BLOQUE):
+    """
+    MC2E de una o muchas variables dependientes
+
+    Retorna:
+    --------
+    resultado : ResultadoMCO
+        Coeficientes en el orden [exógenas, endógenas]
+    estimador : EstimadorMC2E
+        Con la primera etapa en caché, para reutilizar con otras Y
+    """
+    estimador = EstimadorMC2E(exogenas, endogenas, instrumentos, tamano_bloque)
+    return estimador.ajustar(y, nivel), estimador
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+NORMALIDAD: BATERÍA DE PRUEBAS POR LOTES
+==============================================================================
+Jarque-Bera, Anderson-Darling, Kolmogorov-Smirnov y Shapiro-Wilk sobre
+muchas muestras a la vez.
+
+Cada prueba recibe una matriz (m, n), una muestra por fila (o un vector
+(n,) para una sola muestra), y devuelve arrays (m,) de estadísticos y
+p-valores. Los coeficientes de Shapiro-Wilk (algoritmo AS R94 de Royston)
+dependen solo de n y se calculan una vez por tamaño muestral.
+
+Modo aproximado de Shapiro-Wilk
+-------------------------------
+La aproximación de Royston está calibrada para 3 ≤ n ≤ 5000. Con
+``aproximado=True`` se admiten muestras más grandes usando los mismos
+coeficientes y la misma transformación normalizante extrapolada; el
+estadístico W sigue siendo exacto dado a, pero el p-valor es aproximado.
+Sin esa opción se lanza ValueError para n > 5000.
+
+p-valores de Kolmogorov-Smirnov
+-------------------------------
+La distribución exacta de D (``stats.kstwo``) es costosa de evaluar. Para
+lotes de más de FILAS_KS_EXACTO filas se interpola (PCHIP) una tabla de
+``kstwo.sf`` calculada una vez por n, con error absoluto del orden de 1e-5.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# Tamaño máximo para el que la aproximación de Royston está calibrada
+N_MAX_SHAPIRO = 5000
+
+# Filas por bloque en bateria_normalidad
+FILAS_BLOQUE = 4096
+
+# Hasta este número de filas el p-valor de KS se calcula de forma exacta
+FILAS_KS_EXACTO = 1024
+
+# Puntos de la tabla de kstwo.sf en D ∈ [0, 1]
+PUNTOS_TABLA_KS = 4097
+
+
+def _como_matriz(X):
+    X = np.asarray(X, dtype=float)
+    return X[np.newaxis, :] if X.ndim == 1 else X
+
+
+def _salida(estadistico, p, una_muestra):
+    if una_muestra:
+        return float(estadistico[0]), float(p[0])
+    return estadistico, p
+
+
+def _poly(coeficientes, x):
+    """
+    c0 + c1·x + c2·x² + ...
+    """
+    return np.polynomial.polynomial.polyval(x, coeficientes)
+
+
+def jarque_bera_lote(X):
+    """
+    Prueba de Jarque-Bera por filas
+
+    JB = n/6 · (S² + (K - 3)²/4), con p-valor de la χ²(2)
+    """
+    from scipy import stats
+
+    una_muestra = np.ndim(X) == 1
+    X = _como_matriz(X)
+    n = X.shape[1]
+    d = X - X.mean(axis=1, keepdims=True)
+    m2 = np.mean(d**2, axis=1)
+    asimetria = np.mean(d**3, axis=1) / m2**1.5
+    curtosis = np.mean(d**4, axis=1) / m2**2
+    jb = n / 6 * (asimetria**2 + (curtosis - 3)**2 / 4)
+    return _salida(jb, stats.chi2.sf(jb, 2), una_muestra)
+
+
+def anderson_darling_lote(X):
+    """
+    Anderson-Darling para normalidad con media y varianza estimadas
+
+    Retorna el estadístico ajustado A*² = A²(1 + 0.75/n + 2.25/n²) y el
+    p-valor de D'Agostino y Stephens (1986).
+    """
+    from scipy import special
+
+    una_muestra = np.ndim(X) == 1
+    X = np.sort(_como_matriz(X), axis=1)
+    n = X.shape[1]
+    z = (X - X.mean(axis=1, keepdims=True)) / X.std(axis=1, ddof=1, keepdims=True)
+
+    log_F = special.log_ndtr(z)
+    log_S = special.log_ndtr(-z[:, ::-1])
+    i = np.arange(1, n + 1)
+    a2 = -n - np.sum((2 * i - 1) * (log_F + log_S), axis=1) / n
+    a2 = a2 * (1 + 0.75 / n + 2.25 / n**2)
+
+    p = np.select(
+        [a2 >= 0.6, a2 >= 0.34, a2 >= 0.2],
+        [np.exp(1.2937 - 5.709 * a2 + 0.0186 * a2**2),
+         np.exp(0.9177 - 4.279 * a2 - 1.38 * a2**2),
+         1 - np.exp(-8.318 + 42.796 * a2 - 59.938 * a2**2)],
+        default=1 - np.exp(-13.436 + 101.14 * a2 - 223.73 * a2**2),
+    )
+    return _salida(a2, np.clip(p, 0.0, 1.0), una_muestra)
+
+
+@lru_cache(maxsize=64)
+def _tabla_kstwo(n):
+    """
+    Interpolador de kstwo.sf(·, n) en D ∈ [0, 1], en caché por n
+    """
+    from scipy import stats
+    from scipy.interpolate import PchipInterpolator
+
+    d = np.linspace(0.0, 1.0, PUNTOS_TABLA_KS)
+    with np.errstate(over='ignore', invalid='ignore'):
+        return PchipInterpolator(d, stats.kstwo.sf(d, n))
+
+
+def ks_lote(X, mu=0.0, sigma=1.0):
+    """
+    Kolmogorov-Smirnov frente a N(mu, sigma²) con parámetros conocidos
+
+    Adecuada para los valores Z del TCL, estandarizados con los momentos
+    teóricos. El p-valor usa la distribución exacta de D (stats.kstwo), o
+    su tabla interpolada para lotes de más de FILAS_KS_EXACTO filas.
+    """
+    from scipy import special, stats
+
+    una_muestra = np.ndim(X) == 1
+    X = np.sort(_como_matriz(X), axis=1)
+    n = X.shape[1]
+    F = special.ndtr((X - mu) / sigma)
+    i = np.arange(1, n + 1)
+    d = np.maximum(np.max(i / n - F, axis=1), np.max(F - (i - 1) / n, axis=1))
+    if X.shape[0] <= FILAS_KS_EXACTO:
+        p = stats.kstwo.sf(d, n)
+    else:
+        p = np.clip(_tabla_kstwo(n)(d), 0.0, 1.0)
+    return _salida(d, p, una_muestra)
+
+
+@lru_cache(maxsize=256)
+def coeficientes_shapiro(n):
+    """
+    Coeficientes a (n,) de Shapiro-Wilk (Royston, 1992), en caché por n
+    """
+    from scipy import stats
+
+    if n < 3:
+        raise ValueError("Shapiro-Wilk requiere n >= 3")
+    if n == 3:
+        a = np.array([-np.sqrt(0.5), 0.0, np.sqrt(0.5)])
+        a.setflags(write=False)
+        return a
+
+    m = stats.norm.ppf((np.arange(1, n + 1) - 0.375) / (n + 0.25))
+    suma_m2 = np.sum(m**2)
+    c = m / np.sqrt(suma_m2)
+    u = 1 / np.sqrt(n)
+
+    a = np.empty(n)
+    a_n = c[-1] + _poly([0, 0.221157, -0.147981, -2.071190, 4.434685, -2.706056], u)
+    if n > 5:
+        a_n1 = c[-2] + _poly([0, 0.042981, -0.293762, -1.752461, 5.682633, -3.582633], u)
+        phi = ((suma_m2 - 2 * m[-1]**2 - 2 * m[-2]**2)
+               / (1 - 2 * a_n**2 - 2 * a_n1**2))
+        a[2:-2] = m[2:-2] / np.sqrt(phi)
+        a[-2], a[1] = a_n1, -a_n1
+    else:
+        phi = (suma_m2 - 2 * m[-1]**2) / (1 - 2 * a_n**2)
+        a[1:-1] = m[1:-1] / np.sqrt(phi)
+    a[-1], a[0] = a_n, -a_n
+
+    a.setflags(write=False)
+    return a
+
+
+def _p_valor_shapiro(w, n):
+    """
+    p-valor de Royston (1995) para W
+    """
+    from scipy import stats
+
+    if n == 3:
+        p = 6 / np.pi * (np.arcsin(np.sqrt(w)) - np.arcsin(np.sqrt(0.75)))
+        return np.clip(p, 0.0, 1.0)
+
+    log_1mw = np.log1p(-np.minimum(w, 1 - 1e-16))
+    if n <= 11:
+        gamma = _poly([-2.273, 0.459], n)
+        with np.errstate(invalid='ignore'):
+            y = -np.log(gamma - log_1mw)
+        media = _poly([0.544, -0.39978, 0.025054, -6.714e-4], n)
+        desv = np.exp(_poly([1.3822, -0.77857, 0.062767, -0.0020322], n))
+        p = stats.norm.sf((y - media) / desv)
+        return np.where(log_1mw >= gamma, 1e-99, p)
+
+    ln_n = np.log(n)
+    media = _poly([-1.5861, -0.31082, -0.083751, 0.0038915], ln_n)
+    desv = np.exp(_poly([-0.4803, -0.082676, 0.0030302], ln_n))
+    return stats.norm.sf((log_1mw - media) / desv)
+
+
+def shapiro_lote(X, aproximado=False):
+    """
+    Prueba de Shapiro-Wilk por filas
+
+    Parámetros:
+    -----------
+    X : array (m, n) o (n,)
+        Muestras
+    aproximado : bool
+        Permite n > 5000 (ver el modo aproximado en la cabecera del módulo)
+
+    Retorna:
+    --------
+    W, p : arrays (m,) (o floats para una sola muestra)
+    """
+    una_muestra = np.ndim(X) == 1
+    X = np.sort(_como_matriz(X), axis=1)
+    n = X.shape[1]
+    if n > N_MAX_SHAPIRO and not aproximado:
+        raise ValueError(f"Shapiro-Wilk está calibrada hasta n = {N_MAX_SHAPIRO}; "
+                         "use aproximado=True para muestras mayores")
+
+    a = coeficientes_shapiro(n)
+    d = X - X.mean(axis=1, keepdims=True)
+    w = (d @ a)**2 / np.sum(d**2, axis=1)
+    w = np.minimum(w, 1.0)
+    return _salida(w, _p_valor_shapiro(w, n), una_muestra)
+
+
+PRUEBAS = {
+    'jarque_bera': jarque_bera_lote,
+    'anderson_darling': anderson_darling_lote,
+    'ks': ks_lote,
+    'shapiro': shapiro_lote,
+}
+
+
+def bateria_normalidad(X, pruebas=tuple(PRUEBAS), aproximado=False,
+                       filas_bloque=FILAS_BLOQUE):
+    """
+    Ejecuta varias pruebas de normalidad sobre muchas muestras
+
+    Parámetros:
+    -----------
+    X : array (m, n)
+        Una muestra por fila
+    pruebas : tuple de str
+        Subconjunto de 'jarque_bera', 'anderson_darling', 'ks', 'shapiro'
+    aproximado : bool
+        Modo aproximado de Shapiro-Wilk para n > 5000
+    filas_bloque : int
+        Filas procesadas a la vez (acota la memoria de los ordenamientos)
+
+    Retorna:
+    --------
+    resultados : dict
+        prueba -> (estadisticos (m,), p_valores (m,))
+    """
+    X = _como_matriz(X)
+    m = X.shape[0]
+    resultados = {p: (np.empty(m), np.empty(m)) for p in pruebas}
+
+    for inicio in range(0, m, filas_bloque):
+        bloque = X[inicio:inicio + filas_bloque]
+        fin = inicio + bloque.shape[0]
+        for prueba in pruebas:
+            if prueba == 'shapiro':
+                est, p = shapiro_lote(bloque, aproximado=aproximado)
+            else:
+                est, p = PRUEBAS[prueba](bloque)
+            resultados[prueba][0][inicio:fin] = est
+            resultados[prueba][1][inicio:fin] = p
+
+    return resultados
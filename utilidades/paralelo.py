@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+PARALELO: EJECUCIÓN EN POOL DE PROCESOS
+==============================================================================
+Utilidades comunes para repartir tareas independientes entre procesos.
+
+El número de procesos por defecto es os.cpu_count(), salvo que la variable
+de entorno ``ECONOMETRIA_TRABAJADORES`` indique otro (ejecutar_libro.py la
+fija para repartir los núcleos entre los scripts que corren a la vez).
+"""
+
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+VARIABLE_TRABAJADORES = 'ECONOMETRIA_TRABAJADORES'
+
+
+def contexto_procesos():
+    """
+    Contexto 'fork' cuando está disponible: los scripts del libro ejecutan
+    código al nivel del módulo y no deben reimportarse en cada trabajador
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def numero_trabajadores(trabajadores=None, tareas=None):
+    """
+    Procesos a usar: ECONOMETRIA_TRABAJADORES u os.cpu_count() por defecto,
+    sin exceder las tareas
+    """
+    if trabajadores is None:
+        trabajadores = int(os.environ.get(VARIABLE_TRABAJADORES) or os.cpu_count() or 1)
+    if tareas is not None:
+        trabajadores = min(trabajadores, max(tareas, 1))
+    return max(int(trabajadores), 1)
+
+
+def mapear_procesos(funcion, tareas, trabajadores=None):
+    """
+    Aplica ``funcion`` a cada tarea en un pool de procesos, en orden
+
+    Con un solo trabajador se ejecuta en el proceso actual, sin el costo de
+    crear el pool. ``funcion`` debe estar definida al nivel de un módulo.
+
+    Retorna:
+    --------
+    resultados : list
+        Resultados en el mismo orden que ``tareas``
+    """
+    tareas = list(tareas)
+    trabajadores = numero_trabajadores(trabajadores, len(tareas))
+
+    if trabajadores == 1:
+        return [funcion(t) for t in tareas]
+
+    with ProcessPoolExecutor(max_workers=trabajadores,
+                             mp_context=contexto_procesos()) as pool:
+        return list(pool.map(funcion, tareas))
+
+
+def iterar_procesos(funcion, tareas, trabajadores=None, inicializador=None,
+                    argumentos=(), en_vuelo=2):
+    """
+    Resultados de ``funcion`` sobre ``tareas``, en orden y a medida que
+    terminan, con un solo pool para todas las tareas
+
+    Las tareas se envían de forma incremental (a lo sumo ``en_vuelo`` por
+    trabajador pendientes), de modo que quien consume puede detenerse
+    antes: al cerrar el generador se cancelan las tareas no iniciadas.
+    ``inicializador(*argumentos)`` se ejecuta una vez en cada trabajador;
+    con el contexto 'fork' los argumentos se heredan sin serializarse, lo
+    que sirve para compartir arrays grandes en lugar de enviarlos en cada
+    tarea. Con un solo trabajador todo se ejecuta en el proceso actual.
+
+    Parámetros:
+    -----------
+    funcion : función
+        Definida al nivel de un módulo
+    tareas : iterable
+        Argumento de cada llamada
+    trabajadores : int, opcional
+        Procesos (ver numero_trabajadores)
+    inicializador : función, opcional
+        Se llama con ``argumentos`` al iniciar cada trabajador
+    en_vuelo : int
+        Tareas enviadas por trabajador antes de esperar resultados
+    """
+    tareas = iter(tareas)
+    trabajadores = numero_trabajadores(trabajadores)
+
+    if trabajadores == 1:
+        if inicializador is not None:
+            inicializador(*argumentos)
+        for tarea in tareas:
+            yield funcion(tarea)
+        return
+
+    with ProcessPoolExecutor(max_workers=trabajadores,
+                             mp_context=contexto_procesos(),
+                             initializer=inicializador,
+                             initargs=tuple(argumentos)) as pool:
+        pendientes = deque(pool.submit(funcion, t)
+                           for t in islice(tareas, en_vuelo * trabajadores))
+        try:
+            while pendientes:
+                resultado = pendientes.popleft().result()
+                for tarea in islice(tareas, 1):
+                    pendientes.append(pool.submit(funcion, tarea))
+                yield resultado
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
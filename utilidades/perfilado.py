@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+PERFILADO: TIEMPOS Y MEMORIA POR ETAPA
+==============================================================================
+Instrumentación opcional de las etapas de un script (generación de datos,
+estadísticos, pruebas, gráficos).
+
+    with etapa('simulacion'):
+        ...
+
+    @perfilar('graficos')
+    def renderizar_todo(...):
+        ...
+
+Se activa con la variable de entorno ``ECONOMETRIA_PERFIL``, una lista
+separada por comas de:
+
+- ``tiempo``   tiempo de pared y de CPU de cada etapa (siempre incluido)
+- ``memoria``  pico de memoria asignada durante la etapa (tracemalloc)
+- ``cprofile`` las funciones más costosas de la etapa (cProfile)
+
+(``1`` equivale a ``tiempo``). Cada etapa al terminar emite una línea JSON
+en stderr, o en el archivo indicado por ``ECONOMETRIA_PERFIL_ARCHIVO``. Las
+etapas pueden anidarse; el nombre registrado es la ruta ('main/simulacion').
+
+Sin la variable, ``etapa`` devuelve un contexto nulo compartido y
+``perfilar`` devuelve la función sin envolver: el costo es nulo.
+"""
+
+import functools
+import io
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+VARIABLE_PERFIL = 'ECONOMETRIA_PERFIL'
+VARIABLE_ARCHIVO = 'ECONOMETRIA_PERFIL_ARCHIVO'
+
+OPCIONES = ('tiempo', 'memoria', 'cprofile')
+
+# Funciones listadas por etapa con cProfile
+FUNCIONES_PERFIL = 15
+
+
+def _leer_opciones(valor):
+    """
+    Conjunto de opciones activas a partir del valor de la variable de entorno
+    """
+    partes = {p.strip().lower() for p in (valor or '').split(',') if p.strip()}
+    if not partes or partes <= {'0', 'no', 'false'}:
+        return frozenset()
+    partes = {'tiempo' if p in ('1', 'si', 'true') else p for p in partes}
+    desconocidas = partes - set(OPCIONES)
+    if desconocidas:
+        raise ValueError(f"Opciones de {VARIABLE_PERFIL} no soportadas: "
+                         f"{sorted(desconocidas)}. Opciones: {OPCIONES}")
+    return frozenset(partes | {'tiempo'})
+
+
+_opciones = frozenset()
+_local = threading.local()
+_candado = threading.Lock()
+
+
+def activo():
+    """
+    True si la instrumentación está activada
+    """
+    return bool(_opciones)
+
+
+def configurar(opciones=None):
+    """
+    Activa (p. ej. 'tiempo,memoria') o desactiva (None) la instrumentación
+
+    Al importar el módulo se configura con la variable de entorno; esta
+    función permite cambiarlo desde código.
+    """
+    global _opciones
+    if isinstance(opciones, str) or opciones is None:
+        _opciones = _leer_opciones(opciones)
+    else:
+        _opciones = _leer_opciones(','.join(opciones))
+    if 'memoria' in _opciones:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+def _pila():
+    pila = getattr(_local, 'pila', None)
+    if pila is None:
+        pila = _local.pila = []
+    return pila
+
+
+def _emitir(registro):
+    linea = json.dumps(registro, ensure_ascii=False)
+    archivo = os.environ.get(VARIABLE_ARCHIVO)
+    with _candado:
+        if archivo:
+            with open(archivo, 'a', encoding='utf-8') as f:
+                f.write(linea + '\n')
+        else:
+            print(linea, file=sys.stderr, flush=True)
+
+
+def _rss_maximo():
+    """
+    Memoria residente máxima del proceso en bytes (None si no disponible)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KiB y macOS en bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def _resumen_cprofile(perfil):
+    import pstats
+
+    estadisticas = pstats.Stats(perfil, stream=io.StringIO())
+    filas = []
+    for (archivo, linea, funcion), (_, llamadas, t_propio, t_acumulado, _) \
+            in estadisticas.stats.items():
+        filas.append({
+            'funcion': f'{Path(archivo).name}:{linea}({funcion})',
+            'llamadas': llamadas,
+            'tiempo_propio': t_propio,
+            'tiempo_acumulado': t_acumulado,
+        })
+    filas.sort(key=lambda f: f['tiempo_acumulado'], reverse=True)
+    return filas[:FUNCIONES_PERFIL]
+
+
+class _Etapa:
+    """
+    Contexto instrumentado de una etapa (solo existe con el perfilado activo)
+    """
+
+    def __init__(self, nombre, opciones):
+        self.nombre = nombre
+        self.opciones = opciones
+
+    def __enter__(self):
+        pila = _pila()
+        self.ruta = '/'.join([e.nombre for e in pila] + [self.nombre])
+        self.pico = 0
+        self.perfil = None
+
+        if 'memoria' in self.opciones:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            # El pico acumulado hasta aquí pertenece a la etapa padre
+            if pila:
+                pila[-1].pico = max(pila[-1].pico, tracemalloc.get_traced_memory()[1])
+            self.memoria_inicial = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        # Un solo cProfile a la vez: las etapas anidadas quedan incluidas
+        # en el perfil de la etapa exterior
+        if 'cprofile' in self.opciones and not any(e.perfil for e in pila):
+            import cProfile
+            self.perfil = cProfile.Profile()
+
+        pila.append(self)
+        self.inicio = time.time()
+        self.t0 = time.perf_counter()
+        self.cpu0 = time.process_time()
+        if self.perfil is not None:
+            self.perfil.enable()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if self.perfil is not None:
+            self.perfil.disable()
+        tiempo = time.perf_counter() - self.t0
+        cpu = time.process_time() - self.cpu0
+
+        pila = _pila()
+        pila.pop()
+
+        registro = {
+            'script': Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else None,
+            'etapa': self.ruta,
+            'inicio': self.inicio,
+            'tiempo': tiempo,
+            'cpu': cpu,
+            'error': tipo.__name__ if tipo is not None else None,
+        }
+
+        if 'memoria' in self.opciones:
+            import tracemalloc
+            actual, pico = tracemalloc.get_traced_memory()
+            self.pico = max(self.pico, pico)
+            registro['memoria_pico'] = self.pico - self.memoria_inicial
+            registro['memoria_neta'] = actual - self.memoria_inicial
+            registro['rss_max'] = _rss_maximo()
+            if pila:
+                pila[-1].pico = max(pila[-1].pico, self.pico)
+
+        if self.perfil is not None:
+            registro['perfil'] = _resumen_cprofile(self.perfil)
+
+        _emitir(registro)
+        return False
+
+
+class _EtapaNula:
+    """
+    Contexto sin efecto (perfilado desactivado)
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        return False
+
+
+_NULA = _EtapaNula()
+
+
+def etapa(nombre):
+    """
+    Contexto que mide una etapa con nombre
+
+    Con el perfilado desactivado devuelve un contexto nulo compartido.
+    """
+    if not _opciones:
+        return _NULA
+    return _Etapa(nombre, _opciones)
+
+
+def perfilar(nombre=None):
+    """
+    Decorador: mide cada llamada como una etapa (por defecto, con el
+    nombre de la función)
+
+    La decisión se toma al decorar: con el perfilado desactivado se
+    devuelve la función original, sin envoltura.
+    """
+    def decorador(funcion):
+        if not _opciones:
+            return funcion
+        nombre_etapa = nombre or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with _Etapa(nombre_etapa, _opciones):
+                return funcion(*args, **kwargs)
+
+        return envoltura
+
+    return decorador
+
+
+configurar(os.environ.get(VARIABLE_PERFIL))
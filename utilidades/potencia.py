@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+POTENCIA: MONTE CARLO VECTORIZADO PARA LA PRUEBA T DE UNA MUESTRA
+==============================================================================
+Tasas de rechazo (tamaño y potencia) sobre rejillas (μ, σ, n, α).
+
+Las réplicas se procesan como matrices (réplicas × n) por bloques. Para un
+mismo n se reutilizan las mismas extracciones Z ~ N(0,1) en toda la rejilla
+(números aleatorios comunes): como X = μ + σZ,
+
+    t = (X̄ - μ0) / (S/√n) = √n · (Z̄ + (μ - μ0)/σ) / S_Z
+
+y solo importa δ = (μ - μ0)/σ. Así el costo es proporcional al número total
+de extracciones y las superficies resultan suaves en (μ, σ).
+"""
+
+import numpy as np
+
+from . import distribuciones
+from .acumulados import momentos
+from .distribuciones import tabla_distribucion
+
+# Número máximo de valores por bloque (réplicas × n)
+MAX_VALORES_BLOQUE = 2**22
+
+
+def prueba_t(X, mu_0, alpha=0.05):
+    """
+    Prueba t bilateral para la media
+
+    Parámetros:
+    -----------
+    X : array (n,)
+        Muestra
+    mu_0 : float
+        Media bajo H0
+    alpha : float
+        Nivel de significancia
+
+    Retorna:
+    --------
+    resultado : dict
+        'x_bar', 's', 'se', 'gl', 't_obs', 't_crit', 'p_valor', 'ic_95' y
+        'rechazar' (True si p < alpha)
+    """
+    # Estadísticos muestrales
+    n = len(X)
+    mom = momentos(X)
+    x_bar = mom.media
+    s = mom.desviacion(ddof=1)  # Desviación estándar muestral (corregida)
+    se = s / np.sqrt(n)         # Error estándar
+
+    gl = n - 1  # Grados de libertad
+    t_obs = (x_bar - mu_0) / se  # Estadístico t
+    t_crit = distribuciones.valor_critico('t', alpha, df=gl)  # Valor crítico bilateral
+    p_valor = distribuciones.p_valor('t', t_obs, df=gl)       # p-valor bilateral
+
+    # Intervalo de confianza (1 - alpha)
+    ic = x_bar + np.array([-1, 1]) * distribuciones.cuantil('t', 1 - alpha / 2, df=gl) * se
+
+    return {
+        'x_bar': x_bar, 's': s, 'se': se, 'gl': gl,
+        't_obs': t_obs, 't_crit': t_crit, 'p_valor': p_valor,
+        'ic_95': ic, 'rechazar': p_valor < alpha,
+    }
+
+
+def estadisticos_t(X, mu_0):
+    """
+    Estadístico t de una muestra para cada fila de X
+
+    Parámetros:
+    -----------
+    X : array (r, n)
+        Una muestra por fila
+    mu_0 : float
+        Media bajo H0
+
+    Retorna:
+    --------
+    t : array (r,)
+    """
+    X = np.asarray(X, dtype=float)
+    n = X.shape[-1]
+    return (X.mean(axis=-1) - mu_0) / (X.std(axis=-1, ddof=1) / np.sqrt(n))
+
+
+def p_valores_t(t, gl, alternativa='bilateral', tol_tabla=None):
+    """
+    p-valores vectorizados con stats.t.sf
+
+    Con ``tol_tabla`` se usa la tabla interpolada de
+    utilidades.distribuciones, con error absoluto menor que esa tolerancia.
+    """
+    from scipy import stats
+
+    if tol_tabla is not None:
+        return tabla_distribucion('t', gl, tol_tabla).p_valor(t, alternativa)
+    if alternativa == 'bilateral':
+        return 2 * stats.t.sf(np.abs(t), gl)
+    if alternativa == 'mayor':
+        return stats.t.sf(t, gl)
+    if alternativa == 'menor':
+        return stats.t.sf(-t, gl)
+    raise ValueError(f"Alternativa no soportada: {alternativa!r}")
+
+
+def superficie_potencia(mu_grid, sigma_grid, n_grid, alpha_grid, mu_0,
+                        replicas, rng, alternativa='bilateral',
+                        chunk_size=None, tol_tabla=None):
+    """
+    Tasa de rechazo de H0: μ = μ0 sobre la rejilla (μ, σ, n, α)
+
+    Parámetros:
+    -----------
+    mu_grid, sigma_grid, n_grid, alpha_grid : array
+        Valores de cada dimensión de la rejilla
+    mu_0 : float
+        Media bajo H0
+    replicas : int
+        Réplicas Monte Carlo por punto de la rejilla
+    rng : np.random.Generator
+        Generador (ver utilidades.aleatorio)
+    alternativa : str
+        'bilateral', 'mayor' o 'menor'
+    chunk_size : int, opcional
+        Réplicas por bloque; por defecto a lo sumo MAX_VALORES_BLOQUE
+        valores por bloque
+    tol_tabla : float, opcional
+        Si se indica, los p-valores se obtienen de una tabla interpolada
+        con esa cota de error en lugar de llamar a scipy
+
+    Retorna:
+    --------
+    potencia : array (len(mu_grid), len(sigma_grid), len(n_grid), len(alpha_grid))
+        Proporción de réplicas que rechazan H0. En μ = μ0 es el tamaño
+        empírico de la prueba. El error estándar Monte Carlo de cada celda
+        es √(p(1-p)/replicas).
+    """
+    mu_grid = np.atleast_1d(np.asarray(mu_grid, dtype=float))
+    sigma_grid = np.atleast_1d(np.asarray(sigma_grid, dtype=float))
+    alpha_grid = np.atleast_1d(np.asarray(alpha_grid, dtype=float))
+    n_grid = np.atleast_1d(np.asarray(n_grid, dtype=int))
+
+    # δ = (μ - μ0)/σ para cada par (μ, σ)
+    delta = ((mu_grid[:, np.newaxis] - mu_0) / sigma_grid[np.newaxis, :]).ravel()
+    rechazos = np.zeros((delta.size, n_grid.size, alpha_grid.size))
+
+    for k, n in enumerate(n_grid):
+        gl = n - 1
+        if chunk_size is None:
+            filas = max(1, MAX_VALORES_BLOQUE // max(n, delta.size * alpha_grid.size))
+        else:
+            filas = chunk_size
+        restantes = replicas
+        while restantes > 0:
+            r = min(filas, restantes)
+            Z = rng.standard_normal((r, n))
+            z_bar = Z.mean(axis=1)
+            s_z = Z.std(axis=1, ddof=1)
+
+            t = np.sqrt(n) * (z_bar[:, np.newaxis] + delta) / s_z[:, np.newaxis]
+            p = p_valores_t(t, gl, alternativa, tol_tabla)
+            rechazos[:, k, :] += np.sum(p[:, :, np.newaxis] < alpha_grid, axis=0)
+            restantes -= r
+
+    potencia = rechazos / replicas
+    return potencia.reshape(mu_grid.size, sigma_grid.size,
+                            n_grid.size, alpha_grid.size)
+
+
+def potencia_teorica(mu_grid, sigma_grid, n_grid, alpha_grid, mu_0,
+                     alternativa='bilateral'):
+    """
+    Potencia exacta con la t no central (referencia para validar el
+    Monte Carlo); misma forma de salida que superficie_potencia
+    """
+    from scipy import stats
+
+    mu = np.asarray(mu_grid, dtype=float)[:, None, None, None]
+    sigma = np.asarray(sigma_grid, dtype=float)[None, :, None, None]
+    n = np.asarray(n_grid, dtype=int)[None, None, :, None]
+    alpha = np.asarray(alpha_grid, dtype=float)[None, None, None, :]
+
+    gl = n - 1
+    nc = np.sqrt(n) * (mu - mu_0) / sigma
+    if alternativa == 'bilateral':
+        t_crit = stats.t.ppf(1 - alpha / 2, gl)
+        return stats.nct.sf(t_crit, gl, nc) + stats.nct.cdf(-t_crit, gl, nc)
+    if alternativa == 'mayor':
+        return stats.nct.sf(stats.t.ppf(1 - alpha, gl), gl, nc)
+    if alternativa == 'menor':
+        return stats.nct.cdf(stats.t.ppf(alpha, gl), gl, nc)
+    raise ValueError(f"Alternativa no soportada: {alternativa!r}")
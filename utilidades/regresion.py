@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+REGRESIÓN: MÍNIMOS CUADRADOS ORDINARIOS INCREMENTALES
+==============================================================================
+Motor MCO basado en el factor triangular R de la descomposición QR de X,
+acumulado por bloques.
+
+- El estado es el factor aumentado [R | Z] (k × (k+m)), con R'R = X'X y
+  R'Z = X'Y, más la suma de cuadrados residual de cada columna de Y. Nunca
+  se forma X'X, lo que conserva la precisión de QR.
+- Una fila se agrega (rotaciones de Givens) o se quita (rotaciones
+  hiperbólicas) en O(k(k+m)), sin volver a ajustar con las n filas.
+- Un bloque se incorpora con una QR de [R; X] y la proyección de [Z; Y];
+  dos acumuladores de particiones distintas se combinan igual con
+  [R₁; R₂] y [Z₁; Z₂].
+- Y puede tener m columnas: todas comparten la misma X y el mismo factor,
+  por lo que m ajustes cuestan una sola factorización.
+
+Los coeficientes, errores estándar, estadísticos t/F y p-valores se
+obtienen del factor en O(k²m + k³), sin importar n.
+"""
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+# Filas por bloque al ajustar arrays grandes (p. ej. un np.memmap)
+TAMANO_BLOQUE = 2**16
+
+ResultadoMCO = namedtuple(
+    'ResultadoMCO',
+    ['coeficientes', 'errores_estandar', 't', 'p_valores', 'ic', 'sigma2',
+     'rss', 'r2', 'f', 'p_valor_f', 'gl', 'n'])
+
+
+def _solve_triangular(R, B, trans=0):
+    from scipy.linalg import solve_triangular
+
+    return solve_triangular(R, B, trans=trans, lower=False)
+
+
+def _como_matriz(Y):
+    """
+    Y como array 2-D (filas, m); un vector es una sola columna
+    """
+    Y = np.asarray(Y, dtype=float)
+    return Y[:, None] if Y.ndim == 1 else Y
+
+
+def inferencia_t(beta, se, gl, nivel=0.95):
+    """
+    Estadísticos t, p-valores bilaterales e intervalos de confianza
+
+    Parámetros:
+    -----------
+    beta, se : array
+        Coeficientes y errores estándar (misma forma)
+    gl : int
+        Grados de libertad de la t de Student
+    nivel : float
+        Nivel de confianza de los intervalos
+
+    Retorna:
+    --------
+    t, p_valores : array (forma de beta)
+    ic : array (forma de beta + (2,))
+    """
+    from scipy import stats
+
+    from .potencia import p_valores_t
+
+    t = beta / se
+    t_crit = stats.t.ppf(1 - (1 - nivel) / 2, gl)
+    ic = np.stack([beta - t_crit * se, beta + t_crit * se], axis=-1)
+    return t, p_valores_t(t, gl), ic
+
+
+def prueba_wald(beta, covarianza, restricciones, valores=None, gl=None):
+    """
+    Prueba de Wald (forma F) de H0: Cβ = c con una covarianza dada
+
+    F = (Cβ - c)'[C V C']⁻¹(Cβ - c) / q; con ``gl`` el p-valor usa la
+    F(q, gl), y sin él la χ²(q)/q asintótica.
+
+    Retorna:
+    --------
+    f, p_valor : float
+    """
+    from scipy import stats
+
+    C = np.atleast_2d(np.asarray(restricciones, dtype=float))
+    q = C.shape[0]
+    c = np.zeros(q) if valores is None else np.asarray(valores, dtype=float)
+    discrepancia = C @ beta - c
+    L = np.linalg.cholesky(C @ covarianza @ C.T)
+    w = np.linalg.solve(L, discrepancia)
+    f = float(w @ w) / q
+    p = stats.f.sf(f, q, gl) if gl is not None else stats.chi2.sf(q * f, q)
+    return f, float(p)
+
+
+class AcumuladorMCO:
+    """
+    Estadísticos suficientes de MCO para m variables dependientes con la
+    misma matriz X
+
+    Atributos:
+    ----------
+    k, m : int
+        Regresores y variables dependientes
+    n : int
+        Observaciones acumuladas
+    factor : array (k, k + m)
+        [R | Z], triangular superior en las k primeras columnas
+    rss : array (m,)
+        Suma de cuadrados residual de cada columna de Y
+    media_y, m2_y : array (m,)
+        Media y Σ(y - ȳ)² de cada columna de Y (para el R²)
+    """
+
+    def __init__(self, k, m=1):
+        self.k = int(k)
+        self.m = int(m)
+        self.n = 0
+        self.factor = np.zeros((self.k, self.k + self.m))
+        self.rss = np.zeros(self.m)
+        self.media_y = np.zeros(self.m)
+        self.m2_y = np.zeros(self.m)
+
+    @classmethod
+    def desde_bloque(cls, X, Y):
+        """
+        Acumulador de un bloque en memoria
+        """
+        X = np.asarray(X, dtype=float)
+        Y = _como_matriz(Y)
+        return cls(X.shape[1], Y.shape[1]).actualizar(X, Y)
+
+    @property
+    def R(self):
+        return self.factor[:, :self.k]
+
+    @property
+    def Z(self):
+        return self.factor[:, self.k:]
+
+    # ----------------------------------------------------------------
+    # Actualización por bloques y combinación
+    # ----------------------------------------------------------------
+
+    def _absorber(self, X, Y):
+        """
+        Incorpora las filas [X Y] (o el factor de otra partición)
+
+        Solo se factoriza [R; X] (k columnas): las m columnas de Y se
+        proyectan con Q, lo que cuesta O(bkm) en lugar de O(b(k+m)²).
+        """
+        q, r = np.linalg.qr(np.vstack([self.R, X]))
+        apilado_y = np.vstack([self.Z, Y])
+        Z = q.T @ apilado_y
+        # Aporte a la suma residual: norma de la parte de [Z; Y] fuera del
+        # espacio de las columnas de [R; X]
+        self.rss += np.sum((apilado_y - q @ Z)**2, axis=0)
+        # Diagonal positiva (la QR de LAPACK no fija el signo)
+        signos = np.where(np.diag(r) < 0, -1.0, 1.0)[:, None]
+        self.factor = np.hstack([r * signos, Z * signos])
+
+    def _combinar_y(self, n2, media2, m2_2):
+        n1 = self.n
+        n = n1 + n2
+        delta = media2 - self.media_y
+        self.m2_y = self.m2_y + m2_2 + delta**2 * n1 * n2 / n
+        self.media_y = self.media_y + delta * n2 / n
+        self.n = n
+
+    def _quitar_y(self, n2, media2, m2_2):
+        n = self.n
+        n1 = n - n2
+        if n1 == 0:
+            self.media_y[:] = 0.0
+            self.m2_y[:] = 0.0
+        else:
+            media1 = (n * self.media_y - n2 * media2) / n1
+            delta = media2 - media1
+            self.m2_y = self.m2_y - m2_2 - delta**2 * n1 * n2 / n
+            self.media_y = media1
+        self.n = n1
+
+    def actualizar(self, X, Y):
+        """
+        Incorpora un bloque de filas (X (b, k), Y (b,) o (b, m))
+        """
+        X = np.asarray(X, dtype=float)
+        Y = _como_matriz(Y)
+        if X.shape[0] == 0:
+            return self
+        self._absorber(X, Y)
+        media = Y.mean(axis=0)
+        self._combinar_y(X.shape[0], media, np.sum((Y - media)**2, axis=0))
+        return self
+
+    def combinar(self, otro):
+        """
+        Combina (en el lugar) el acumulador de otra partición
+        """
+        if (otro.k, otro.m) != (self.k, self.m):
+            raise ValueError("Los acumuladores deben tener los mismos k y m")
+        if otro.n == 0:
+            return self
+        self._absorber(otro.R, otro.Z)
+        self.rss += otro.rss
+        self._combinar_y(otro.n, otro.media_y, otro.m2_y)
+        return self
+
+    # ----------------------------------------------------------------
+    # Actualización y eliminación de filas individuales
+    # ----------------------------------------------------------------
+
+    def agregar_fila(self, x, y):
+        """
+        Agrega una observación con rotaciones de Givens, O(k(k+m))
+        """
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        fila = np.concatenate([np.asarray(x, dtype=float).ravel(), y])
+        F = self.factor
+        for i in range(self.k):
+            f_ii, x_i = float(F[i, i]), float(fila[i])
+            r = math.hypot(f_ii, x_i)
+            if r == 0.0:
+                continue
+            c, s = f_ii / r, x_i / r
+            Fi = F[i, i:].copy()
+            F[i, i:] *= c
+            F[i, i:] += s * fila[i:]
+            fila[i:] *= c
+            fila[i:] -= s * Fi
+        # Lo que queda de la fila es su aporte a la suma residual
+        self.rss += fila[self.k:]**2
+        self._combinar_y(1, y, np.zeros(self.m))
+        return self
+
+    def quitar_fila(self, x, y):
+        """
+        Quita una observación ya incorporada con rotaciones hiperbólicas,
+        O(k(k+m))
+
+        Lanza ValueError si sin la fila X'X deja de ser definida positiva.
+        """
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        fila = np.concatenate([np.asarray(x, dtype=float).ravel(), y])
+        F = self.factor.copy()
+        for i in range(self.k):
+            f_ii, x_i = float(F[i, i]), float(fila[i])
+            d2 = f_ii * f_ii - x_i * x_i
+            if d2 <= 0.0:
+                raise ValueError("Sin la fila, X'X no es definida positiva "
+                                 "(rango incompleto)")
+            r = math.sqrt(d2)
+            c, s = r / f_ii, x_i / f_ii
+            F[i, i:] -= s * fila[i:]
+            F[i, i:] /= c
+            fila[i:] *= c
+            fila[i:] -= s * F[i, i:]
+        self.factor = F
+        self.rss = np.maximum(self.rss - fila[self.k:]**2, 0.0)
+        self._quitar_y(1, y, np.zeros(self.m))
+        return self
+
+    def quitar(self, X, Y):
+        """
+        Quita un bloque de filas ya incorporadas (una a una)
+        """
+        X = np.asarray(X, dtype=float)
+        Y = _como_matriz(Y)
+        for x, y in zip(X, Y):
+            self.quitar_fila(x, y)
+        return self
+
+    # ----------------------------------------------------------------
+    # Estimación e inferencia
+    # ----------------------------------------------------------------
+
+    def _verificar_rango(self):
+        diagonal = np.abs(np.diag(self.R))
+        if self.n <= self.k or diagonal.min() <= 1e-12 * max(diagonal.max(), 1.0):
+            raise ValueError("X tiene rango incompleto o n ≤ k")
+
+    def coeficientes(self):
+        """
+        β̂ = R⁻¹Z, (k,) o (k, m)
+        """
+        self._verificar_rango()
+        beta = _solve_triangular(self.R, self.Z)
+        return beta[:, 0] if self.m == 1 else beta
+
+    def inversa_xtx(self):
+        """
+        (X'X)⁻¹ = R⁻¹R⁻ᵀ
+        """
+        self._verificar_rango()
+        R_inv = _solve_triangular(self.R, np.eye(self.k))
+        return R_inv @ R_inv.T
+
+    def covarianza(self):
+        """
+        Covarianza de β̂ bajo homocedasticidad: σ̂²(X'X)⁻¹, (k, k) o (m, k, k)
+        """
+        sigma2 = self.rss / (self.n - self.k)
+        V = sigma2[:, None, None] * self.inversa_xtx()
+        return V[0] if self.m == 1 else V
+
+    def ajustar(self, nivel=0.95):
+        """
+        Coeficientes e inferencia clásica
+
+        El F global y el R² suponen que X incluye una constante.
+
+        Retorna:
+        --------
+        resultado : ResultadoMCO
+            coeficientes, errores_estandar, t, p_valores: (k,) o (k, m);
+            ic: (k, 2) o (k, m, 2) al ``nivel`` dado; sigma2, rss, r2, f y
+            p_valor_f: escalares o (m,); gl = n - k; n
+        """
+        from scipy import stats
+
+        self._verificar_rango()
+        k, n = self.k, self.n
+        gl = n - k
+
+        beta = _solve_triangular(self.R, self.Z)
+        R_inv = _solve_triangular(self.R, np.eye(k))
+        diag_inv = np.sum(R_inv**2, axis=1)
+
+        sigma2 = self.rss / gl
+        se = np.sqrt(np.outer(diag_inv, sigma2))
+        t, p, ic = inferencia_t(beta, se, gl, nivel)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r2 = 1 - self.rss / self.m2_y
+            f = (r2 / (k - 1)) / ((1 - r2) / gl) if k > 1 else np.full(self.m, np.nan)
+        p_f = stats.f.sf(f, k - 1, gl) if k > 1 else np.full(self.m, np.nan)
+
+        if self.m == 1:
+            beta, se, t, p, ic = beta[:, 0], se[:, 0], t[:, 0], p[:, 0], ic[:, 0]
+            sigma2, rss, r2, f, p_f = (float(sigma2[0]), float(self.rss[0]),
+                                       float(r2[0]), float(f[0]), float(p_f[0]))
+        else:
+            rss = self.rss.copy()
+        return ResultadoMCO(beta, se, t, p, ic, sigma2, rss, r2, f, p_f, gl, n)
+
+    def prueba_f(self, restricciones, valores=None):
+        """
+        Prueba F de las restricciones lineales H0: Cβ = c
+
+        Parámetros:
+        -----------
+        restricciones : array (q, k)
+            Matriz C
+        valores : array (q,), opcional
+            Vector c (por defecto, ceros)
+
+        Retorna:
+        --------
+        f, p_valor : float o array (m,)
+        """
+        from scipy import stats
+
+        self._verificar_rango()
+        C = np.atleast_2d(np.asarray(restricciones, dtype=float))
+        q = C.shape[0]
+        c = np.zeros(q) if valores is None else np.asarray(valores, dtype=float)
+        gl = self.n - self.k
+
+        beta = _solve_triangular(self.R, self.Z)
+        # C(X'X)⁻¹C' = AA' con A = C R⁻¹ (A' = R⁻ᵀC')
+        A = _solve_triangular(self.R, C.T, trans=1).T
+        discrepancia = C @ beta - c[:, None]
+        L = np.linalg.cholesky(A @ A.T)
+        w = np.linalg.solve(L, discrepancia)
+        f = np.sum(w**2, axis=0) / q / (self.rss / gl)
+        p = stats.f.sf(f, q, gl)
+        if self.m == 1:
+            return float(f[0]), float(p[0])
+        return f, p
+
+
+def mco(X, Y, tamano_bloque=TAMANO_BLOQUE):
+    """
+    MCO de arrays grandes (p. ej. np.memmap) por bloques de filas
+
+    Retorna:
+    --------
+    acumulador : AcumuladorMCO
+    """
+    X = np.asarray(X)
+    Y = np.asarray(Y)
+    m = 1 if Y.ndim == 1 else Y.shape[1]
+    acumulador = AcumuladorMCO(X.shape[1], m)
+    for inicio in range(0, X.shape[0], tamano_bloque):
+        acumulador.actualizar(X[inicio:inicio + tamano_bloque],
+                              Y[inicio:inicio + tamano_bloque])
+    return acumulador
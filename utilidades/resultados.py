@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+RESULTADOS: CACHÉ PERSISTENTE DE CÁLCULOS EN DISCO
+==============================================================================
+Memoización en disco para las carpetas ``resultados/`` de cada capítulo.
+
+La clave de un resultado es una huella SHA-256 de:
+
+- el nombre de la función y el código fuente del módulo que la define
+  (un cambio en sus auxiliares también invalida el resultado),
+- sus argumentos (arrays por contenido; un ``np.random.Generator`` por el
+  estado de su generador de bits, es decir, por la semilla efectiva),
+- las versiones de Python, numpy y scipy, y
+- el código del paquete ``utilidades/`` (un cambio en un núcleo invalida
+  todos los resultados que dependen de él).
+
+Los resultados se guardan en ``resultados/.cache/``: en JSON si no contienen
+arrays y en ``.npz`` (estructura en JSON más un array por entrada) si los
+contienen. Se admiten escalares, cadenas, arrays, listas, tuplas, dicts y
+namedtuples (p. ej. ``ResultadoMLE``). La fecha de modificación de cada
+archivo registra el último acceso; cuando la carpeta supera
+``TAMANO_MAXIMO_CACHE`` se borran primero los menos usados (LRU).
+
+Con la variable de entorno ``ECONOMETRIA_SIN_CACHE=1`` se recalcula todo.
+
+Nota: si se sirve un resultado desde la caché, la función no se ejecuta y
+un ``Generator`` pasado como argumento no avanza. Conviene memoizar solo
+funciones que sean el último uso de ese generador o que reciban la semilla.
+"""
+
+import functools
+import hashlib
+import importlib
+import inspect
+import io
+import json
+import os
+import platform
+from pathlib import Path
+
+import numpy as np
+
+from .huellas import actualizar_huella, codigo_modulo, huella_paquete
+
+CARPETA_CACHE = '.cache'
+
+# Tamaño máximo de la caché de una carpeta resultados/ (bytes)
+TAMANO_MAXIMO_CACHE = 256 * 2**20
+
+VARIABLE_SIN_CACHE = 'ECONOMETRIA_SIN_CACHE'
+
+
+@functools.lru_cache(maxsize=1)
+def huella_entorno():
+    """
+    Versiones de las bibliotecas y huella del código de utilidades/
+    """
+    import scipy
+
+    h = hashlib.sha256()
+    h.update(f'python={platform.python_version()};numpy={np.__version__};'
+             f'scipy={scipy.__version__}'.encode())
+    h.update(huella_paquete().encode())
+    return h.hexdigest()
+
+
+def _normalizar_argumento(valor):
+    """
+    Sustituye los objetos sin representación estable por su estado
+    """
+    if isinstance(valor, np.random.Generator):
+        return {'__generador__': valor.bit_generator.state}
+    if isinstance(valor, dict):
+        return {k: _normalizar_argumento(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar_argumento(v) for v in valor]
+    return valor
+
+
+def clave_resultado(funcion, args=(), kwargs=None):
+    """
+    Huella SHA-256 de (función, argumentos, entorno)
+
+    Los argumentos se asocian a sus nombres con la firma de la función, de
+    modo que f(1, b=2) y f(a=1, b=2) comparten clave.
+    """
+    firma = inspect.signature(funcion)
+    ligados = firma.bind(*args, **(kwargs or {}))
+    ligados.apply_defaults()
+
+    h = hashlib.sha256()
+    h.update(f'{funcion.__module__}.{funcion.__qualname__}'.encode())
+    h.update(codigo_modulo(funcion).encode())
+    h.update(huella_entorno().encode())
+    actualizar_huella(h, _normalizar_argumento(dict(ligados.arguments)))
+    return h.hexdigest()
+
+
+# ------------------------------------------------------------------------------
+# Serialización
+# ------------------------------------------------------------------------------
+
+def _codificar(valor, arrays):
+    """
+    Estructura JSON de un resultado; los arrays se acumulan en ``arrays``
+    """
+    if isinstance(valor, np.ndarray):
+        if valor.dtype.hasobject:
+            raise TypeError("No se pueden guardar arrays de objetos en la caché")
+        arrays.append(valor)
+        return {'__nd__': len(arrays) - 1}
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, tuple) and hasattr(valor, '_fields'):
+        tipo = type(valor)
+        return {'__nt__': f'{tipo.__module__}:{tipo.__qualname__}',
+                'campos': [_codificar(v, arrays) for v in valor]}
+    if isinstance(valor, (list, tuple)):
+        return {'__seq__': type(valor).__name__,
+                'valores': [_codificar(v, arrays) for v in valor]}
+    if isinstance(valor, dict):
+        return {'__dict__': [[_codificar(k, arrays), _codificar(v, arrays)]
+                             for k, v in valor.items()]}
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    raise TypeError(f"Tipo no soportado por la caché de resultados: "
+                    f"{type(valor).__name__}")
+
+
+def _decodificar(estructura, arrays):
+    if isinstance(estructura, dict):
+        if '__nd__' in estructura:
+            return arrays[estructura['__nd__']]
+        if '__nt__' in estructura:
+            modulo, nombre = estructura['__nt__'].split(':')
+            tipo = importlib.import_module(modulo)
+            for parte in nombre.split('.'):
+                tipo = getattr(tipo, parte)
+            return tipo(*(_decodificar(v, arrays) for v in estructura['campos']))
+        if '__seq__' in estructura:
+            valores = [_decodificar(v, arrays) for v in estructura['valores']]
+            return tuple(valores) if estructura['__seq__'] == 'tuple' else valores
+        if '__dict__' in estructura:
+            return {_decodificar(k, arrays): _decodificar(v, arrays)
+                    for k, v in estructura['__dict__']}
+    return estructura
+
+
+def _escribir_atomico(ruta, contenido):
+    temporal = ruta.with_name(f'.{ruta.name}.tmp-{os.getpid()}')
+    temporal.write_bytes(contenido)
+    os.replace(temporal, ruta)
+
+
+# ------------------------------------------------------------------------------
+# Caché
+# ------------------------------------------------------------------------------
+
+class CacheResultados:
+    """
+    Caché de resultados en ``<carpeta>/.cache`` con expulsión LRU por tamaño
+
+    Parámetros:
+    -----------
+    carpeta : str o Path
+        Carpeta resultados/ del capítulo
+    tamano_maximo : int
+        Bytes máximos ocupados por la caché
+    """
+
+    def __init__(self, carpeta, tamano_maximo=TAMANO_MAXIMO_CACHE):
+        self.carpeta = Path(carpeta) / CARPETA_CACHE
+        self.tamano_maximo = tamano_maximo
+
+    def _rutas(self, clave):
+        return [self.carpeta / f'{clave}.json', self.carpeta / f'{clave}.npz']
+
+    def obtener(self, clave):
+        """
+        Retorna (encontrado, valor)
+        """
+        for ruta in self._rutas(clave):
+            try:
+                if ruta.suffix == '.json':
+                    valor = _decodificar(json.loads(ruta.read_text(encoding='utf-8')), [])
+                else:
+                    with np.load(ruta, allow_pickle=False) as z:
+                        estructura = json.loads(str(z['estructura']))
+                        arrays = [z[f'a{i}'] for i in range(len(z.files) - 1)]
+                    valor = _decodificar(estructura, arrays)
+            except (OSError, ValueError, KeyError):
+                continue
+            # Registrar el acceso para la política LRU
+            os.utime(ruta)
+            return True, valor
+        return False, None
+
+    def guardar(self, clave, valor):
+        """
+        Guarda un resultado y aplica la política de expulsión
+        """
+        arrays = []
+        estructura = json.dumps(_codificar(valor, arrays))
+        self.carpeta.mkdir(parents=True, exist_ok=True)
+
+        if arrays:
+            buffer = io.BytesIO()
+            np.savez(buffer, estructura=np.array(estructura),
+                     **{f'a{i}': a for i, a in enumerate(arrays)})
+            _escribir_atomico(self.carpeta / f'{clave}.npz', buffer.getvalue())
+        else:
+            _escribir_atomico(self.carpeta / f'{clave}.json', estructura.encode())
+
+        self.expulsar()
+
+    def entradas(self):
+        """
+        Lista de (ruta, tamaño, último acceso), de la más antigua a la más reciente
+        """
+        if not self.carpeta.is_dir():
+            return []
+        filas = []
+        for ruta in self.carpeta.iterdir():
+            if ruta.suffix not in ('.json', '.npz') or ruta.name.startswith('.'):
+                continue
+            try:
+                info = ruta.stat()
+            except OSError:
+                continue
+            filas.append((ruta, info.st_size, info.st_mtime))
+        return sorted(filas, key=lambda fila: fila[2])
+
+    def tamano(self):
+        """
+        Bytes ocupados por la caché
+        """
+        return sum(tam for _, tam, _ in self.entradas())
+
+    def expulsar(self):
+        """
+        Borra las entradas menos usadas hasta respetar tamano_maximo
+
+        Retorna:
+        --------
+        borradas : int
+            Número de entradas borradas
+        """
+        entradas = self.entradas()
+        total = sum(tam for _, tam, _ in entradas)
+        borradas = 0
+        for ruta, tam, _ in entradas:
+            if total <= self.tamano_maximo:
+                break
+            ruta.unlink(missing_ok=True)
+            total -= tam
+            borradas += 1
+        return borradas
+
+    def limpiar(self):
+        """
+        Borra todas las entradas
+        """
+        for ruta, _, _ in self.entradas():
+            ruta.unlink(missing_ok=True)
+
+
+def en_cache(carpeta, tamano_maximo=TAMANO_MAXIMO_CACHE):
+    """
+    Decorador: memoiza en disco una función pura (o de semilla fija)
+
+    Uso:
+    ----
+    >>> RESULTADOS = Path(__file__).resolve().parents[1] / 'resultados'
+    >>> @en_cache(RESULTADOS)
+    ... def ajustar(datos, semilla): ...
+    >>> superficie = en_cache(RESULTADOS)(superficie_potencia)
+
+    La función decorada conserva la firma y expone ``.cache`` y
+    ``.ultimo_acierto`` (True si la última llamada se sirvió de la caché).
+    """
+    cache = CacheResultados(carpeta, tamano_maximo)
+
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if os.environ.get(VARIABLE_SIN_CACHE, '') not in ('', '0'):
+                envoltura.ultimo_acierto = False
+                return funcion(*args, **kwargs)
+
+            clave = clave_resultado(funcion, args, kwargs)
+            encontrado, valor = cache.obtener(clave)
+            envoltura.ultimo_acierto = encontrado
+            if not encontrado:
+                valor = funcion(*args, **kwargs)
+                cache.guardar(clave, valor)
+            return valor
+
+        envoltura.cache = cache
+        envoltura.ultimo_acierto = False
+        return envoltura
+
+    return decorador
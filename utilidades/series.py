@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+SERIES TEMPORALES: ACF/PACF, VEROSIMILITUD ARIMA Y BÚSQUEDA DE ÓRDENES
+==============================================================================
+Núcleos para ajustar modelos ARIMA a miles de series.
+
+- La ACF se calcula con FFT (O(n log n) para todos los rezagos) y la PACF
+  con la recursión de Durbin-Levinson; ambas admiten muchas series a la
+  vez (series en la última dimensión).
+
+- La verosimilitud exacta usa el filtro de Kalman sobre la representación
+  de Harvey del ARMA. La covarianza Pₜ no depende de los datos y converge
+  al estado estacionario RR' en pocos pasos; a partir de ahí el filtro es
+  la recursión de innovaciones θ(L)vₜ = φ(L)yₜ, que se evalúa con
+  scipy.signal.lfilter (en C) partiendo del estado del filtro. El tramo
+  inicial se compila con numba si está instalado.
+
+- La búsqueda de órdenes elige d con la prueba KPSS, compara los (p, q)
+  candidatos por AIC/BIC con suma de cuadrados condicional (como la
+  aproximación de auto.arima) y reajusta el elegido por máxima
+  verosimilitud exacta. Las series se reparten entre procesos.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from .covarianza import pesos_nucleo
+from .paralelo import mapear_procesos, numero_trabajadores
+
+TOLERANCIA_KALMAN = 1e-9
+LIMITE_LIBRE = 7.0         # |u| ≤ 7: autocorrelaciones parciales |r| < 0.999998
+CRITICO_KPSS = 0.463       # Valor crítico al 5% (estacionariedad en nivel)
+TAREAS_POR_TRABAJADOR = 4
+CRITERIOS = ('aic', 'bic')
+
+ResultadoARIMA = namedtuple(
+    'ResultadoARIMA',
+    ['orden', 'phi', 'theta', 'media', 'sigma2', 'loglik', 'aic', 'bic', 'n'])
+
+
+# ==============================================================
+# ACF Y PACF
+# ==============================================================
+
+def autocovarianzas(x, rezagos):
+    """
+    Autocovarianzas muestrales γ̂₀..γ̂_L con FFT (divisor n)
+
+    Parámetros:
+    -----------
+    x : array (..., n)
+        Una o muchas series en la última dimensión
+    rezagos : int
+        Rezago máximo L
+
+    Retorna:
+    --------
+    gamma : array (..., L + 1)
+    """
+    x = np.asarray(x, dtype=float)
+    n = x.shape[-1]
+    centrada = x - x.mean(axis=-1, keepdims=True)
+    tamano = 1 << int(np.ceil(np.log2(2 * n - 1)))
+    espectro = np.fft.rfft(centrada, n=tamano, axis=-1)
+    gamma = np.fft.irfft(espectro.real**2 + espectro.imag**2, n=tamano, axis=-1)
+    return gamma[..., :rezagos + 1] / n
+
+
+def acf(x, rezagos):
+    """
+    Autocorrelaciones ρ̂₀..ρ̂_L, (..., L + 1)
+    """
+    gamma = autocovarianzas(x, rezagos)
+    return gamma / gamma[..., :1]
+
+
+def pacf_desde_acf(rho):
+    """
+    Autocorrelaciones parciales por Durbin-Levinson
+
+    Parámetros:
+    -----------
+    rho : array (..., L + 1)
+        Autocorrelaciones con ρ₀ = 1
+
+    Retorna:
+    --------
+    pac : array (..., L + 1)
+        pac[..., 0] = 1 y pac[..., k] = φₖₖ
+    """
+    rho = np.asarray(rho, dtype=float)
+    L = rho.shape[-1] - 1
+    pac = np.ones_like(rho)
+    phi = np.zeros(rho.shape[:-1] + (L + 1,))
+    varianza = np.ones(rho.shape[:-1])
+    for k in range(1, L + 1):
+        # φₖₖ = (ρₖ - Σⱼ φₖ₋₁,ⱼ ρₖ₋ⱼ) / vₖ₋₁
+        phi_kk = (rho[..., k] - np.sum(phi[..., 1:k] * rho[..., k - 1:0:-1], axis=-1)) / varianza
+        phi[..., 1:k] -= phi_kk[..., None] * phi[..., k - 1:0:-1]
+        phi[..., k] = phi_kk
+        pac[..., k] = phi_kk
+        varianza = varianza * (1 - phi_kk**2)
+    return pac
+
+
+def pacf(x, rezagos):
+    """
+    Autocorrelaciones parciales muestrales, (..., L + 1)
+    """
+    return pacf_desde_acf(acf(x, rezagos))
+
+
+# ==============================================================
+# FILTRO DE KALMAN Y VEROSIMILITUD
+# ==============================================================
+
+def diferenciar(y, d):
+    """
+    Diferencia d veces (sobre la última dimensión)
+    """
+    return np.diff(y, n=d, axis=-1) if d > 0 else np.asarray(y, dtype=float)
+
+
+def _restringir(u):
+    """
+    Parámetros libres → coeficientes AR estacionarios (Monahan, 1984)
+
+    tanh lleva cada u a una autocorrelación parcial en (-1, 1) y
+    Durbin-Levinson la convierte en coeficientes φ.
+    """
+    r = np.tanh(u)
+    phi = np.zeros(r.size)
+    for k in range(r.size):
+        phi[:k] = phi[:k] - r[k] * phi[:k][::-1]
+        phi[k] = r[k]
+    return phi
+
+
+def _liberar(phi):
+    """
+    Inversa de _restringir (valores iniciales)
+    """
+    phi = np.array(phi, dtype=float)
+    u = np.zeros(phi.size)
+    for k in range(phi.size - 1, -1, -1):
+        r = phi[k]
+        u[k] = np.arctanh(np.clip(r, -1 + 1e-8, 1 - 1e-8))
+        if k:
+            phi[:k] = (phi[:k] + r * phi[:k][::-1]) / (1 - r**2)
+    return u
+
+
+def espacio_estados(phi, theta):
+    """
+    Matrices de la forma de Harvey: αₜ₊₁ = Tαₜ + Rεₜ₊₁, yₜ = αₜ[0]
+
+    Retorna:
+    --------
+    T : array (r, r), r = max(p, q + 1)
+    R : array (r,)
+    P0 : array (r, r)
+        Covarianza estacionaria del estado (σ² = 1)
+    """
+    p, q = len(phi), len(theta)
+    r = max(p, q + 1)
+    T = np.zeros((r, r))
+    T[:p, 0] = phi
+    T[:-1, 1:] = np.eye(r - 1)
+    R = np.zeros(r)
+    R[0] = 1.0
+    R[1:q + 1] = theta
+    # vec(P0) = (I - T ⊗ T)⁻¹ vec(RR')
+    P0 = np.linalg.solve(np.eye(r * r) - np.kron(T, T), np.outer(R, R).ravel())
+    return T, R, P0.reshape(r, r)
+
+
+def _filtro_kalman(T, Tt, RRt, y, P, tolerancia):
+    """
+    Filtro de Kalman hasta que Pₜ alcanza el estado estacionario RR'
+
+    Escrito con operaciones que numba puede compilar.
+
+    Retorna:
+    --------
+    v, F : array (n,)
+        Innovaciones y sus varianzas (válidas hasta ``pasos``)
+    pasos : int
+        Pasos filtrados (n si no hubo convergencia)
+    a : array (r,)
+        Estado predicho en ``pasos``
+    """
+    n = y.shape[0]
+    a = np.zeros(T.shape[0])
+    v = np.empty(n)
+    F = np.empty(n)
+    for t in range(n):
+        F_t = P[0, 0]
+        v_t = y[t] - a[0]
+        v[t] = v_t
+        F[t] = F_t
+        TP = np.dot(T, P)
+        K = TP[:, 0] / F_t
+        a = np.dot(T, a) + K * v_t
+        P = np.dot(TP, Tt) + RRt - np.outer(K, K) * F_t
+        if np.max(np.abs(P - RRt)) < tolerancia:
+            return v, F, t + 1, a
+    return v, F, n, a
+
+
+@lru_cache(maxsize=None)
+def nucleo_kalman(compilar=True):
+    """
+    _filtro_kalman compilado con numba si está disponible
+    """
+    if compilar:
+        try:
+            import numba
+        except ImportError:
+            return _filtro_kalman
+        return numba.njit(cache=True)(_filtro_kalman)
+    return _filtro_kalman
+
+
+def innovaciones(y, phi, theta, tolerancia=TOLERANCIA_KALMAN, compilar=True):
+    """
+    Innovaciones vₜ y varianzas relativas Fₜ del ARMA (σ² = 1)
+
+    Retorna:
+    --------
+    v, F : array (n,)
+    """
+    from scipy.signal import lfilter
+
+    y = np.asarray(y, dtype=float)
+    T, R, P0 = espacio_estados(phi, theta)
+    v, F, pasos, a = nucleo_kalman(compilar)(T, np.ascontiguousarray(T.T),
+                                             np.outer(R, R), y, P0, tolerancia)
+    if pasos < y.size:
+        # Estado estacionario: θ(L)vₜ = φ(L)yₜ; el estado de lfilter
+        # (forma directa II transpuesta) es -aₜ
+        r = T.shape[0]
+        b = np.zeros(r + 1)
+        b[0] = 1.0
+        b[1:len(phi) + 1] = -np.asarray(phi)
+        c = np.zeros(r + 1)
+        c[:r] = R
+        v[pasos:] = lfilter(b, c, y[pasos:], zi=-a)[0]
+        F[pasos:] = 1.0
+    return v, F
+
+
+def loglik_exacta(y, phi, theta, tolerancia=TOLERANCIA_KALMAN, compilar=True):
+    """
+    Log-verosimilitud exacta del ARMA con σ² concentrada
+
+    ℓ = -n/2 [log(2πσ̂²) + 1] - ½ Σ log Fₜ, σ̂² = Σ vₜ²/Fₜ / n
+
+    Retorna:
+    --------
+    loglik, sigma2 : float
+    """
+    v, F = innovaciones(y, phi, theta, tolerancia, compilar)
+    n = v.size
+    sigma2 = float(np.sum(v**2 / F)) / n
+    loglik = -0.5 * n * (np.log(2 * np.pi * sigma2) + 1) - 0.5 * np.sum(np.log(F))
+    return float(loglik), sigma2
+
+
+def loglik_css(y, phi, theta, condicion=None):
+    """
+    Log-verosimilitud por suma de cuadrados condicional (CSS)
+
+    Condiciona en las primeras ``condicion`` observaciones (por defecto p)
+    e inicia las innovaciones pasadas en cero; todo el cálculo es un
+    lfilter. Para comparar órdenes distintos, ``condicion`` debe ser la
+    misma en todos (el p máximo).
+
+    Retorna:
+    --------
+    loglik, sigma2 : float
+    """
+    from scipy.signal import lfilter
+
+    p = len(phi)
+    condicion = p if condicion is None else max(condicion, p)
+    e = lfilter(np.concatenate([[1.0], -np.asarray(phi)]),
+                np.concatenate([[1.0], np.asarray(theta)]), y)[condicion:]
+    n = e.size
+    sigma2 = float(e @ e) / n
+    return float(-0.5 * n * (np.log(2 * np.pi * sigma2) + 1)), sigma2
+
+
+# ==============================================================
+# AJUSTE
+# ==============================================================
+
+def ajustar_arima(y, orden, metodo='exacto', inicio=None, condicion=None,
+                  compilar=True):
+    """
+    ARIMA(p, d, q) por máxima verosimilitud (exacta o CSS)
+
+    Los coeficientes se optimizan en un espacio libre que garantiza
+    estacionariedad e invertibilidad. Con d = 0 la media se estima con
+    la media muestral.
+
+    Parámetros:
+    -----------
+    y : array (n,)
+    orden : tuple (p, d, q)
+    metodo : str
+        'exacto' (Kalman) o 'css'
+    inicio : tuple (phi, theta), opcional
+        Valores iniciales (p. ej. la estimación CSS)
+    condicion : int, opcional
+        Observaciones iniciales descartadas por CSS (ver loglik_css)
+
+    Retorna:
+    --------
+    resultado : ResultadoARIMA
+    """
+    from scipy.optimize import minimize
+
+    p, d, q = orden
+    x = diferenciar(np.asarray(y, dtype=float), d)
+    media = float(x.mean()) if d == 0 else 0.0
+    x = x - media
+
+    if metodo == 'exacto':
+        def loglik(phi, theta):
+            return loglik_exacta(x, phi, theta, compilar=compilar)
+    elif metodo == 'css':
+        def loglik(phi, theta):
+            return loglik_css(x, phi, theta, condicion)
+    else:
+        raise ValueError(f"Método no soportado: {metodo!r}")
+
+    def separar(u):
+        return _restringir(u[:p]), -_restringir(u[p:])
+
+    def objetivo(u):
+        # Cerca de una raíz unitaria P0 puede perder la definición positiva
+        with np.errstate(all='ignore'):
+            valor = -loglik(*separar(u))[0]
+        return valor if np.isfinite(valor) else np.inf
+
+    if p + q:
+        u0 = (np.zeros(p + q) if inicio is None
+              else np.concatenate([_liberar(inicio[0]), _liberar(-np.asarray(inicio[1]))]))
+        u0 = np.clip(u0, -LIMITE_LIBRE, LIMITE_LIBRE)
+        with np.errstate(invalid='ignore'):
+            u = minimize(objetivo, u0, method='L-BFGS-B',
+                         bounds=[(-LIMITE_LIBRE, LIMITE_LIBRE)] * (p + q)).x
+    else:
+        u = np.zeros(0)
+    phi, theta = separar(u)
+    ll, sigma2 = loglik(phi, theta)
+
+    n = x.size if metodo == 'exacto' else x.size - max(p, condicion or 0)
+    k = p + q + 1 + (d == 0)
+    return ResultadoARIMA((p, d, q), phi, theta, media, sigma2, ll,
+                          -2 * ll + 2 * k, -2 * ll + k * float(np.log(n)), n)
+
+
+# ==============================================================
+# SELECCIÓN DE ÓRDENES
+# ==============================================================
+
+def rezagos_automaticos(e):
+    """
+    Ancho de banda de Bartlett de Newey y West (1994), como en la KPSS de
+    Hobijn, Franses y Ooms (2004)
+
+    Con ventanas fijas cortas la KPSS rechaza de más en series
+    estacionarias pero persistentes.
+    """
+    n = e.size
+    m = int(4 * (n / 100)**(2 / 9))
+    gamma = autocovarianzas(e, m)
+    s0 = gamma[0] + 2 * np.sum(gamma[1:])
+    s1 = 2 * np.sum(np.arange(1, m + 1) * gamma[1:])
+    return int(min(1.1447 * ((s1 / s0)**2)**(1 / 3) * n**(1 / 3), n - 1))
+
+
+def kpss(y, rezagos=None):
+    """
+    Estadístico KPSS de estacionariedad en nivel
+
+    η = Σ Sₜ² / (n² σ̂²_LP), con σ̂²_LP la varianza de largo plazo de
+    Newey-West calculada desde las autocovarianzas por FFT
+
+    Parámetros:
+    -----------
+    y : array (n,)
+    rezagos : int, opcional
+        Ancho de banda (por defecto, rezagos_automaticos)
+
+    Retorna:
+    --------
+    eta : float
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.size
+    e = y - y.mean()
+    if rezagos is None:
+        rezagos = rezagos_automaticos(e)
+    gamma = autocovarianzas(e, rezagos)
+    varianza_lp = gamma[0] + 2 * np.sum(pesos_nucleo(rezagos) * gamma[1:])
+    return float(np.sum(np.cumsum(e)**2) / (n**2 * varianza_lp))
+
+
+def orden_integracion(y, d_max=2, critico=CRITICO_KPSS):
+    """
+    Menor d ≤ d_max para el que KPSS no rechaza la estacionariedad
+    """
+    x = np.asarray(y, dtype=float)
+    for d in range(d_max):
+        if kpss(x) < critico:
+            return d
+        x = np.diff(x)
+    return d_max
+
+
+def buscar_orden(y, p_max=3, q_max=3, d=None, d_max=2, criterio='bic',
+                 aproximar=True, compilar=True):
+    """
+    Selección de (p, d, q) para una serie
+
+    Parámetros:
+    -----------
+    y : array (n,)
+    p_max, q_max : int
+        Órdenes máximos de la rejilla
+    d : int, opcional
+        Orden de integración; por defecto se elige con KPSS
+    criterio : str
+        'bic' (por defecto) o 'aic'; con la rejilla completa el AIC tiende
+        a elegir modelos ARMA sobreparametrizados con raíces casi comunes
+    aproximar : bool
+        Comparar los candidatos por CSS y reajustar solo el elegido por
+        verosimilitud exacta (si False, todos se ajustan por Kalman)
+
+    Retorna:
+    --------
+    resultado : ResultadoARIMA
+        Modelo elegido, ajustado por máxima verosimilitud exacta
+    """
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Criterio no soportado: {criterio!r}. Opciones: {CRITERIOS}")
+    if d is None:
+        d = orden_integracion(y, d_max)
+    metodo = 'css' if aproximar else 'exacto'
+
+    mejor = None
+    for p in range(p_max + 1):
+        for q in range(q_max + 1):
+            resultado = ajustar_arima(y, (p, d, q), metodo, condicion=p_max,
+                                      compilar=compilar)
+            if mejor is None or getattr(resultado, criterio) < getattr(mejor, criterio):
+                mejor = resultado
+    if aproximar:
+        mejor = ajustar_arima(y, mejor.orden, 'exacto', (mejor.phi, mejor.theta),
+                              compilar=compilar)
+    return mejor
+
+
+def _tarea_busqueda(tarea):
+    """
+    Búsqueda de órdenes de un lote de series (nivel de módulo para pickle)
+    """
+    series, opciones = tarea
+    return [buscar_orden(y, **opciones) for y in series]
+
+
+def buscar_ordenes(series, trabajadores=None, **opciones):
+    """
+    buscar_orden para muchas series, repartidas entre procesos
+
+    Parámetros:
+    -----------
+    series : array (m, n) o lista de arrays
+        Series (pueden tener longitudes distintas si es una lista)
+    trabajadores : int, opcional
+        Procesos (por defecto, todos los núcleos)
+    **opciones
+        Argumentos de buscar_orden (p_max, q_max, d, criterio, ...)
+
+    Retorna:
+    --------
+    resultados : list de ResultadoARIMA
+        En el mismo orden que ``series``
+    """
+    series = list(series)
+    trabajadores = numero_trabajadores(trabajadores, len(series))
+    lotes = np.array_split(np.arange(len(series)),
+                           min(len(series), trabajadores * TAREAS_POR_TRABAJADOR))
+    tareas = [([series[i] for i in lote], opciones) for lote in lotes if lote.size]
+    resultados = mapear_procesos(_tarea_busqueda, tareas, trabajadores)
+    return [r for lote in resultados for r in lote]
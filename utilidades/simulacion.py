@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+SIMULACIÓN MONTE CARLO: TEOREMA CENTRAL DEL LÍMITE
+==============================================================================
+Motor vectorizado por bloques para generar medias muestrales estandarizadas.
+
+En lugar de llamar al generador una vez por réplica, se extrae un bloque
+(filas, n) en una sola llamada y se reduce a lo largo del eje 1. El tamaño
+del bloque (``chunk_size``) acota la memoria: a lo sumo chunk_size·n valores
+viven a la vez, sin importar el número total de réplicas m.
+
+Para varios núcleos, ``simular_tcl_paralelo`` reparte tareas
+(distribución × bloque de réplicas) en un pool de procesos. Cada tarea usa
+su propio hijo de ``np.random.SeedSequence``, por lo que el resultado es
+idéntico bit a bit con cualquier número de trabajadores.
+"""
+
+import time
+
+import numpy as np
+
+from .aleatorio import generador_desde_semilla
+from .paralelo import mapear_procesos, numero_trabajadores
+
+# Número máximo de valores por bloque cuando no se indica chunk_size
+# (2**22 valores float64 = 32 MB)
+MAX_VALORES_BLOQUE = 2**22
+
+# Réplicas por tarea en la ejecución paralela. La partición en tareas no
+# depende del número de trabajadores, lo que garantiza la reproducibilidad.
+REPLICAS_POR_TAREA = 50_000
+
+# Distribuciones del TCL: (nombre, método de np.random.Generator, parámetros)
+DISTRIBUCIONES_TCL = [
+    ("Uniforme(0,1)", "uniform", {'low': 0, 'high': 1}),
+    ("Exponencial(1)", "exponential", {}),
+    ("Binomial(10, 0.5)", "binomial", {'n': 10, 'p': 0.5}),
+    ("Chi-cuadrado(5)", "chisquare", {'df': 5}),
+]
+
+
+def momentos_teoricos(dist_func, params):
+    """
+    Media y desviación estándar poblacionales de la distribución simulada
+
+    Parámetros:
+    -----------
+    dist_func : función
+        Método de distribución de np.random.Generator (uniform,
+        exponential, binomial o chisquare)
+    params : dict
+        Parámetros de la distribución
+
+    Retorna:
+    --------
+    mu, sigma : float
+        Media y desviación estándar teóricas
+    """
+    nombre = getattr(dist_func, '__name__', '')
+
+    if nombre == 'uniform':
+        low = params.get('low', 0.0)
+        high = params.get('high', 1.0)
+        mu = (low + high) / 2
+        sigma = (high - low) / np.sqrt(12)
+    elif nombre == 'exponential':
+        mu = params.get('scale', 1.0)
+        sigma = mu
+    elif nombre == 'binomial':
+        mu = params['n'] * params['p']
+        sigma = np.sqrt(mu * (1 - params['p']))
+    elif nombre == 'chisquare':
+        mu = params['df']
+        sigma = np.sqrt(2 * params['df'])
+    else:
+        raise ValueError(f"Distribución no soportada: {nombre!r}")
+
+    return mu, sigma
+
+
+def tamano_bloque(n, m, chunk_size=None):
+    """
+    Número de réplicas por bloque, acotado por MAX_VALORES_BLOQUE
+    """
+    if chunk_size is None:
+        chunk_size = max(1, MAX_VALORES_BLOQUE // max(n, 1))
+    if chunk_size < 1:
+        raise ValueError("chunk_size debe ser un entero positivo")
+    return int(min(chunk_size, m))
+
+
+def medias_muestrales_bucle(dist_func, params, n, m):
+    """
+    Medias muestrales con una llamada al generador por réplica (referencia)
+    """
+    return np.array([np.mean(dist_func(size=n, **params)) for _ in range(m)])
+
+
+def medias_muestrales(dist_func, params, n, m, chunk_size=None):
+    """
+    Medias muestrales de m réplicas de tamaño n, extraídas por bloques
+
+    Parámetros:
+    -----------
+    dist_func : función
+        Función de distribución que acepta ``size`` como tupla
+    params : dict
+        Parámetros de la distribución
+    n : int
+        Tamaño de muestra
+    m : int
+        Número de réplicas
+    chunk_size : int, opcional
+        Réplicas por bloque. Por defecto se elige para que cada bloque
+        tenga a lo sumo MAX_VALORES_BLOQUE valores.
+
+    Retorna:
+    --------
+    medias : array (m,)
+        Media de cada réplica
+
+    Notas:
+    ------
+    Los bloques se extraen en orden fila por fila, de modo que con la misma
+    semilla se consumen los mismos números que el bucle de referencia.
+    """
+    filas = tamano_bloque(n, m, chunk_size)
+    medias = np.empty(m)
+
+    for inicio in range(0, m, filas):
+        fin = min(inicio + filas, m)
+        bloque = dist_func(size=(fin - inicio, n), **params)
+        np.mean(bloque, axis=1, out=medias[inicio:fin])
+
+    return medias
+
+
+def estandarizar_tcl(medias, n, mu, sigma):
+    """
+    Estadístico Z = √n (X̄ - μ) / σ según el TCL
+    """
+    return np.sqrt(n) * (medias - mu) / sigma
+
+
+def simular_tcl(dist_func, params, n, m, chunk_size=None, medias=None):
+    """
+    Simula el Teorema Central del Límite para una distribución dada
+
+    Parámetros:
+    -----------
+    dist_func : función
+        Método de distribución de un np.random.Generator (rng.uniform, ...)
+    params : dict
+        Parámetros de la distribución
+    n : int
+        Tamaño de muestra
+    m : int
+        Número de réplicas
+    chunk_size : int, opcional
+        Réplicas extraídas por bloque (acota la memoria a chunk_size·n)
+    medias : array (m,), opcional
+        Medias muestrales ya simuladas (p. ej. leídas de datos/simulados)
+
+    Retorna:
+    --------
+    z : array
+        Valores estandarizados según TCL
+    """
+    # Generar medias muestrales por bloques (m, n), salvo que ya existan
+    if medias is None:
+        medias = medias_muestrales(dist_func, params, n, m, chunk_size)
+    mu, sigma = momentos_teoricos(dist_func, params)
+    return estandarizar_tcl(medias, n, mu, sigma)
+
+
+def _tarea_tcl(tarea):
+    """
+    Trabajador: medias muestrales de un bloque de réplicas con su semilla
+    """
+    metodo, params, n, replicas, semilla, chunk_size = tarea
+    rng = generador_desde_semilla(semilla)
+    return medias_muestrales(getattr(rng, metodo), params, n, replicas,
+                             chunk_size)
+
+
+def medias_paralelo(n, m, semilla, distribuciones=DISTRIBUCIONES_TCL,
+                    trabajadores=None, replicas_por_tarea=REPLICAS_POR_TAREA,
+                    chunk_size=None):
+    """
+    Medias muestrales de varias distribuciones en un pool de procesos
+
+    Parámetros:
+    -----------
+    n : int
+        Tamaño de muestra
+    m : int
+        Número de réplicas por distribución
+    semilla : int
+        Semilla raíz de np.random.SeedSequence
+    distribuciones : list
+        Tuplas (nombre, método de np.random.Generator, parámetros)
+    trabajadores : int, opcional
+        Procesos del pool (por defecto ver paralelo.numero_trabajadores);
+        con 1 se ejecuta
+        en el proceso actual
+    replicas_por_tarea : int
+        Réplicas por tarea (bloque)
+    chunk_size : int, opcional
+        Réplicas por bloque dentro de cada tarea (ver medias_muestrales)
+
+    Retorna:
+    --------
+    medias : dict
+        método de np.random.Generator -> array (m,) de medias muestrales
+    """
+    # Semillas: una rama por distribución y una hoja por bloque de réplicas
+    n_tareas = -(-m // replicas_por_tarea)
+    raiz = np.random.SeedSequence(semilla)
+
+    tareas = []
+    for (_, metodo, params), rama in zip(distribuciones,
+                                         raiz.spawn(len(distribuciones))):
+        for b, hoja in enumerate(rama.spawn(n_tareas)):
+            replicas = min(replicas_por_tarea, m - b * replicas_por_tarea)
+            tareas.append((metodo, params, n, replicas, hoja, chunk_size))
+
+    bloques = mapear_procesos(_tarea_tcl, tareas, trabajadores)
+    return {metodo: np.concatenate(bloques[d * n_tareas:(d + 1) * n_tareas])
+            for d, (_, metodo, _) in enumerate(distribuciones)}
+
+
+def simular_tcl_paralelo(n, m, semilla, distribuciones=DISTRIBUCIONES_TCL,
+                         trabajadores=None, replicas_por_tarea=REPLICAS_POR_TAREA,
+                         chunk_size=None):
+    """
+    Simula el TCL para varias distribuciones en un pool de procesos
+
+    Mismos parámetros que medias_paralelo; el resultado es idéntico con
+    cualquier número de trabajadores.
+
+    Retorna:
+    --------
+    resultados : dict
+        nombre -> array z (m,) de valores estandarizados
+    """
+    medias = medias_paralelo(n, m, semilla, distribuciones, trabajadores,
+                             replicas_por_tarea, chunk_size)
+    return {nombre: simular_tcl(getattr(np.random.Generator, metodo), params, n, m,
+                                medias=medias[metodo])
+            for nombre, metodo, params in distribuciones}
+
+
+def informe_escalamiento(n, m, semilla, lista_trabajadores=None,
+                         distribuciones=DISTRIBUCIONES_TCL,
+                         replicas_por_tarea=REPLICAS_POR_TAREA):
+    """
+    Tiempo de pared de simular_tcl_paralelo frente al número de trabajadores
+
+    Retorna:
+    --------
+    filas : list of dict
+        Claves 'trabajadores', 'tiempo', 'aceleracion' y 'identico'
+        (si el resultado coincide bit a bit con el de 1 trabajador)
+    """
+    if lista_trabajadores is None:
+        maximo = numero_trabajadores()
+        lista_trabajadores = sorted({1, *(2**k for k in range(1, 7)
+                                          if 2**k <= maximo), maximo})
+
+    filas = []
+    referencia = None
+    t_base = None
+    for trabajadores in lista_trabajadores:
+        t0 = time.perf_counter()
+        resultados = simular_tcl_paralelo(n, m, semilla, distribuciones,
+                                          trabajadores, replicas_por_tarea)
+        tiempo = time.perf_counter() - t0
+
+        if referencia is None:
+            referencia, t_base = resultados, tiempo
+        identico = all(np.array_equal(referencia[k], resultados[k])
+                       for k in referencia)
+        filas.append({
+            'trabajadores': trabajadores,
+            'tiempo': tiempo,
+            'aceleracion': t_base / tiempo if tiempo > 0 else np.inf,
+            'identico': identico,
+        })
+
+    return filas
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+VEROSIMILITUD: EVALUACIÓN VECTORIZADA EN REJILLAS
+==============================================================================
+Superficies de log-verosimilitud sin bucles de Python.
+
+Para el modelo normal basta con los estadísticos suficientes (n, Σx, Σx²):
+cada celda de la rejilla cuesta O(1) y toda la superficie es una sola
+expresión con broadcasting. Para otros modelos se acepta una log-densidad
+genérica que se evalúa por bloques de observaciones.
+
+Para modelos con más de dos parámetros la rejilla no escala; ajustar_mle y
+ajustar_mle_lote maximizan la log-verosimilitud con score y Hessiana
+analíticos y obtienen los errores estándar de la inversa de la
+información observada.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from .acumulados import momentos
+
+# Número máximo de evaluaciones (observaciones × celdas) por bloque
+MAX_VALORES_BLOQUE = 2**22
+
+
+def estadisticos_suficientes_normal(datos):
+    """
+    Estadísticos suficientes del modelo normal
+
+    Retorna:
+    --------
+    n : int
+        Número de observaciones
+    media : float
+        Media muestral (Σx / n)
+    scc : float
+        Suma de cuadrados centrada Σ(x - x̄)² = Σx² - (Σx)²/n
+
+    Notas:
+    ------
+    Se guarda la suma centrada en lugar de Σx² para evitar la cancelación
+    catastrófica cuando la media es grande frente a la dispersión.
+    """
+    datos = np.asarray(datos, dtype=float)
+    n = datos.size
+    media = datos.mean()
+    scc = np.sum((datos - media)**2)
+    return n, media, scc
+
+
+def estimadores_mle(datos):
+    """
+    Estimadores MLE cerrados del modelo normal (momentos en un solo
+    recorrido de los datos)
+
+    Retorna:
+    --------
+    mu_hat, sigma_hat_sesgado, sigma_hat_insesgado : float
+    """
+    mom = momentos(datos)
+    return mom.media, mom.desviacion(ddof=0), mom.desviacion(ddof=1)
+
+
+def loglik_normal(mu, sigma, n, media, scc):
+    """
+    Log-verosimilitud normal a partir de los estadísticos suficientes
+
+    ℓ(μ, σ) = -n/2·log(2π) - n·log σ - [scc + n(x̄ - μ)²] / (2σ²)
+
+    ``mu`` y ``sigma`` pueden ser arrays con formas compatibles.
+    """
+    mu = np.asarray(mu, dtype=float)
+    sigma = np.asarray(sigma, dtype=float)
+    return (-0.5 * n * np.log(2 * np.pi) - n * np.log(sigma)
+            - (scc + n * (media - mu)**2) / (2 * sigma**2))
+
+
+def loglik_grid_normal(datos, mu_seq, sigma_seq):
+    """
+    Superficie de log-verosimilitud normal sobre una rejilla (μ, σ)
+
+    Parámetros:
+    -----------
+    datos : array
+        Observaciones
+    mu_seq : array (a,)
+        Valores de μ
+    sigma_seq : array (b,)
+        Valores de σ
+
+    Retorna:
+    --------
+    loglik : array (b, a)
+        loglik[j, i] = ℓ(mu_seq[i], sigma_seq[j]), con la misma orientación
+        que np.meshgrid(mu_seq, sigma_seq)
+    """
+    n, media, scc = estadisticos_suficientes_normal(datos)
+    mu = np.asarray(mu_seq, dtype=float)[np.newaxis, :]
+    sigma = np.asarray(sigma_seq, dtype=float)[:, np.newaxis]
+    return loglik_normal(mu, sigma, n, media, scc)
+
+
+def loglik_grid(logpdf, datos, rejillas, chunk_size=None):
+    """
+    Superficie de log-verosimilitud para una log-densidad genérica
+
+    Parámetros:
+    -----------
+    logpdf : función
+        logpdf(x, *theta) con broadcasting; recibe x de forma (c, 1) y cada
+        parámetro de forma (1, P) y devuelve un array (c, P)
+    datos : array
+        Observaciones
+    rejillas : tuple de arrays
+        Un array por parámetro, todos con la misma forma (p. ej. la salida
+        de np.meshgrid)
+    chunk_size : int, opcional
+        Observaciones por bloque. Por defecto se elige para que cada bloque
+        tenga a lo sumo MAX_VALORES_BLOQUE evaluaciones.
+
+    Retorna:
+    --------
+    loglik : array
+        Suma de logpdf sobre los datos, con la forma de las rejillas
+
+    Ejemplo:
+    --------
+    >>> MU, SIGMA = np.meshgrid(mu_seq, sigma_seq)
+    >>> loglik_grid(lambda x, m, s: stats.norm.logpdf(x, m, s),
+    ...             datos, (MU, SIGMA))
+    """
+    rejillas = [np.asarray(r, dtype=float) for r in rejillas]
+    forma = rejillas[0].shape
+    theta = [r.reshape(1, -1) for r in rejillas]
+    celdas = theta[0].shape[1]
+
+    datos = np.asarray(datos, dtype=float).ravel()
+    if chunk_size is None:
+        chunk_size = max(1, MAX_VALORES_BLOQUE // max(celdas, 1))
+
+    total = np.zeros(celdas)
+    for inicio in range(0, datos.size, chunk_size):
+        x = datos[inicio:inicio + chunk_size, np.newaxis]
+        total += np.sum(logpdf(x, *theta), axis=0)
+
+    return total.reshape(forma)
+
+
+# ==============================================================================
+# AJUSTE NUMÉRICO POR MÁXIMA VEROSIMILITUD
+# ==============================================================================
+
+ResultadoMLE = namedtuple('ResultadoMLE', ['theta', 'loglik', 'se', 'cov',
+                                           'iteraciones', 'convergio'])
+
+
+def _hessiana_numerica(score, theta, h=1e-5):
+    """
+    Hessiana por diferencias centrales del score analítico
+    """
+    theta = np.asarray(theta, dtype=float)
+    k = theta.size
+    H = np.empty((k, k))
+    for j in range(k):
+        paso = np.zeros(k)
+        paso[j] = h * max(1.0, abs(theta[j]))
+        H[:, j] = (score(theta + paso) - score(theta - paso)) / (2 * paso[j])
+    return (H + H.T) / 2
+
+
+def _covarianza(H):
+    """
+    Inversa de la información observada -H y errores estándar
+    """
+    cov = np.linalg.inv(-H)
+    se = np.sqrt(np.clip(np.diagonal(cov, axis1=-2, axis2=-1), 0, None))
+    return cov, se
+
+
+def ajustar_mle(loglik, theta0, score, hessiana=None, metodo='newton',
+                tol=1e-10, max_iter=100, gtol=None):
+    """
+    Estimador de máxima verosimilitud para una log-verosimilitud arbitraria
+
+    Parámetros:
+    -----------
+    loglik : función
+        loglik(theta) -> float; debe devolver -inf fuera del espacio
+        paramétrico
+    theta0 : array (k,)
+        Valor inicial
+    score : función
+        Gradiente analítico score(theta) -> array (k,)
+    hessiana : función, opcional
+        Hessiana analítica hessiana(theta) -> array (k, k). Si falta se
+        aproxima por diferencias del score.
+    metodo : str
+        'newton' (Newton-Raphson con reducción del paso) o 'bfgs'
+        (scipy.optimize con el score analítico)
+    tol : float
+        Tolerancia relativa sobre la norma del paso (newton)
+    max_iter : int
+        Máximo de iteraciones
+    gtol : float, opcional
+        Tolerancia sobre la norma infinito del score (bfgs). Por defecto
+        1e-6·max(1, |ℓ(θ₀)|): una tolerancia absoluta más estricta no se
+        alcanza en aritmética de punto flotante y scipy termina con
+        "precision loss" aun estando en el óptimo.
+
+    Retorna:
+    --------
+    ResultadoMLE
+        theta, loglik, se y cov (inversa de la información observada en el
+        óptimo), iteraciones y convergio
+    """
+    if hessiana is None:
+        hessiana = lambda th: _hessiana_numerica(score, th)
+
+    theta = np.asarray(theta0, dtype=float).copy()
+
+    if metodo == 'newton':
+        valor = loglik(theta)
+        convergio = False
+        for iteracion in range(1, max_iter + 1):
+            g = score(theta)
+            H = hessiana(theta)
+            try:
+                paso = np.linalg.solve(H, -g)
+            except np.linalg.LinAlgError:
+                paso = g
+            # Si H no es definida negativa, ascenso por gradiente
+            if g @ paso <= 0:
+                paso = g
+
+            # Reducción del paso hasta que la log-verosimilitud no empeore
+            t = 1.0
+            while t > 1e-12:
+                candidato = theta + t * paso
+                valor_c = loglik(candidato)
+                if np.isfinite(valor_c) and valor_c >= valor - 1e-12 * abs(valor):
+                    break
+                t /= 2
+            else:
+                # Ningún candidato aceptable: se conserva θ y no hay convergencia
+                break
+            theta, valor = candidato, valor_c
+
+            if np.linalg.norm(t * paso) <= tol * (1 + np.linalg.norm(theta)):
+                convergio = True
+                break
+    elif metodo == 'bfgs':
+        from scipy.optimize import minimize
+
+        if gtol is None:
+            gtol = 1e-6 * max(1.0, abs(float(loglik(theta))))
+        res = minimize(lambda th: -loglik(th), theta,
+                       jac=lambda th: -score(th), method='BFGS',
+                       options={'gtol': gtol, 'maxiter': max_iter})
+        theta, valor = res.x, -res.fun
+        # La convergencia se juzga por el gradiente, no por el mensaje de scipy
+        iteracion = res.nit
+        convergio = bool(np.all(np.isfinite(theta))
+                         and np.abs(score(theta)).max() <= gtol)
+    else:
+        raise ValueError(f"Método no soportado: {metodo!r}")
+
+    cov, se = _covarianza(hessiana(theta))
+    return ResultadoMLE(theta, valor, se, cov, iteracion, convergio)
+
+
+def ajustar_mle_lote(loglik, theta0, score, hessiana, tol=1e-10, max_iter=100):
+    """
+    Newton-Raphson vectorizado para B modelos a la vez
+
+    Las funciones reciben theta de forma (B, k) y devuelven loglik (B,),
+    score (B, k) y hessiana (B, k, k). Cada modelo reduce su propio paso y
+    se congela cuando converge, de modo que ajustar miles de modelos cuesta
+    unas pocas resoluciones batched de sistemas k×k.
+
+    Retorna:
+    --------
+    ResultadoMLE
+        Con theta, se (B, k), cov (B, k, k), loglik (B,), iteraciones y
+        convergio (B,) por modelo. Un modelo cuya reducción del paso se
+        agota conserva su θ anterior, se congela y queda con
+        convergio = False.
+    """
+    theta = np.array(theta0, dtype=float)
+    B = theta.shape[0]
+    valor = loglik(theta)
+    activo = np.ones(B, dtype=bool)
+    fallido = np.zeros(B, dtype=bool)
+    iteracion = 0
+
+    while activo.any() and iteracion < max_iter:
+        iteracion += 1
+        g = score(theta)
+        H = hessiana(theta)
+        paso = np.linalg.solve(H, -g[..., np.newaxis])[..., 0]
+        ascenso = np.einsum('bk,bk->b', g, paso) > 0
+        paso = np.where(ascenso[:, np.newaxis], paso, g)
+        paso[~activo] = 0.0
+
+        t = np.ones(B)
+        pendiente = activo.copy()
+        candidato = theta.copy()
+        valor_c = valor.copy()
+        while pendiente.any() and t[pendiente].max() > 1e-12:
+            candidato[pendiente] = theta[pendiente] + t[pendiente, np.newaxis] * paso[pendiente]
+            valor_c[pendiente] = loglik(candidato)[pendiente]
+            acepta = np.isfinite(valor_c) & (valor_c >= valor - 1e-12 * np.abs(valor))
+            pendiente &= ~acepta
+            t[pendiente] /= 2
+
+        # Sin candidato aceptable: se conserva θ y el modelo se da por fallido
+        candidato[pendiente] = theta[pendiente]
+        valor_c[pendiente] = valor[pendiente]
+        fallido |= pendiente
+        activo &= ~pendiente
+
+        theta, valor = candidato, valor_c
+        norma = np.linalg.norm(t[:, np.newaxis] * paso, axis=1)
+        activo &= norma > tol * (1 + np.linalg.norm(theta, axis=1))
+
+    cov, se = _covarianza(hessiana(theta))
+    return ResultadoMLE(theta, valor, se, cov, iteracion, ~activo & ~fallido)
+
+
+def modelo_normal(datos):
+    """
+    Log-verosimilitud normal en θ = (μ, σ) con score y Hessiana analíticos
+
+    Se evalúa en O(1) por llamada a partir de los estadísticos suficientes.
+    ``datos`` puede ser un vector (n,) o una matriz (B, n) con un conjunto
+    de datos por fila; en el segundo caso θ tiene forma (B, 2) y las
+    funciones sirven para ajustar_mle_lote.
+
+    Retorna:
+    --------
+    loglik, score, hessiana : funciones de θ
+    """
+    datos = np.asarray(datos, dtype=float)
+    n = datos.shape[-1]
+    media = datos.mean(axis=-1)
+    scc = np.sum((datos - media[..., np.newaxis])**2, axis=-1)
+
+    def _partes(theta):
+        theta = np.asarray(theta, dtype=float)
+        mu, sigma = theta[..., 0], theta[..., 1]
+        d = media - mu
+        q = scc + n * d**2
+        return mu, sigma, d, q
+
+    def loglik(theta):
+        mu, sigma, d, q = _partes(theta)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            valor = loglik_normal(mu, sigma, n, media, scc)
+        return np.where(sigma > 0, valor, -np.inf)
+
+    def score(theta):
+        mu, sigma, d, q = _partes(theta)
+        return np.stack([n * d / sigma**2,
+                         -n / sigma + q / sigma**3], axis=-1)
+
+    def hessiana(theta):
+        mu, sigma, d, q = _partes(theta)
+        h_mm = -n / sigma**2 * np.ones_like(d)
+        h_ms = -2 * n * d / sigma**3
+        h_ss = n / sigma**2 - 3 * q / sigma**4
+        return np.stack([np.stack([h_mm, h_ms], axis=-1),
+                         np.stack([h_ms, h_ss], axis=-1)], axis=-2)
+
+    return loglik, score, hessiana
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+==============================================================================
+VISUALIZACIÓN: RENDERIZADO SIN PANTALLA CON CACHÉ DE FIGURAS
+==============================================================================
+Canal de renderizado por lotes para las figuras del libro.
+
+- Cada figura se dibuja con el backend Agg sobre un ``Figure`` independiente
+  (sin pyplot ni ``show()``), por lo que funciona en servidores sin pantalla
+  y no acumula figuras abiertas.
+- Se calcula una huella SHA-256 de los arrays graficados, los parámetros de
+  estilo, el código del módulo que define la función de dibujo (incluye
+  sus funciones auxiliares) y el del paquete ``utilidades/``. Si los
+  archivos de salida existen y la huella coincide con la guardada, la
+  figura no se vuelve a renderizar.
+- Cada huella se guarda en su propio archivo dentro de ``.cache_figuras/``
+  y se escribe de forma atómica (archivo temporal + os.replace), de modo
+  que varios scripts pueden renderizar a la vez en la misma carpeta.
+- Si la variable de entorno ``ECONOMETRIA_SALIDAS`` indica un archivo, se
+  le añaden las rutas de todas las figuras del lote (renderizadas o en
+  caché); ejecutar_libro.py lo usa para saber qué produce cada script.
+- Las figuras pendientes de un lote se renderizan en paralelo.
+
+Una función de dibujo tiene la firma ``funcion(fig, datos, estilo)`` y debe
+estar definida al nivel de un módulo para poder enviarse a otro proceso.
+
+Para series largas se ofrecen dos etapas de diezmado previas al dibujo
+(LTTB y envolvente mín/máx), conscientes de la escala logarítmica de los
+ejes, que acotan el número de vértices por línea sin importar n.
+
+Los histogramas se calculan una sola vez (``histograma_densidad``) y se
+dibujan desde los arrays precalculados (``dibujar_histograma``), de modo
+que una misma muestra puede aparecer en una figura individual y en un
+panel sin volver a agrupar los datos.
+"""
+
+import hashlib
+import os
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from .huellas import actualizar_huella, codigo_modulo, huella_paquete
+from .paralelo import mapear_procesos
+
+# Carpeta con las huellas de las figuras (un archivo por figura)
+CARPETA_HUELLAS = '.cache_figuras'
+
+# Archivo donde se anotan las figuras producidas (lo fija ejecutar_libro.py)
+VARIABLE_SALIDAS = 'ECONOMETRIA_SALIDAS'
+
+DPI_POR_DEFECTO = 300
+
+# Vértices por línea tras el diezmado
+MAX_VERTICES = 2000
+
+TareaFigura = namedtuple('TareaFigura',
+                         ['funcion', 'ruta', 'datos', 'estilo', 'formatos'])
+
+Histograma = namedtuple('Histograma', ['densidad', 'bordes'])
+
+
+def _transformar(valores, escala):
+    """
+    Coordenadas en el espacio en que se dibujan ('linear' o 'log')
+    """
+    valores = np.asarray(valores, dtype=float)
+    if escala == 'log':
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.log10(valores)
+        # Valores no positivos: por debajo del menor valor representable
+        finitos = np.isfinite(t)
+        if not finitos.all():
+            t[~finitos] = t[finitos].min() - 1 if finitos.any() else 0.0
+        return t
+    if escala != 'linear':
+        raise ValueError(f"Escala no soportada: {escala!r}")
+    return valores
+
+
+def _bordes_cubetas(xs, cubetas):
+    """
+    Índices de inicio de ``cubetas`` intervalos de igual ancho en xs
+    (xs creciente); se eliminan las cubetas vacías
+    """
+    cortes = np.linspace(xs[0], xs[-1], cubetas + 1)
+    bordes = np.searchsorted(xs, cortes, side='left')
+    bordes[-1] = xs.size
+    return np.unique(bordes)
+
+
+def diezmar_lttb(x, y, umbral=MAX_VERTICES, escala_x='linear',
+                 escala_y='linear'):
+    """
+    Diezmado Largest-Triangle-Three-Buckets
+
+    Conserva ``umbral`` puntos elegidos para maximizar el área del triángulo
+    formado con el punto elegido en la cubeta anterior y el promedio de la
+    siguiente, lo que preserva picos y la forma visual de la curva.
+
+    Parámetros:
+    -----------
+    x, y : array
+        Serie a diezmar, con x creciente
+    umbral : int
+        Número máximo de puntos de salida
+    escala_x, escala_y : str
+        'linear' o 'log'; las cubetas y las áreas se calculan en las
+        coordenadas en que se dibuja cada eje
+
+    Retorna:
+    --------
+    x_d, y_d : array
+        Subconjunto de la serie original (incluye primer y último punto)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if umbral >= n or umbral < 3:
+        return x, y
+
+    xs = _transformar(x, escala_x)
+    ys = _transformar(y, escala_y)
+
+    # Cubetas de igual ancho (en el eje dibujado) sobre los puntos interiores
+    bordes = 1 + _bordes_cubetas(xs[1:-1], umbral - 2)
+    seleccion = [0]
+    a = 0
+    for i in range(bordes.size - 1):
+        ini, fin = bordes[i], bordes[i + 1]
+        if i + 2 < bordes.size:
+            cx = xs[fin:bordes[i + 2]].mean()
+            cy = ys[fin:bordes[i + 2]].mean()
+        else:
+            cx, cy = xs[-1], ys[-1]
+        area = np.abs((xs[a] - cx) * (ys[ini:fin] - ys[a])
+                      - (xs[a] - xs[ini:fin]) * (cy - ys[a]))
+        a = ini + int(np.argmax(area))
+        seleccion.append(a)
+    seleccion.append(n - 1)
+
+    seleccion = np.asarray(seleccion)
+    return x[seleccion], y[seleccion]
+
+
+def envolvente_min_max(x, y, pixeles=MAX_VERTICES // 2, escala_x='linear'):
+    """
+    Diezmado por envolvente mínimo/máximo por columna de píxeles
+
+    Divide el eje x (en su escala de dibujo) en ``pixeles`` columnas y
+    conserva, en orden, el mínimo y el máximo de cada una: el trazo
+    resultante cubre exactamente la misma banda vertical que la serie.
+
+    Retorna:
+    --------
+    x_d, y_d : array
+        A lo sumo 2·pixeles + 2 puntos de la serie original
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if n <= 2 * pixeles + 2:
+        return x, y
+
+    xs = _transformar(x, escala_x)
+    columna = np.searchsorted(_bordes_cubetas(xs, pixeles),
+                              np.arange(n), side='right')
+
+    # Orden por (columna, y): el primero y el último de cada columna son
+    # el mínimo y el máximo
+    orden = np.lexsort((y, columna))
+    col_ord = columna[orden]
+    inicio = np.flatnonzero(np.r_[True, col_ord[1:] != col_ord[:-1]])
+    fin = np.r_[inicio[1:], n] - 1
+
+    seleccion = np.unique(np.r_[0, orden[inicio], orden[fin], n - 1])
+    return x[seleccion], y[seleccion]
+
+
+def histograma_densidad(valores, bins=40, rango=None):
+    """
+    Histograma normalizado como densidad (mismo agrupamiento que ax.hist)
+
+    Parámetros:
+    -----------
+    valores : array
+        Muestra a agrupar
+    bins : int o array
+        Número de intervalos o bordes explícitos
+    rango : tuple, opcional
+        (mínimo, máximo) de los intervalos; por defecto, el de los datos
+
+    Retorna:
+    --------
+    histograma : Histograma
+        densidad (bins,) y bordes (bins + 1,)
+    """
+    densidad, bordes = np.histogram(np.asarray(valores), bins=bins,
+                                    range=rango, density=True)
+    return Histograma(densidad, bordes)
+
+
+def curva_normal(x_min=-4.0, x_max=4.0, puntos=100, mu=0.0, sigma=1.0):
+    """
+    Densidad normal de referencia en una rejilla (sin scipy)
+
+    Retorna:
+    --------
+    x, y : array (puntos,)
+    """
+    x = np.linspace(x_min, x_max, puntos)
+    z = (x - mu) / sigma
+    return x, np.exp(-0.5 * z * z) / (sigma * np.sqrt(2 * np.pi))
+
+
+def dibujar_histograma(ax, histograma, **kwargs):
+    """
+    Dibuja un Histograma precalculado como barras contiguas
+
+    Los argumentos adicionales se pasan a ax.bar (color, edgecolor, ...).
+    """
+    bordes = histograma.bordes
+    return ax.bar(bordes[:-1], histograma.densidad, width=np.diff(bordes),
+                  align='edge', **kwargs)
+
+
+def tarea_figura(funcion, ruta, datos=None, estilo=None, formatos=('pdf',)):
+    """
+    Describe una figura a renderizar
+
+    Parámetros:
+    -----------
+    funcion : función
+        funcion(fig, datos, estilo) dibuja sobre un matplotlib.figure.Figure
+    ruta : str o Path
+        Ruta de salida sin extensión (p. ej. '../figuras/tcl_python')
+    datos : dict
+        Arrays y valores que se grafican (entran en la huella)
+    estilo : dict
+        Parámetros de estilo; 'figsize' y 'dpi' se usan al crear y guardar
+    formatos : tuple
+        Extensiones de salida ('pdf', 'png', ...)
+    """
+    ruta = Path(ruta)
+    if ruta.suffix.lstrip('.') in formatos:
+        ruta = ruta.with_suffix('')
+    return TareaFigura(funcion, ruta, dict(datos or {}), dict(estilo or {}),
+                       tuple(formatos))
+
+
+def huella_figura(tarea):
+    """
+    Huella SHA-256 de los datos, el estilo y el código de dibujo
+    """
+    import matplotlib
+
+    h = hashlib.sha256()
+    h.update(codigo_modulo(tarea.funcion).encode())
+    h.update(huella_paquete().encode())
+    h.update(matplotlib.__version__.encode())
+    actualizar_huella(h, tarea.datos)
+    actualizar_huella(h, tarea.estilo)
+    actualizar_huella(h, list(tarea.formatos))
+    return h.hexdigest()
+
+
+def _ruta_huella(tarea):
+    return tarea.ruta.parent / CARPETA_HUELLAS / f'{tarea.ruta.name}.sha256'
+
+
+def _leer_huella(tarea):
+    try:
+        return _ruta_huella(tarea).read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
+
+
+def _escribir_huella(tarea, huella):
+    """
+    Guarda la huella de una figura de forma atómica
+
+    Un archivo por figura evita leer-modificar-escribir un manifiesto
+    compartido cuando varios procesos renderizan en la misma carpeta.
+    """
+    ruta = _ruta_huella(tarea)
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ruta.with_name(f'.{ruta.name}.tmp-{os.getpid()}')
+    temporal.write_text(huella, encoding='utf-8')
+    os.replace(temporal, ruta)
+
+
+def _salidas(tarea):
+    return [tarea.ruta.with_suffix(f'.{fmt}') for fmt in tarea.formatos]
+
+
+def _renderizar_tarea(tarea):
+    """
+    Trabajador: dibuja la figura con Agg y la guarda en cada formato
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    estilo = tarea.estilo
+    fig = Figure(figsize=estilo.get('figsize'),
+                 facecolor=estilo.get('facecolor', 'white'))
+    FigureCanvasAgg(fig)
+    try:
+        tarea.funcion(fig, tarea.datos, estilo)
+
+        tarea.ruta.parent.mkdir(parents=True, exist_ok=True)
+        for salida in _salidas(tarea):
+            fig.savefig(salida, dpi=estilo.get('dpi', DPI_POR_DEFECTO),
+                        bbox_inches='tight', facecolor=fig.get_facecolor())
+    finally:
+        # Liberar ejes y artistas al terminar (también si el dibujo falla),
+        # sin esperar al recolector de basura
+        fig.clear()
+    return [str(s) for s in _salidas(tarea)]
+
+
+def renderizar_lote(tareas, trabajadores=None, forzar=False):
+    """
+    Renderiza solo las figuras cuya huella cambió, en paralelo
+
+    Parámetros:
+    -----------
+    tareas : list of TareaFigura
+        Figuras del lote (ver tarea_figura)
+    trabajadores : int, opcional
+        Procesos para renderizar (por defecto os.cpu_count())
+    forzar : bool
+        Renderizar aunque la caché esté vigente
+
+    Retorna:
+    --------
+    estado : dict
+        ruta de salida -> 'renderizada' o 'en caché'
+    """
+    tareas = list(tareas)
+    huellas = [huella_figura(t) for t in tareas]
+    pendientes = []
+    estado = {}
+
+    for tarea, huella in zip(tareas, huellas):
+        vigente = (_leer_huella(tarea) == huella
+                   and all(s.exists() for s in _salidas(tarea)))
+        if vigente and not forzar:
+            estado[str(tarea.ruta)] = 'en caché'
+        else:
+            pendientes.append((tarea, huella))
+
+    mapear_procesos(_renderizar_tarea, [t for t, _ in pendientes],
+                    trabajadores)
+
+    for tarea, huella in pendientes:
+        _escribir_huella(tarea, huella)
+        estado[str(tarea.ruta)] = 'renderizada'
+
+    _anotar_salidas(tareas)
+    return estado
+
+
+def _anotar_salidas(tareas):
+    """
+    Añade las rutas de salida al archivo de ECONOMETRIA_SALIDAS, si existe
+    """
+    archivo = os.environ.get(VARIABLE_SALIDAS)
+    if not archivo:
+        return
+    with open(archivo, 'a', encoding='utf-8') as f:
+        for tarea in tareas:
+            for salida in _salidas(tarea):
+                f.write(f'{salida.resolve()}\n')
+
+
+def renderizar(funcion, ruta, datos=None, estilo=None, formatos=('pdf',),
+               forzar=False):
+    """
+    Renderiza una sola figura con caché
+
+    Retorna:
+    --------
+    renderizada : bool
+        False si se reutilizó la figura en caché
+    """
+    tarea = tarea_figura(funcion, ruta, datos, estilo, formatos)
+    estado = renderizar_lote([tarea], trabajadores=1, forzar=forzar)
+    return estado[str(tarea.ruta)] == 'renderizada'